@@ -0,0 +1,113 @@
+"""Time the Day 18 solvers on the real input.txt against the shared key-graph core.
+
+Every solver runs as-is in its own process from the repository root, where
+the scripts expect to find Advent_of_Code_2019-day18/input.txt, under a
+small wrapper that reports the process's peak memory. The answer is the last
+number a script prints and is checked against keygraph.py's.
+
+--heuristics instead compares keygraph.py's A* bounds with plain Dijkstra:
+states expanded and search time on both parts of input.txt and on larger
+vaults from mazegen.py. A search stops after --limit expansions.
+
+    python Advent_of_Code_2019-day18/benchmark.py                 # markdown table
+    python Advent_of_Code_2019-day18/benchmark.py --timeout 60
+    python Advent_of_Code_2019-day18/benchmark.py --heuristics
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+from keygraph import DAY_DIR, HEURISTICS, KeyGraph, shortest_collection, solve, split_vault
+from mazegen import generate
+
+REPO_ROOT = os.path.dirname(DAY_DIR)
+SOLVERS = [
+    'claude-3.7-sonnet-thinking.py',
+    'deepseek-v3-0324.py',
+    'gemini-2.5-pro-0325-exp.py',
+    'grok-3-thinking.py',
+    'keygraph.py',
+]
+# Generated vaults: maze cells per side per robot, keys, doors, robots, seed
+VAULTS = [
+    (40, 26, 20, 1, 1),
+    (80, 26, 20, 1, 1),
+    (20, 26, 16, 4, 1),
+    (40, 26, 16, 4, 1),
+]
+# Runs a script as __main__, then reports its peak resident memory in KB
+WRAPPER = ('import resource, runpy, sys; sys.argv = sys.argv[1:]; '
+           'runpy.run_path(sys.argv[0], run_name="__main__"); '
+           'print("maxrss", resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, file=sys.stderr)')
+
+
+def run(script, timeout):
+    """(answer or None, seconds, peak KB or None, error or None) for one solver."""
+    path = os.path.join(DAY_DIR, script)
+    start = time.perf_counter()
+    try:
+        done = subprocess.run([sys.executable, '-c', WRAPPER, path], cwd=REPO_ROOT,
+                              capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return None, timeout, None, f'timed out after {timeout:g} s'
+    elapsed = time.perf_counter() - start
+    memory = re.search(r'maxrss (\d+)', done.stderr)
+    memory = int(memory.group(1)) if memory else None
+    if done.returncode != 0:
+        return None, elapsed, memory, done.stderr.strip().splitlines()[-1]
+    numbers = re.findall(r'-?\d+', done.stdout)
+    return (int(numbers[-1]) if numbers else None), elapsed, memory, None
+
+
+def compare_heuristics(limit):
+    with open(os.path.join(DAY_DIR, 'input.txt')) as f:
+        text = f.read()
+    vaults = [('input.txt part 1', text), ('input.txt part 2', split_vault(text))]
+    for size, keys, doors, robots, seed in VAULTS:
+        vaults.append((f'{size}x{size} x{robots}, {keys} keys, {doors} doors', generate(size, size, keys, doors, robots, seed)))
+
+    print('| Vault | Heuristic | Steps | States expanded | Search (ms) |')
+    print('|-------|-----------|-------|-----------------|-------------|')
+    for label, text in vaults:
+        graph = KeyGraph.from_text(text)
+        for heuristic in HEURISTICS:
+            # Every search starts without cached trees
+            graph.tree_lengths.clear()
+            start = time.perf_counter()
+            steps, expanded = shortest_collection(graph, heuristic, limit)
+            elapsed = (time.perf_counter() - start) * 1000
+            steps = 'gave up' if steps is None else steps
+            print(f'| {label} | {heuristic} | {steps} | {expanded} | {elapsed:.0f} |')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--timeout', type=float, default=600.0, help='seconds allowed per solver')
+    parser.add_argument('--heuristics', action='store_true', help="compare keygraph.py's A* bounds instead")
+    parser.add_argument('--limit', type=int, default=1_000_000, help='states a --heuristics search may expand')
+    args = parser.parse_args()
+    if args.heuristics:
+        compare_heuristics(args.limit)
+        return
+
+    with open(os.path.join(DAY_DIR, 'input.txt')) as f:
+        expected = solve(f.read())
+    print(f'Expected answer {expected}, one process per solver\n')
+    print('| Solver | Answer | Time (s) | Peak memory (MB) |')
+    print('|--------|--------|----------|------------------|')
+    for script in SOLVERS:
+        answer, elapsed, memory, error = run(script, args.timeout)
+        name = os.path.splitext(script)[0]
+        if error:
+            print(f'| {name} | ❌ {error} | {elapsed:.2f} | - |')
+            continue
+        mark = '✅' if answer == expected else '❌'
+        memory = f'{memory / 1024:.0f}' if memory else '-'
+        print(f'| {name} | {mark} {answer} | {elapsed:.2f} | {memory} |')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,284 @@
+"""Shared solver core for Day 18: a key graph built once, then A* over key bitmasks.
+
+The solvers in this directory either search the grid itself with the
+collected keys as part of every state, or re-run a BFS for every
+(start, end, keys) combination they meet. Both scale with the grid times
+the number of key subsets. Here the grid is searched exactly once per point
+of interest (each start and each key):
+
+- one BFS from every point records, for every key it reaches, the distance,
+  the doors on the way as a bitmask of the keys that open them, and the
+  other keys on the way as a second bitmask, since walking over a key
+  picks it up
+- the search then runs over (positions, collected) states, with the
+  collected keys as an int bitmask: a move to a key is allowed when its
+  door mask is a subset of the collected mask, and collects the key and
+  everything on the way
+
+Part two splits the vault into four walled quadrants with a robot each
+(split_vault). Positions are a tuple with one node per robot and a move
+sends one robot to a key. A robot's BFS only reaches its own quadrant, so
+the graph falls apart into one key graph per quadrant, and ``regions``
+records which keys each robot can ever collect.
+
+The search is A* with one of two lower bounds on the steps left, both by
+the BFS distances that ignore doors (HEURISTICS):
+
+- farthest: a robot still has to reach the farthest of its remaining keys
+- mst: a robot still has to walk to one of its remaining keys and then on
+  through all the others, which is at least the distance to the nearest of
+  them plus a minimum spanning tree over them. Trees are cached by key mask
+
+Summed over robots neither overestimates, so the first finished state popped
+is optimal. 'dijkstra' searches without a bound, as the model solutions do.
+
+    python Advent_of_Code_2019-day18/keygraph.py [input.txt]    # both parts
+    python Advent_of_Code_2019-day18/keygraph.py --heuristic dijkstra
+"""
+import argparse
+import heapq
+import math
+import os
+import time
+from collections import deque
+
+DAY_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def key_bit(key):
+    return 1 << (ord(key) - ord('a'))
+
+
+def parse(text):
+    """(grid rows, start positions in reading order, {key: position}) of a vault map."""
+    grid = text.strip().split('\n')
+    starts = []
+    keys = {}
+    for r, row in enumerate(grid):
+        for c, cell in enumerate(row):
+            if cell == '@':
+                starts.append((r, c))
+            elif 'a' <= cell <= 'z':
+                keys[cell] = (r, c)
+    return grid, starts, keys
+
+
+def split_vault(text):
+    """Part two's map: the start and its neighbours become four starts with walls between them."""
+    grid, starts, _ = parse(text)
+    if len(starts) != 1:
+        raise ValueError(f'expected one start to split, the map has {len(starts)}')
+    r, c = starts[0]
+    rows = [list(row) for row in grid]
+    for dr, centre in zip((-1, 0, 1), ('@#@', '###', '@#@')):
+        rows[r + dr][c - 1:c + 2] = centre
+    return '\n'.join(''.join(row) for row in rows)
+
+
+def reachable_keys(grid, source, key_mask):
+    """BFS from source over the whole grid: [(key, distance, doors mask, keys on the way mask)].
+
+    Doors whose key is not in ``key_mask`` can never open and count as walls.
+    """
+    height, width = len(grid), len(grid[0])
+    found = []
+    seen = {source}
+    queue = deque([(source, 0, 0, 0)])
+    while queue:
+        (r, c), dist, doors, passed = queue.popleft()
+        cell = grid[r][c]
+        if 'a' <= cell <= 'z' and dist > 0:
+            found.append((cell, dist, doors, passed))
+            passed |= key_bit(cell)
+        for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+            if not (0 <= nr < height and 0 <= nc < width) or (nr, nc) in seen:
+                continue
+            cell = grid[nr][nc]
+            if cell == '#':
+                continue
+            next_doors = doors
+            if 'A' <= cell <= 'Z':
+                bit = key_bit(cell.lower())
+                if not key_mask & bit:
+                    continue
+                next_doors |= bit
+            seen.add((nr, nc))
+            queue.append(((nr, nc), dist + 1, next_doors, passed))
+    return found
+
+
+class KeyGraph:
+    """Distances and door requirements between the starts and keys of a vault.
+
+    Nodes are the starts, numbered from 0 in reading order, followed by the
+    keys. ``edges[node]`` lists (key node, key bit, distance, doors mask,
+    passed mask) for every key reachable from that node, ``distance`` holds
+    the same distances as a matrix, and ``regions[robot]`` is the mask of
+    keys reachable from that robot's start.
+    """
+
+    def __init__(self, grid, starts, keys):
+        self.names = [f'@{i}' for i in range(len(starts))] + sorted(keys)
+        self.starts = tuple(range(len(starts)))
+        self.all_keys = 0
+        for key in keys:
+            self.all_keys |= key_bit(key)
+        index = {name: i for i, name in enumerate(self.names)}
+        positions = list(starts) + [keys[key] for key in sorted(keys)]
+        self.edges = []
+        for position in positions:
+            self.edges.append([(index[key], key_bit(key), dist, doors, passed)
+                               for key, dist, doors, passed in reachable_keys(grid, position, self.all_keys)])
+
+        self.node_of_bit = {key_bit(key): index[key] for key in keys}
+        self.distance = [[math.inf] * len(positions) for _ in positions]
+        for node, edges in enumerate(self.edges):
+            for target, _, dist, _, _ in edges:
+                self.distance[node][target] = dist
+        self.regions = [0] * len(starts)
+        for robot in self.starts:
+            for _, bit, _, _, _ in self.edges[robot]:
+                self.regions[robot] |= bit
+        # Robots sharing keys could each be the one to collect them, which
+        # the per-robot bound does not allow for
+        self.disjoint = sum(map(int.bit_count, self.regions)) == bin(self.all_keys).count('1')
+        # Spanning tree lengths by key mask; the keys left in a region recur
+        # across many states, and their tree does not depend on positions
+        self.tree_lengths = {}
+
+    @classmethod
+    def from_text(cls, text):
+        return cls(*parse(text))
+
+
+def key_nodes(graph, mask):
+    nodes = []
+    while mask:
+        bit = mask & -mask
+        nodes.append(graph.node_of_bit[bit])
+        mask ^= bit
+    return nodes
+
+
+def spanning_tree_length(graph, nodes):
+    """Length of a minimum spanning tree over ``nodes`` by their BFS distances (Prim)."""
+    if len(nodes) < 2:
+        return 0
+    reach = {node: graph.distance[nodes[0]][node] for node in nodes[1:]}
+    total = 0
+    while reach:
+        node = min(reach, key=reach.get)
+        total += reach.pop(node)
+        row = graph.distance[node]
+        for other in reach:
+            if row[other] < reach[other]:
+                reach[other] = row[other]
+    return total
+
+
+def remaining_by_robot(graph, positions, mask):
+    """(robot's node, its region's missing keys as nodes, as a mask) for robots with keys left."""
+    for robot, node in enumerate(positions):
+        remaining = graph.regions[robot] & ~mask
+        if remaining:
+            yield node, key_nodes(graph, remaining), remaining
+
+
+def farthest_bound(graph, positions, mask):
+    """Steps needed at least: every robot must still reach the farthest key left in its region."""
+    if not graph.disjoint:
+        return 0
+    total = 0
+    for node, nodes, _ in remaining_by_robot(graph, positions, mask):
+        row = graph.distance[node]
+        total += max(row[key] for key in nodes)
+    return total
+
+
+def tree_bound(graph, positions, mask):
+    """Steps needed at least: per robot, its nearest missing key plus a spanning tree over them."""
+    if not graph.disjoint:
+        return 0
+    total = 0
+    for node, nodes, remaining in remaining_by_robot(graph, positions, mask):
+        tree = graph.tree_lengths.get(remaining)
+        if tree is None:
+            tree = graph.tree_lengths[remaining] = spanning_tree_length(graph, nodes)
+        row = graph.distance[node]
+        total += min(row[key] for key in nodes) + tree
+    return total
+
+
+# Lower bounds on the steps left, by name; 'dijkstra' is A* without one
+HEURISTICS = {
+    'dijkstra': None,
+    'farthest': farthest_bound,
+    'mst': tree_bound,
+}
+
+
+def shortest_collection(graph, heuristic='mst', limit=None):
+    """Fewest steps for the robots to collect every key, or -1 if they cannot.
+
+    ``heuristic`` names one of HEURISTICS. Returns (steps, states expanded);
+    steps is None when the search gave up after ``limit`` expansions.
+    """
+    bound = HEURISTICS[heuristic] or (lambda graph, positions, mask: 0)
+    best = {(graph.starts, 0): 0}
+    heap = [(bound(graph, graph.starts, 0), 0, graph.starts, 0)]
+    expanded = 0
+    while heap:
+        _, steps, positions, mask = heapq.heappop(heap)
+        if steps > best[(positions, mask)]:
+            continue
+        if mask == graph.all_keys:
+            return steps, expanded
+        if expanded == limit:
+            return None, expanded
+        expanded += 1
+        for robot, node in enumerate(positions):
+            for target, bit, dist, doors, passed in graph.edges[node]:
+                if mask & bit or doors & ~mask:
+                    continue
+                moved = positions[:robot] + (target,) + positions[robot + 1:]
+                collected = mask | bit | passed
+                total = steps + dist
+                if total < best.get((moved, collected), total + 1):
+                    best[(moved, collected)] = total
+                    heapq.heappush(heap, (total + bound(graph, moved, collected), total, moved, collected))
+    return -1, expanded
+
+
+def solve(text):
+    """Steps to collect every key on the map in ``text``, with as many robots as it has starts."""
+    return shortest_collection(KeyGraph.from_text(text))[0]
+
+
+def run(label, text, heuristic):
+    start = time.perf_counter()
+    graph = KeyGraph.from_text(text)
+    built = time.perf_counter()
+    steps, expanded = shortest_collection(graph, heuristic)
+    done = time.perf_counter()
+    edges = sum(len(edges) for edges in graph.edges)
+    print(f'{label}: key graph of {len(graph.names)} nodes, {edges} edges in {(built - start) * 1000:.1f} ms; '
+          f'{heuristic} search: {expanded} states expanded in {(done - built) * 1000:.1f} ms')
+    return steps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('input', nargs='?', default=os.path.join(DAY_DIR, 'input.txt'))
+    parser.add_argument('--heuristic', choices=HEURISTICS, default='mst', help='lower bound for A*')
+    args = parser.parse_args()
+    with open(args.input) as f:
+        text = f.read()
+    part1 = run('part 1', text, args.heuristic)
+    part2 = run('part 2', split_vault(text), args.heuristic) if len(parse(text)[1]) == 1 else None
+    print(f'part 2: {part2} steps')
+    # Last, for benchmark.py, which reads the final number printed
+    print(f'part 1: {part1} steps')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""Random Day 18 vaults that are always solvable, for searches larger than input.txt.
+
+A vault is one perfect maze (a spanning tree of corridors, carved by a
+randomised depth-first search) with the start in the middle, or four of
+them around a split start like part two's, one per robot. Keys go on random
+floor cells and get a random collection order. A door for key k goes on a
+corridor cell whose branch, away from the robot, holds only keys later than
+k, so the keys can always be collected in that order. Like the puzzle
+inputs, the vaults have no loops: keygraph.py keeps one path between two
+points, which a loop around a door would make wrong.
+
+    python Advent_of_Code_2019-day18/mazegen.py --size 40 --keys 26 --doors 20 --seed 3
+    python Advent_of_Code_2019-day18/mazegen.py --robots 4 > vault.txt
+"""
+import argparse
+import random
+import string
+
+
+def carve(rng, rows, cols):
+    """A perfect maze of rows x cols cells as (2*rows+1) x (2*cols+1) lists of '#' and '.'."""
+    grid = [['#'] * (2 * cols + 1) for _ in range(2 * rows + 1)]
+    grid[1][1] = '.'
+    stack = [(1, 1)]
+    while stack:
+        r, c = stack[-1]
+        nexts = [(r + dr, c + dc) for dr, dc in ((-2, 0), (2, 0), (0, -2), (0, 2))
+                 if 0 < r + dr < 2 * rows and 0 < c + dc < 2 * cols and grid[r + dr][c + dc] == '#']
+        if not nexts:
+            stack.pop()
+            continue
+        nr, nc = rng.choice(nexts)
+        grid[(r + nr) // 2][(c + nc) // 2] = grid[nr][nc] = '.'
+        stack.append((nr, nc))
+    return grid
+
+
+def layout(rng, rows, cols, robots):
+    """(grid, starts): one maze around a central start, or four around part two's split start."""
+    if robots == 1:
+        grid = carve(rng, rows, cols)
+        return grid, [(rows // 2 * 2 + 1, cols // 2 * 2 + 1)]
+    if robots != 4:
+        raise ValueError('a vault has one robot or four')
+    height, width = 2 * rows + 1, 2 * cols + 1
+    grid = [['#'] * (2 * width - 1) for _ in range(2 * height - 1)]
+    for top in (0, height - 1):
+        for left in (0, width - 1):
+            quadrant = carve(rng, rows, cols)
+            for r, row in enumerate(quadrant):
+                for c, cell in enumerate(row):
+                    if cell == '.':
+                        grid[top + r][left + c] = cell
+    # The quadrant corners next to the centre, where split_vault puts them
+    centre_r, centre_c = height - 1, width - 1
+    return grid, [(centre_r + dr, centre_c + dc) for dr in (-1, 1) for dc in (-1, 1)]
+
+
+def branches(grid, root):
+    """(cells in BFS order, {cell: parent}) of the tree of floor cells around ``root``."""
+    order = [root]
+    parent = {root: None}
+    for r, c in order:
+        for cell in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+            if cell not in parent and grid[cell[0]][cell[1]] != '#':
+                parent[cell] = (r, c)
+                order.append(cell)
+    return order, parent
+
+
+def generate(rows=40, cols=40, keys=26, doors=20, robots=1, seed=0):
+    """Map text of a random solvable vault with ``rows`` x ``cols`` maze cells per robot."""
+    if not 0 < keys <= 26:
+        raise ValueError('a vault holds 1 to 26 keys')
+    rng = random.Random(seed)
+    grid, starts = layout(rng, rows, cols, robots)
+    trees = [branches(grid, start) for start in starts]
+    free = [cell for order, _ in trees for cell in order[1:]]
+    letters = rng.sample(string.ascii_lowercase, keys)
+    # Key k is letters[k], and k is also its place in the collection order
+    key_cells = dict(zip(rng.sample(free, keys), range(keys)))
+
+    # Earliest key order in each cell's branch, children before parents
+    earliest = {}
+    for order, parent in trees:
+        for cell in reversed(order):
+            earliest[cell] = min(earliest.get(cell, keys), key_cells.get(cell, keys))
+            if parent[cell] is not None:
+                earliest[parent[cell]] = min(earliest.get(parent[cell], keys), earliest[cell])
+
+    used = set(key_cells) | set(starts)
+    placed = 0
+    for k in rng.sample(range(keys), keys):
+        if placed == doors:
+            break
+        # Cells that shut off some keys, all of them collected after k
+        candidates = [cell for cell in free if cell not in used and k < earliest[cell] < keys]
+        if candidates:
+            cell = rng.choice(candidates)
+            used.add(cell)
+            grid[cell[0]][cell[1]] = letters[k].upper()
+            placed += 1
+    for cell, k in key_cells.items():
+        grid[cell[0]][cell[1]] = letters[k]
+    for r, c in starts:
+        grid[r][c] = '@'
+    return '\n'.join(''.join(row) for row in grid)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=40, help='maze cells per side, per robot')
+    parser.add_argument('--keys', type=int, default=26)
+    parser.add_argument('--doors', type=int, default=20)
+    parser.add_argument('--robots', type=int, choices=(1, 4), default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    print(generate(args.size, args.size, args.keys, args.doors, args.robots, args.seed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,368 @@
+"""Vectorized multi-ball physics for the spinning hexagon.
+
+The variants simulate one ball with scalar math. BallEngine keeps any number
+of balls in NumPy arrays (positions, velocities, radii) and moves them all at
+once: gravity and position updates are single array operations, and the walls
+are resolved one edge at a time with every ball tested against that edge in
+one go. The collision response is the one in claude-4.5-opus.py's
+handle_collision: closest point on the edge, inward normal, wall velocity
+w x r at the contact, restitution on the normal part and friction on the
+tangential part of the velocity relative to the wall, then a push back out.
+
+step() splits every frame into a fixed number of substeps. step_adaptive()
+gives each ball its own: a power of two chosen from how soon it could reach
+a wall and the integrator's error bound, so balls in free flight take one
+step per frame and balls near a wall take many. The integrator is one of
+integrators.INTEGRATORS.
+
+    python hexagon/ball_engine.py --balls 10000          # benchmark
+    python hexagon/ball_engine.py --balls 2000 --show    # watch it
+    python hexagon/ball_engine.py --adaptive --integrator verlet --drag 0.5
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+import broadphase
+import integrators
+from rotating_polygon import RotatingPolygon
+
+WIDTH, HEIGHT = 800, 700
+CENTER = (WIDTH / 2, HEIGHT / 2)
+HEX_RADIUS = 270.0
+BALL_RADIUS = 4.0
+GRAVITY = 980.0
+RESTITUTION = 0.78  # normal velocity kept on a bounce
+FRICTION = 0.992    # tangential velocity kept on a bounce
+PUSH_SLOP = 1.0     # extra distance a ball is pushed out of a wall
+SUBSTEPS = 4
+ADAPTIVE_TOLERANCE = 0.05  # px of integration error allowed per adaptive substep
+MAX_LEVEL = 6              # adaptive substeps per frame go up to 2 ** MAX_LEVEL
+TRAVEL_FRACTION = 0.5      # share of its gap to the walls a ball may close in one substep
+MIN_GAP = 0.25             # gaps count as at least this fraction of the ball radius
+
+
+class BallEngine:
+    """Balls in a convex polygon spinning about its center.
+
+    By default the polygon is a regular one with ``sides`` corners; pass any
+    RotatingPolygon as ``polygon`` to use another shape.
+    """
+
+    def __init__(self, center=CENTER, hex_radius=HEX_RADIUS, omega=1.5, sides=6, gravity=GRAVITY,
+                 restitution=RESTITUTION, friction=FRICTION, ball_collisions=False, polygon=None,
+                 integrator='euler', drag=0.0):
+        self.polygon = polygon or RotatingPolygon.regular(sides, hex_radius, center)
+        self.center = np.array(self.polygon.center, dtype=np.float64)
+        self.hex_radius = hex_radius
+        self.sides = self.polygon.sides
+        self.angle = 0.0
+        self.omega = omega
+        self.gravity = gravity
+        self.restitution = restitution
+        self.friction = friction
+        self.ball_collisions = ball_collisions
+        self.integrator = integrators.INTEGRATORS[integrator]
+        self.drag = drag
+        self.pos = np.zeros((0, 2))
+        self.vel = np.zeros((0, 2))
+        self.radius = np.zeros(0)
+        # Substeps each ball took in the last step, and in all steps so far
+        self.ball_steps = np.zeros(0, dtype=np.int64)
+        self.total_ball_steps = 0
+
+    @property
+    def count(self):
+        return len(self.pos)
+
+    def add_balls(self, pos, vel, radius=BALL_RADIUS):
+        pos = np.asarray(pos, dtype=np.float64).reshape(-1, 2)
+        vel = np.asarray(vel, dtype=np.float64).reshape(-1, 2)
+        self.pos = np.concatenate([self.pos, pos])
+        self.vel = np.concatenate([self.vel, vel])
+        self.radius = np.concatenate([self.radius, np.broadcast_to(np.asarray(radius, dtype=np.float64), len(pos))])
+        self.ball_steps = np.concatenate([self.ball_steps, np.zeros(len(pos), dtype=np.int64)])
+
+    def spawn(self, n, radius=BALL_RADIUS, speed=250.0, seed=None):
+        """Add n balls at random points inside the polygon with random velocities."""
+        rng = np.random.default_rng(seed)
+        # Uniform in the inscribed circle, kept a radius away from the walls
+        inner = min(self.polygon.offsets) - radius - PUSH_SLOP
+        r = inner * np.sqrt(rng.random(n))
+        theta = rng.random(n) * 2 * math.pi
+        pos = self.center + np.column_stack([r * np.cos(theta), r * np.sin(theta)])
+        heading = rng.random(n) * 2 * math.pi
+        vel = speed * np.column_stack([np.cos(heading), np.sin(heading)])
+        self.add_balls(pos, vel, radius)
+
+    def vertices(self):
+        """Polygon corners at the current angle, shape (sides, 2)."""
+        self.polygon.set_angle(self.angle)
+        return np.array(self.polygon.vertices)
+
+    def normals(self):
+        """Inward unit normals of the edges at the current angle, shape (sides, 2)."""
+        self.polygon.set_angle(self.angle)
+        return np.array(self.polygon.normals)
+
+    def accel(self, pos, vel):
+        """Gravity and linear drag."""
+        return np.array([0.0, self.gravity]) - self.drag * vel
+
+    def step(self, dt, substeps=SUBSTEPS):
+        sub_dt = dt / substeps
+        for _ in range(substeps):
+            self.pos, self.vel = self.integrator(self.pos, self.vel, self.accel, sub_dt)
+            self.angle += self.omega * sub_dt
+            if self.ball_collisions:
+                self.collide_balls()
+            self.collide_walls()
+        self.ball_steps[:] = substeps
+        self.total_ball_steps += substeps * self.count
+
+    def edge_distances(self):
+        """Signed distance from every ball's center to every wall line, shape (balls, sides)."""
+        polygon = self.polygon
+        polygon.set_angle(self.angle)
+        rel = self.pos - self.center
+        # Balls into the polygon's frame, where normals and offsets are fixed
+        local = np.column_stack([polygon.cos * rel[:, 0] + polygon.sin * rel[:, 1],
+                                 polygon.cos * rel[:, 1] - polygon.sin * rel[:, 0]])
+        return local @ np.array(polygon.local_normals).T + np.array(polygon.offsets)
+
+    def wall_gaps(self):
+        """Distance from every ball's surface to the nearest wall line, negative when overlapping."""
+        return self.edge_distances().min(axis=1) - self.radius
+
+    def adaptive_levels(self, dt, tolerance=ADAPTIVE_TOLERANCE):
+        """Per ball, the level L whose 2 ** L substeps per frame are small enough."""
+        accel = self.accel(self.pos, self.vel)
+        accel_mag = np.hypot(accel[:, 0], accel[:, 1])
+        with np.errstate(divide='ignore'):
+            h = np.minimum(dt, integrators.step_limit(self.integrator, accel_mag, self.drag, tolerance))
+        dist = self.edge_distances()
+        gap = np.maximum(dist.min(axis=1) - self.radius, MIN_GAP * self.radius)
+
+        # Fastest any gap can close: the ball's speed, what the frame's
+        # acceleration adds and the fastest wall point. Balls that cannot
+        # close half their gap in a frame even so need no closer look
+        rel = self.pos - self.center
+        bound = (np.hypot(self.vel[:, 0], self.vel[:, 1]) + accel_mag * dt
+                 + abs(self.omega) * self.polygon.radius)
+        near = np.nonzero(TRAVEL_FRACTION * gap < bound * h)[0]
+        if len(near):
+            # How fast each gap really shrinks: the ball moving along the
+            # edge's normal plus the normal turning with the polygon. Balls
+            # sliding along a wall close on it slowly
+            normals = np.array(self.polygon.normals)
+            turning = self.omega * np.column_stack([-normals[:, 1], normals[:, 0]])
+            closing = (-(self.vel[near] @ normals.T + rel[near] @ turning.T)
+                       + (accel_mag[near] * dt)[:, None])
+            gaps = np.maximum(dist[near] - self.radius[near, None], MIN_GAP * self.radius[near, None])
+            with np.errstate(divide='ignore'):
+                reach = np.where(closing > 0, TRAVEL_FRACTION * gaps / closing, np.inf).min(axis=1)
+            h[near] = np.minimum(h[near], reach)
+        levels = np.ceil(np.log2(dt / h))
+        return np.clip(levels, 0, MAX_LEVEL).astype(np.int64)
+
+    def step_adaptive(self, dt, tolerance=ADAPTIVE_TOLERANCE):
+        """Advance dt with per-ball substeps sized by adaptive_levels().
+
+        Levels are powers of two, so every substep ends on a tick of the
+        finest level in use and all balls finishing a substep on that tick
+        see the walls at the same angle. Balls are sorted by level for the
+        frame, finest first, so the balls due on any tick are a prefix of the
+        arrays and are stepped through views.
+        """
+        if not self.count:
+            self.angle += self.omega * dt
+            return
+        levels = self.adaptive_levels(dt, tolerance)
+        order = np.argsort(-levels, kind='stable')
+        levels_sorted = levels[order]
+        pos, vel, radius = self.pos[order], self.vel[order], self.radius[order]
+        h = (dt / np.left_shift(1, levels_sorted))[:, None]
+        top = int(levels_sorted[0])
+        # due[L]: how many balls have level L or finer
+        due = np.cumsum(np.bincount(levels_sorted, minlength=top + 1)[::-1])[::-1]
+        start_angle = self.angle
+
+        ticks = 1 << top
+        for tick in range(1, ticks + 1):
+            # A ball at level L is due every 2 ** (top - L) ticks
+            trailing_zeros = (tick & -tick).bit_length() - 1
+            n = int(due[max(top - trailing_zeros, 0)])
+            pos[:n], vel[:n] = self.integrator(pos[:n], vel[:n], self.accel, h[:n])
+            self.angle = start_angle + self.omega * dt * tick / ticks
+            # Ball-ball contacts are resolved on the ticks every ball reaches
+            if self.ball_collisions and n == len(pos):
+                i, j = broadphase.find_pairs(pos, radius)
+                broadphase.resolve_pairs(pos, vel, radius, i, j, self.restitution, self.friction)
+            self.resolve_walls(pos[:n], vel[:n], radius[:n])
+
+        self.pos[order] = pos
+        self.vel[order] = vel
+        self.ball_steps = np.left_shift(1, levels)
+        self.total_ball_steps += int(self.ball_steps.sum())
+
+    def collide_balls(self):
+        i, j = broadphase.find_pairs(self.pos, self.radius)
+        broadphase.resolve_pairs(self.pos, self.vel, self.radius, i, j, self.restitution, self.friction)
+
+    def collide_walls(self):
+        self.resolve_walls(self.pos, self.vel, self.radius)
+
+    def resolve_walls(self, pos, vel, radius):
+        """Wall collisions for the given arrays, updated in place."""
+        starts = self.vertices()
+        normals = self.normals()
+        edges = np.roll(starts, -1, axis=0) - starts
+        length_sq = np.einsum('ij,ij->i', edges, edges)
+
+        for i in range(self.sides):
+            normal = normals[i]
+            # Only balls within a radius of the wall's line can touch the
+            # wall, the segment is never closer than its line
+            line = (pos - starts[i]) @ normal
+            near = np.nonzero(line < radius)[0]
+            if not len(near):
+                continue
+            # Closest point on the edge to every nearby ball
+            t = np.clip(((pos[near] - starts[i]) @ edges[i]) / length_sq[i], 0.0, 1.0)
+            closest = starts[i] + t[:, None] * edges[i]
+            offset = pos[near] - closest
+            dist = np.sqrt(np.einsum('ij,ij->i', offset, offset))
+            # A center pushed past the wall line (by other balls) is caught
+            # too, measuring its depth from the line, so it comes back in
+            outside = line[near] < 0
+            dist[outside] = -dist[outside]
+            hit = dist < radius[near]
+            if not hit.any():
+                continue
+
+            idx = np.nonzero(hit)[0]
+            tangent = np.array([-normal[1], normal[0]])
+            # Wall velocity at the contact: w x r
+            r = closest[idx] - self.center
+            wall_vel = self.omega * np.column_stack([-r[:, 1], r[:, 0]])
+            rel_vel = vel[near[idx]] - wall_vel
+            vel_normal = rel_vel @ normal
+
+            # Only bounce balls moving into the wall, and any that are outside
+            approaching = (vel_normal < 0) | outside[idx]
+            idx = idx[approaching]
+            if not len(idx):
+                continue
+            balls = near[idx]
+            rel_vel = rel_vel[approaching]
+            vel_normal = vel_normal[approaching]
+            vel_tangent = rel_vel @ tangent
+            new_rel = (np.outer(-vel_normal * self.restitution, normal)
+                       + np.outer(vel_tangent * self.friction, tangent))
+            # Balls already heading back in keep their velocity
+            new_rel = np.where((vel_normal < 0)[:, None], new_rel, rel_vel)
+            vel[balls] = new_rel + wall_vel[approaching]
+            pos[balls] += np.outer(radius[balls] - dist[idx] + PUSH_SLOP, normal)
+
+    def kinetic_energy(self):
+        return 0.5 * float(np.einsum('ij,ij->', self.vel, self.vel))
+
+    def potential_energy(self):
+        # Unit masses, height measured downward in screen coordinates
+        return -self.gravity * float(self.pos[:, 1].sum())
+
+    def escaped(self):
+        """Number of balls outside the polygon (by more than their radius)."""
+        verts = self.vertices()
+        normals = self.normals()
+        # Signed distance to each edge line, positive inside
+        inside = np.einsum('ej,nej->ne', normals, self.pos[:, None, :] - verts[None, :, :])
+        return int(np.count_nonzero((inside < -self.radius[:, None]).any(axis=1)))
+
+
+def advance(engine, dt, substeps):
+    """Fixed substeps, or adaptive ones when substeps is None."""
+    if substeps is None:
+        engine.step_adaptive(dt)
+    else:
+        engine.step(dt, substeps)
+
+
+def benchmark(balls, seconds, dt=1 / 60, substeps=SUBSTEPS, seed=0, ball_collisions=False,
+              integrator='euler', drag=0.0):
+    engine = BallEngine(ball_collisions=ball_collisions, integrator=integrator, drag=drag)
+    engine.spawn(balls, seed=seed)
+    steps = int(seconds / dt)
+    start = time.perf_counter()
+    for _ in range(steps):
+        advance(engine, dt, substeps)
+    elapsed = time.perf_counter() - start
+    return engine, steps, elapsed
+
+
+def show(engine, substeps=SUBSTEPS):
+    import pygame
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption(f"{engine.count} balls in a spinning hexagon")
+    clock = pygame.time.Clock()
+    font = pygame.font.Font(None, 26)
+    running = True
+    while running:
+        dt = min(clock.tick(60) / 1000.0, 0.033)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_r:
+                engine.omega *= -1
+
+        start = time.perf_counter()
+        advance(engine, dt, substeps)
+        physics_ms = (time.perf_counter() - start) * 1000
+
+        screen.fill((10, 10, 25))
+        pygame.draw.polygon(screen, (80, 140, 255), engine.vertices().tolist(), 4)
+        for (x, y), r in zip(engine.pos.tolist(), engine.radius.tolist()):
+            pygame.draw.circle(screen, (255, 75, 75), (x, y), r)
+        text = font.render(f"{engine.count} balls, physics {physics_ms:.1f} ms, {clock.get_fps():.0f} FPS",
+                           True, (100, 255, 255))
+        screen.blit(text, (12, 12))
+        pygame.display.flip()
+    pygame.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--balls', type=int, default=10000)
+    parser.add_argument('--seconds', type=float, default=5.0, help='simulated time for the benchmark')
+    parser.add_argument('--substeps', type=int, default=SUBSTEPS)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--collisions', action='store_true', help='also collide the balls with each other')
+    parser.add_argument('--show', action='store_true', help='open a window instead of benchmarking')
+    parser.add_argument('--integrator', choices=sorted(integrators.INTEGRATORS), default='euler')
+    parser.add_argument('--adaptive', action='store_true', help='per-ball adaptive substeps instead of --substeps')
+    parser.add_argument('--drag', type=float, default=0.0, help='linear air drag per second')
+    args = parser.parse_args()
+    substeps = None if args.adaptive else args.substeps
+
+    if args.show:
+        engine = BallEngine(ball_collisions=args.collisions, integrator=args.integrator, drag=args.drag)
+        engine.spawn(args.balls, seed=args.seed)
+        show(engine, substeps)
+        return
+
+    engine, steps, elapsed = benchmark(args.balls, args.seconds, substeps=substeps, seed=args.seed,
+                                       ball_collisions=args.collisions, integrator=args.integrator, drag=args.drag)
+    per_step = elapsed / steps * 1000
+    per_ball = engine.total_ball_steps / (steps * max(engine.count, 1))
+    print(f'{args.balls} balls, {steps} steps of 1/60 s, {per_ball:.2f} {args.integrator} substeps per ball, '
+          f'in {elapsed:.2f}s')
+    print(f'{per_step:.2f} ms per step, {steps / elapsed:.0f} steps/s '
+          f'({"keeps" if per_step < 1000 / 60 else "misses"} 60 Hz), {engine.escaped()} balls escaped')
+
+
+if __name__ == '__main__':
+    main()
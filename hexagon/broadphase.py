@@ -0,0 +1,205 @@
+"""Ball-ball collisions for BallEngine: uniform grid broadphase and impulse resolver.
+
+find_pairs() bins every ball into a grid of cells one ball diameter wide,
+sorts the balls by cell and, for each ball, looks up its own cell and the
+four neighbours ahead of it (right, and the three below), so every nearby
+pair is produced once. All of it is array work: no Python loop runs per ball
+or per cell, and the cost grows with the number of balls instead of its
+square. Candidate pairs are then trimmed to the ones actually touching.
+
+resolve_pairs() applies one impulse per touching pair, with the same
+restitution and friction factors the wall bounce in claude-4.5-opus.py uses,
+and pushes overlapping balls apart by mass.
+
+    python hexagon/broadphase.py    # scaling benchmark, 100 to 50k balls
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+# Neighbouring cells visited from each cell, (dx, dy); the other four are
+# covered when those cells visit this one
+NEIGHBOURS = ((0, 0), (1, 0), (-1, 1), (0, 1), (1, 1))
+# Largest grid, in cells per ball, indexed with a flat lookup table
+DENSE_CELLS_PER_BALL = 64
+
+
+def find_pairs(pos, radius, cell_size=None):
+    """Index arrays (i, j) of every pair of touching balls, with i < j."""
+    n = len(pos)
+    if n < 2:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty
+    if cell_size is None:
+        cell_size = 2 * float(radius.max())
+
+    origin = pos.min(axis=0)
+    cells = ((pos - origin) // cell_size).astype(np.int64)
+    columns = int(cells[:, 0].max()) + 3
+    rows = int(cells[:, 1].max()) + 3
+    # Shift by one so neighbour lookups at x - 1 never wrap into another row
+    keys = (cells[:, 1] + 1) * columns + cells[:, 0] + 1
+    order = np.argsort(keys, kind='stable')
+    dense = rows * columns <= DENSE_CELLS_PER_BALL * n
+    if dense:
+        # Where each cell's balls sit in sorted order, looked up by cell key
+        per_cell = np.bincount(keys, minlength=rows * columns)
+        cell_end = np.cumsum(per_cell)
+        cell_start = cell_end - per_cell
+    else:
+        # Balls spread far apart, binary search the sorted keys instead
+        sorted_keys = keys[order]
+
+    first, second = [], []
+    for dx, dy in NEIGHBOURS:
+        target = keys + dy * columns + dx
+        if dense:
+            start = cell_start[target]
+            end = cell_end[target]
+        else:
+            start = np.searchsorted(sorted_keys, target, side='left')
+            end = np.searchsorted(sorted_keys, target, side='right')
+        if dx == 0 and dy == 0:
+            # Same cell: only pair with balls after this one in sorted order
+            rank = np.empty(n, dtype=np.int64)
+            rank[order] = np.arange(n)
+            start = rank + 1
+        counts = np.maximum(end - start, 0)
+        total = int(counts.sum())
+        if not total:
+            continue
+        owner = np.repeat(np.arange(n), counts)
+        # Position of each candidate within its owner's run of cell members
+        within = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        first.append(owner)
+        second.append(order[np.repeat(start, counts) + within])
+
+    if not first:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty
+    i = np.concatenate(first)
+    j = np.concatenate(second)
+    delta = pos[j] - pos[i]
+    reach = radius[i] + radius[j]
+    touching = np.einsum('ij,ij->i', delta, delta) < reach * reach
+    i, j = i[touching], j[touching]
+    swap = i > j
+    i[swap], j[swap] = j[swap], i[swap]
+    return i, j
+
+
+def brute_force_pairs(pos, radius):
+    """All-pairs reference for find_pairs, O(n^2) memory."""
+    delta = pos[None, :, :] - pos[:, None, :]
+    dist_sq = np.einsum('ijk,ijk->ij', delta, delta)
+    reach = radius[:, None] + radius[None, :]
+    i, j = np.nonzero(np.triu(dist_sq < reach * reach, k=1))
+    return i, j
+
+
+def resolve_pairs(pos, vel, radius, i, j, restitution, friction):
+    """Bounce and separate touching pairs in place. Masses go with radius squared.
+
+    Impulses of a ball in several contacts are summed, so each step is one
+    Jacobi-style pass over all contacts.
+    """
+    if not len(i):
+        return
+    delta = pos[j] - pos[i]
+    dist = np.sqrt(np.einsum('ij,ij->i', delta, delta))
+    # Coincident centres get an arbitrary normal
+    safe = np.where(dist > 1e-9, dist, 1.0)
+    normal = np.where(dist[:, None] > 1e-9, delta / safe[:, None], [1.0, 0.0])
+    tangent = np.column_stack([-normal[:, 1], normal[:, 0]])
+
+    inv_mass = 1.0 / (radius * radius)
+    inv_i, inv_j = inv_mass[i], inv_mass[j]
+    inv_sum = inv_i + inv_j
+
+    rel = vel[j] - vel[i]
+    vel_normal = np.einsum('ij,ij->i', rel, normal)
+    approaching = vel_normal < 0
+    vel_tangent = np.einsum('ij,ij->i', rel, tangent)
+
+    # Normal impulse reverses the approach speed scaled by restitution, the
+    # tangential one keeps `friction` of the sliding speed, like a wall bounce
+    jn = np.where(approaching, -(1 + restitution) * vel_normal / inv_sum, 0.0)
+    jt = np.where(approaching, -(1 - friction) * vel_tangent / inv_sum, 0.0)
+    impulse = normal * jn[:, None] + tangent * jt[:, None]
+    dv = np.zeros_like(vel)
+    np.add.at(dv, i, -impulse * inv_i[:, None])
+    np.add.at(dv, j, impulse * inv_j[:, None])
+    vel += dv
+
+    # Split the overlap between the two balls by inverse mass. A ball wedged
+    # between several others gets the average of its pushes, not the sum,
+    # so piles settle instead of exploding
+    overlap = radius[i] + radius[j] - dist
+    push = normal * (overlap / inv_sum)[:, None]
+    dp = np.zeros_like(pos)
+    np.add.at(dp, i, -push * inv_i[:, None])
+    np.add.at(dp, j, push * inv_j[:, None])
+    contacts = np.bincount(i, minlength=len(pos)) + np.bincount(j, minlength=len(pos))
+    pos += dp / np.maximum(contacts, 1)[:, None]
+
+
+def radius_for(count, hex_radius, fill=0.3):
+    """Ball radius that fills ``fill`` of the hexagon's area with ``count`` balls."""
+    area = 1.5 * math.sqrt(3) * hex_radius ** 2
+    return math.sqrt(fill * area / (count * math.pi))
+
+
+def benchmark(counts, steps=60, dt=1 / 60, brute_limit=2000, seed=0):
+    from ball_engine import BallEngine
+
+    print(f'{"Balls":>7} {"Radius":>7} {"Pairs":>8} {"Grid ms":>9} {"Resolve ms":>11} {"Step ms":>9} {"All-pairs ms":>13} {"Escaped":>8}')
+    for count in counts:
+        engine = BallEngine(ball_collisions=True)
+        radius = radius_for(count, engine.hex_radius)
+        engine.spawn(count, radius=radius, seed=seed)
+        # Let the balls settle into contact before timing
+        for _ in range(30):
+            engine.step(dt)
+
+        grid_time = resolve_time = 0.0
+        pairs = 0
+        start = time.perf_counter()
+        for _ in range(steps):
+            engine.step(dt)
+        step_time = (time.perf_counter() - start) / steps
+        for _ in range(steps):
+            t0 = time.perf_counter()
+            i, j = find_pairs(engine.pos, engine.radius)
+            t1 = time.perf_counter()
+            resolve_pairs(engine.pos, engine.vel, engine.radius, i, j, engine.restitution, engine.friction)
+            grid_time += t1 - t0
+            resolve_time += time.perf_counter() - t1
+            pairs += len(i)
+
+        brute = '-'
+        if count <= brute_limit:
+            t0 = time.perf_counter()
+            bi, bj = brute_force_pairs(engine.pos, engine.radius)
+            brute = f'{(time.perf_counter() - t0) * 1000:.2f}'
+            gi, gj = find_pairs(engine.pos, engine.radius)
+            if set(zip(bi.tolist(), bj.tolist())) != set(zip(gi.tolist(), gj.tolist())):
+                brute += ' MISMATCH'
+
+        print(f'{count:>7} {radius:>7.2f} {pairs // steps:>8} {grid_time / steps * 1000:>9.2f} '
+              f'{resolve_time / steps * 1000:>11.2f} {step_time * 1000:>9.2f} {brute:>13} {engine.escaped():>8}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--counts', default='100,1000,5000,10000,20000,50000',
+                        help='comma separated ball counts')
+    parser.add_argument('--steps', type=int, default=30, help='timed steps per count')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    benchmark([int(c) for c in args.counts.split(',')], args.steps, seed=args.seed)
+
+
+if __name__ == '__main__':
+    main()
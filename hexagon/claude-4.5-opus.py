@@ -1,6 +1,11 @@
 import pygame
 import math
 import sys
+from functools import lru_cache
+
+import numpy as np
+
+from rotating_polygon import RotatingPolygon
 
 # Initialize Pygame
 pygame.init()
@@ -17,12 +22,14 @@ WHITE = (255, 255, 255)
 RED = (255, 75, 75)
 BLUE = (80, 140, 255)
 CYAN = (100, 255, 255)
+SPRITE_KEY = (0, 0, 0)  # transparent in sprites, unused by anything they draw
 
 # Hexagon settings
 CENTER = [WIDTH // 2, HEIGHT // 2]
 HEX_RADIUS = 270
 hex_angle = 0.0
 hex_angular_velocity = 1.5  # radians per second
+hexagon = RotatingPolygon.regular(6, HEX_RADIUS, CENTER)
 
 # Ball settings
 ball_pos = [float(WIDTH // 2), float(HEIGHT // 2)]
@@ -32,22 +39,15 @@ GRAVITY = 980.0
 RESTITUTION = 0.78  # bounciness (energy loss on bounce)
 FRICTION = 0.992    # tangential friction
 
+# Continuous collision detection
+TOI_ITERATIONS = 20  # bisection steps when refining a time of impact
+MAX_IMPACTS = 8     # impacts resolved per frame before finishing with a plain step
+MAX_DT = 0.1        # longest frame simulated in one go
+
 # Trail effect
-trail = []
 MAX_TRAIL = 40
 
 
-def get_hexagon_vertices(center, radius, angle):
-    """Get the vertices of a hexagon rotated by angle."""
-    vertices = []
-    for i in range(6):
-        vertex_angle = angle + i * math.pi / 3
-        x = center[0] + radius * math.cos(vertex_angle)
-        y = center[1] + radius * math.sin(vertex_angle)
-        vertices.append([x, y])
-    return vertices
-
-
 def point_to_segment_distance(point, seg_start, seg_end):
     """Calculate shortest distance from point to line segment and closest point."""
     px, py = point
@@ -68,55 +68,20 @@ def point_to_segment_distance(point, seg_start, seg_end):
     return dist, closest
 
 
-def get_inward_normal(seg_start, seg_end, center):
-    """Get the inward-pointing unit normal of an edge."""
-    dx = seg_end[0] - seg_start[0]
-    dy = seg_end[1] - seg_start[1]
-    length = math.hypot(dx, dy)
-    
-    if length == 0:
-        return [0, 0]
-    
-    # Two perpendicular unit vectors
-    n1 = [-dy / length, dx / length]
-    n2 = [dy / length, -dx / length]
-    
-    # Edge midpoint
-    mid = [(seg_start[0] + seg_end[0]) / 2, (seg_start[1] + seg_end[1]) / 2]
-    
-    # Choose the one pointing toward center
-    to_center = [center[0] - mid[0], center[1] - mid[1]]
-    
-    if n1[0] * to_center[0] + n1[1] * to_center[1] > 0:
-        return n1
-    return n2
-
-
-def get_wall_velocity(point, center, omega):
-    """Velocity of a point on the rotating hexagon: v = ω × r"""
-    rx = point[0] - center[0]
-    ry = point[1] - center[1]
-    return [-omega * ry, omega * rx]
-
-
 def dot(a, b):
     return a[0] * b[0] + a[1] * b[1]
 
 
-def handle_collision(ball_pos, ball_vel, vertices, omega):
-    """Detect and resolve collisions with hexagon walls."""
-    for i in range(6):
-        seg_start = vertices[i]
-        seg_end = vertices[(i + 1) % 6]
-        
+def handle_collision(ball_pos, ball_vel, polygon, omega):
+    """Detect and resolve collisions with the polygon's walls at its current angle."""
+    for i, (seg_start, seg_end) in enumerate(polygon.edges):
         dist, closest = point_to_segment_distance(ball_pos, seg_start, seg_end)
         
         if dist < BALL_RADIUS:
-            # Get inward normal
-            normal = get_inward_normal(seg_start, seg_end, CENTER)
+            normal = polygon.normals[i]
             
             # Wall velocity at contact point (due to rotation)
-            wall_vel = get_wall_velocity(closest, CENTER, omega)
+            wall_vel = polygon.wall_velocity(closest, omega)
             
             # Ball velocity relative to wall
             rel_vel = [ball_vel[0] - wall_vel[0], ball_vel[1] - wall_vel[1]]
@@ -154,47 +119,171 @@ def handle_collision(ball_pos, ball_vel, vertices, omega):
     return ball_pos, ball_vel
 
 
-def draw_hexagon(surface, vertices, color, width):
+def ball_state_at(pos, vel, t):
+    """Ball position and velocity after t seconds of free flight under gravity."""
+    new_pos = [pos[0] + vel[0] * t, pos[1] + vel[1] * t + 0.5 * GRAVITY * t * t]
+    new_vel = [vel[0], vel[1] + GRAVITY * t]
+    return new_pos, new_vel
+
+
+def get_edge_gaps(pos, angle):
+    """Signed distance from the ball's surface to each edge line, negative past the line."""
+    hexagon.set_angle(angle)
+    return [dist - BALL_RADIUS for dist in hexagon.edge_distances(pos)]
+
+
+def time_of_impact(pos, vel, angle, omega, max_t):
+    """Earliest time in [0, max_t] the ball crosses an edge line it starts clear of, or None.
+
+    The gap to an edge shrinks no faster than the ball's speed plus the speed
+    of the wall under it, so sampling every BALL_RADIUS / that speed seconds
+    cannot jump over a wall. The first sample past a wall is then bisected.
+    """
+    max_speed = math.hypot(vel[0], vel[1]) + GRAVITY * max_t + abs(omega) * hexagon.radius
+    sample = BALL_RADIUS / max_speed
+    # Edges already touching are left to handle_collision's overlap check
+    clear = [gap >= 0 for gap in get_edge_gaps(pos, angle)]
+
+    def hits_wall(t):
+        pos_t, _ = ball_state_at(pos, vel, t)
+        gaps = get_edge_gaps(pos_t, angle + omega * t)
+        return any(is_clear and gap < 0 for is_clear, gap in zip(clear, gaps))
+
+    lo = 0.0
+    while lo < max_t:
+        hi = min(lo + sample, max_t)
+        if hits_wall(hi):
+            for _ in range(TOI_ITERATIONS):
+                mid = (lo + hi) / 2
+                if hits_wall(mid):
+                    hi = mid
+                else:
+                    lo = mid
+            return hi
+        lo = hi
+    return None
+
+
+def step_ball(ball_pos, ball_vel, angle, omega, dt):
+    """Move the ball dt seconds, resolving each wall hit at its time of impact."""
+    remaining = dt
+    for _ in range(MAX_IMPACTS):
+        toi = time_of_impact(ball_pos, ball_vel, angle, omega, remaining)
+        if toi is None:
+            break
+        ball_pos, ball_vel = ball_state_at(ball_pos, ball_vel, toi)
+        angle += omega * toi
+        remaining -= toi
+        hexagon.set_angle(angle)
+        ball_pos, ball_vel = handle_collision(ball_pos, ball_vel, hexagon, omega)
+
+    # Rest of the frame, still checked for overlap in case the impact budget ran out
+    ball_pos, ball_vel = ball_state_at(ball_pos, ball_vel, remaining)
+    hexagon.set_angle(angle + omega * remaining)
+    return handle_collision(ball_pos, ball_vel, hexagon, omega)
+
+
+def make_sprite(half_size, circles):
+    """Draw (color, offset, radius) circles once on a transparent surface centered at half_size."""
+    # The circles are opaque, so a colorkey stands in for per-pixel alpha;
+    # RLE lets blits skip the transparent corners, several times faster
+    sprite = pygame.Surface((2 * half_size + 1, 2 * half_size + 1))
+    sprite.fill(SPRITE_KEY)
+    for color, (dx, dy), radius in circles:
+        pygame.draw.circle(sprite, color, (half_size + dx, half_size + dy), radius)
+    sprite.set_colorkey(SPRITE_KEY, pygame.RLEACCEL)
+    return sprite.convert()
+
+
+# Ball with 3D shading (shadow, body, highlight) and vertex markers, pre-rendered
+BALL_SPRITE_HALF = BALL_RADIUS + 6
+BALL_SPRITE = make_sprite(BALL_SPRITE_HALF, [
+    ((30, 15, 15), (5, 5), BALL_RADIUS),
+    (RED, (0, 0), BALL_RADIUS),
+    ((255, 200, 200), (-5, -5), BALL_RADIUS // 3),
+])
+VERTEX_SPRITE_HALF = 8
+VERTEX_SPRITE = make_sprite(VERTEX_SPRITE_HALF, [(CYAN, (0, 0), 7), (WHITE, (0, 0), 4)])
+
+
+def draw_hexagon(surface, polygon, color, width):
     """Draw hexagon with glow effect."""
-    # Glow layers
-    for w in range(width + 6, width, -2):
-        alpha = 50 - (w - width) * 8
-        glow_color = (color[0] // 4, color[1] // 4, color[2] // 4)
-        int_verts = [(int(v[0]), int(v[1])) for v in vertices]
-        pygame.draw.polygon(surface, glow_color, int_verts, w)
+    # Glow and outline share the polygon's cached vertices. The glow layers
+    # are all one color, so the widest one covers the others exactly
+    int_verts = polygon.int_vertices
+    glow_color = (color[0] // 4, color[1] // 4, color[2] // 4)
+    pygame.draw.polygon(surface, glow_color, int_verts, width + 6)
     
     # Main hexagon
-    int_verts = [(int(v[0]), int(v[1])) for v in vertices]
     pygame.draw.polygon(surface, color, int_verts, width)
-    
-    # Vertices
-    for v in int_verts:
-        pygame.draw.circle(surface, CYAN, v, 7)
-        pygame.draw.circle(surface, WHITE, v, 4)
 
 
-def draw_ball(surface, pos, radius):
-    """Draw ball with 3D shading effect."""
-    x, y = int(pos[0]), int(pos[1])
-    
-    # Shadow
-    pygame.draw.circle(surface, (30, 15, 15), (x + 5, y + 5), radius)
-    
-    # Main ball
-    pygame.draw.circle(surface, RED, (x, y), radius)
-    
-    # Highlight
-    pygame.draw.circle(surface, (255, 200, 200), (x - 5, y - 5), radius // 3)
+def sprite_blits(polygon, pos):
+    """Vertex markers, then the ball, as (sprite, position) pairs for one Surface.blits call."""
+    h = VERTEX_SPRITE_HALF
+    blits = [(VERTEX_SPRITE, (x - h, y - h)) for x, y in polygon.int_vertices]
+    h = BALL_SPRITE_HALF
+    blits.append((BALL_SPRITE, (int(pos[0]) - h, int(pos[1]) - h)))
+    return blits
 
 
-def draw_trail(surface, trail):
-    """Draw motion trail."""
-    for i, (tx, ty) in enumerate(trail):
-        progress = i / len(trail)
+class Trail:
+    """The last ``capacity`` positions of a ball in a NumPy ring buffer."""
+
+    def __init__(self, capacity):
+        self.points = np.zeros((capacity, 2))
+        self.start = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, x, y):
+        # Overwrite the oldest point once full instead of shifting the rest
+        capacity = len(self.points)
+        self.points[(self.start + self.count) % capacity] = (x, y)
+        if self.count < capacity:
+            self.count += 1
+        else:
+            self.start = (self.start + 1) % capacity
+
+    def clear(self):
+        self.start = self.count = 0
+
+    def ordered(self):
+        """Points oldest first."""
+        end = self.start + self.count
+        if end <= len(self.points):
+            return self.points[self.start:end]
+        return np.concatenate((self.points[self.start:], self.points[:end - len(self.points)]))
+
+
+trail = Trail(MAX_TRAIL)
+TRAIL_SPRITE_HALF = max(2, int(BALL_RADIUS * 0.6))
+
+
+@lru_cache(maxsize=None)
+def trail_sprite(radius, color):
+    return make_sprite(TRAIL_SPRITE_HALF, [(color, (0, 0), radius)])
+
+
+@lru_cache(maxsize=None)
+def trail_sprites(length):
+    """Sprites of a trail of ``length`` points, fading and shrinking toward the oldest."""
+    sprites = []
+    for i in range(length):
+        progress = i / length
         alpha = int(180 * progress)
         r = max(2, int(BALL_RADIUS * progress * 0.6))
         color = (min(255, 80 + alpha), 30, 30)
-        pygame.draw.circle(surface, color, (int(tx), int(ty)), r)
+        sprites.append(trail_sprite(r, color))
+    return tuple(sprites)
+
+
+def draw_trail(surface, trail):
+    """Draw motion trail in one batch."""
+    corners = (trail.ordered().astype(int) - TRAIL_SPRITE_HALF).tolist()
+    surface.blits(zip(trail_sprites(len(trail)), corners), doreturn=False)
 
 
 def main():
@@ -205,7 +294,7 @@ def main():
     
     while running:
         dt = clock.tick(60) / 1000.0
-        dt = min(dt, 0.033)  # Cap delta time
+        dt = min(dt, MAX_DT)  # Cap delta time
         
         # Event handling
         for event in pygame.event.get():
@@ -229,31 +318,15 @@ def main():
             hex_angular_velocity -= 2.0 * dt
         hex_angular_velocity = max(-6.0, min(6.0, hex_angular_velocity))
         
+        # Move the ball with continuous collision detection, so it cannot
+        # pass through a wall between frames however fast the hexagon spins
+        ball_pos, ball_vel = step_ball(ball_pos, ball_vel, hex_angle, hex_angular_velocity, dt)
+        
         # Update hexagon rotation
         hex_angle += hex_angular_velocity * dt
         
-        # Physics substeps for stability
-        substeps = 4
-        sub_dt = dt / substeps
-        
-        for _ in range(substeps):
-            # Apply gravity
-            ball_vel[1] += GRAVITY * sub_dt
-            
-            # Update position
-            ball_pos[0] += ball_vel[0] * sub_dt
-            ball_pos[1] += ball_vel[1] * sub_dt
-            
-            # Get hexagon and handle collisions
-            vertices = get_hexagon_vertices(CENTER, HEX_RADIUS, hex_angle)
-            ball_pos, ball_vel = handle_collision(
-                ball_pos, ball_vel, vertices, hex_angular_velocity
-            )
-        
         # Update trail
-        trail.append((ball_pos[0], ball_pos[1]))
-        if len(trail) > MAX_TRAIL:
-            trail.pop(0)
+        trail.append(ball_pos[0], ball_pos[1])
         
         # ===== RENDERING =====
         screen.fill(BLACK)
@@ -263,11 +336,11 @@ def main():
             draw_trail(screen, trail)
         
         # Draw hexagon
-        vertices = get_hexagon_vertices(CENTER, HEX_RADIUS, hex_angle)
-        draw_hexagon(screen, vertices, BLUE, 4)
+        hexagon.set_angle(hex_angle)
+        draw_hexagon(screen, hexagon, BLUE, 4)
         
-        # Draw ball
-        draw_ball(screen, ball_pos, BALL_RADIUS)
+        # Draw vertex markers and ball in one batch
+        screen.blits(sprite_blits(hexagon, ball_pos), doreturn=False)
         
         # Draw UI
         speed = math.hypot(ball_vel[0], ball_vel[1])
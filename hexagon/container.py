@@ -0,0 +1,283 @@
+"""Rotating containers of any simple polygon, convex or concave, with an edge BVH.
+
+RotatingPolygon measures distances to edge lines, which only works for
+convex shapes, and every check visits every edge. Container takes any
+simple polygon, as a vertex list or a file of "x y" lines, and builds a
+bounding-volume hierarchy over its edges once, in the container's own frame:
+
+- each node holds the bounding box of its edges and splits them at the
+  median along the box's longer side, down to LEAF_EDGES per leaf
+- a query rotates the ball's center into the container's frame, the way
+  RotatingPolygon.edge_distances does, so spinning never rebuilds the tree
+- only nodes whose box comes within the ball's radius are opened, so a
+  query costs O(log n) plus the edges actually touched
+
+collide() applies the wall response of claude-4.5-opus.py (restitution,
+friction, wall velocity w x r) against the deepest contact. A contact on
+the inside of an edge pushes along the edge's inward normal; a contact
+with a corner, such as the tip of a concave notch, pushes away from the
+corner.
+
+    python hexagon/container.py    # 6, 64 and 1024 edge containers: BVH vs all-edge checks
+    python hexagon/container.py --load hexagon/containers/notched_hexagon.txt
+"""
+import argparse
+import math
+import random
+import time
+
+LEAF_EDGES = 4
+
+
+class Container:
+    """A simple polygon given by its vertices around ``center`` at angle 0, spinning about the center."""
+
+    def __init__(self, local_vertices, center):
+        if len(local_vertices) < 3:
+            raise ValueError('a polygon needs at least 3 vertices')
+        self.center = (float(center[0]), float(center[1]))
+        points = [(float(x), float(y)) for x, y in local_vertices]
+
+        # Twice the signed area tells the winding, which decides which side is in
+        area = sum(x1 * y2 - x2 * y1 for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1]))
+        if area == 0:
+            raise ValueError('polygon has no area')
+        turn = 1.0 if area > 0 else -1.0
+
+        self.local_vertices = points
+        self.edges = []  # (x1, y1, dx, dy, length squared, nx, ny) in the local frame
+        for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1]):
+            dx, dy = x2 - x1, y2 - y1
+            length = math.hypot(dx, dy)
+            if length == 0:
+                raise ValueError('polygon has a zero-length edge')
+            self.edges.append((x1, y1, dx, dy, length * length, -dy / length * turn, dx / length * turn))
+
+        self.sides = len(points)
+        self.radius = max(math.hypot(x, y) for x, y in points)
+        self.build_tree()
+        self.set_angle(0.0)
+
+    @classmethod
+    def regular(cls, sides, radius, center, angle=0.0):
+        """Regular polygon with ``sides`` corners on a circle of ``radius``, first at ``angle``."""
+        step = 2 * math.pi / sides
+        return cls([(radius * math.cos(angle + i * step), radius * math.sin(angle + i * step))
+                    for i in range(sides)], center)
+
+    @classmethod
+    def star(cls, points, outer, inner, center, angle=0.0):
+        """Concave star with ``points`` tips at ``outer`` radius and notches at ``inner``."""
+        step = math.pi / points
+        return cls([((outer if i % 2 == 0 else inner) * math.cos(angle + i * step),
+                     (outer if i % 2 == 0 else inner) * math.sin(angle + i * step))
+                    for i in range(2 * points)], center)
+
+    @classmethod
+    def load(cls, path, center):
+        """Polygon from a text file of "x y" vertex lines around the center; '#' starts a comment."""
+        vertices = []
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.split('#', 1)[0].replace(',', ' ').split()
+                if line:
+                    vertices.append((float(line[0]), float(line[1])))
+        return cls(vertices, center)
+
+    def build_tree(self):
+        """Bounding boxes over the edges, as flat lists the query walks without recursion."""
+        self.boxes = []   # (min x, min y, max x, max y) per node
+        self.nodes = []   # (first child, second child) for inner nodes, (-1, edge list) for leaves
+
+        def build(indices):
+            xs = [x for i in indices for x in (self.edges[i][0], self.edges[i][0] + self.edges[i][2])]
+            ys = [y for i in indices for y in (self.edges[i][1], self.edges[i][1] + self.edges[i][3])]
+            node = len(self.nodes)
+            self.boxes.append((min(xs), min(ys), max(xs), max(ys)))
+            self.nodes.append(None)
+            if len(indices) <= LEAF_EDGES:
+                self.nodes[node] = (-1, tuple(indices))
+                return node
+            # Split at the median edge midpoint along the box's longer side
+            axis = 0 if max(xs) - min(xs) >= max(ys) - min(ys) else 1
+            indices = sorted(indices, key=lambda i: self.edges[i][axis] + self.edges[i][axis + 2] / 2)
+            half = len(indices) // 2
+            self.nodes[node] = (build(indices[:half]), build(indices[half:]))
+            return node
+
+        build(list(range(self.sides)))
+
+    def set_angle(self, angle):
+        self.angle = angle
+        self.cos = math.cos(angle)
+        self.sin = math.sin(angle)
+
+    def to_local(self, point):
+        rx = point[0] - self.center[0]
+        ry = point[1] - self.center[1]
+        return self.cos * rx + self.sin * ry, self.cos * ry - self.sin * rx
+
+    def to_world(self, point):
+        x, y = point
+        return self.center[0] + self.cos * x - self.sin * y, self.center[1] + self.sin * x + self.cos * y
+
+    @property
+    def vertices(self):
+        return [self.to_world(point) for point in self.local_vertices]
+
+    def contacts(self, point, radius):
+        """Edges within ``radius`` of point as (distance, edge, local closest point), and nodes visited."""
+        px, py = self.to_local(point)
+        found = []
+        visited = 0
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            visited += 1
+            x1, y1, x2, y2 = self.boxes[node]
+            dx = max(x1 - px, 0.0, px - x2)
+            dy = max(y1 - py, 0.0, py - y2)
+            if dx * dx + dy * dy >= radius * radius:
+                continue
+            first, rest = self.nodes[node]
+            if first >= 0:
+                stack.append(first)
+                stack.append(rest)
+                continue
+            for i in rest:
+                ex, ey, edx, edy, length_sq, _, _ = self.edges[i]
+                t = max(0.0, min(1.0, ((px - ex) * edx + (py - ey) * edy) / length_sq))
+                cx, cy = ex + t * edx, ey + t * edy
+                dist = math.hypot(px - cx, py - cy)
+                if dist < radius:
+                    found.append((dist, i, (cx, cy)))
+        return found, visited
+
+    def contacts_brute(self, point, radius):
+        """contacts() without the tree, every edge checked in turn."""
+        px, py = self.to_local(point)
+        found = []
+        for i, (ex, ey, edx, edy, length_sq, _, _) in enumerate(self.edges):
+            t = max(0.0, min(1.0, ((px - ex) * edx + (py - ey) * edy) / length_sq))
+            cx, cy = ex + t * edx, ey + t * edy
+            dist = math.hypot(px - cx, py - cy)
+            if dist < radius:
+                found.append((dist, i, (cx, cy)))
+        return found, self.sides
+
+    def contains(self, point):
+        """Whether point is inside the polygon, by the even-odd rule."""
+        px, py = self.to_local(point)
+        inside = False
+        for (x1, y1), (x2, y2) in zip(self.local_vertices, self.local_vertices[1:] + self.local_vertices[:1]):
+            if (y1 > py) != (y2 > py) and px < x1 + (py - y1) * (x2 - x1) / (y2 - y1):
+                inside = not inside
+        return inside
+
+    def collide(self, pos, vel, radius, omega, restitution, friction):
+        """Bounce a ball off its deepest contact; returns the new (pos, vel)."""
+        found, _ = self.contacts(pos, radius)
+        if not found:
+            return pos, vel
+        dist, i, (cx, cy) = min(found)
+        ex, ey, edx, edy, length_sq, nx, ny = self.edges[i]
+        px, py = self.to_local(pos)
+        # Inside an edge the push is along its normal; at a corner it is
+        # away from the corner, which the edge normal gets wrong in a notch
+        t = ((px - ex) * edx + (py - ey) * edy) / length_sq
+        if (t <= 0 or t >= 1) and dist > 0:
+            nx, ny = (px - cx) / dist, (py - cy) / dist
+        normal = (self.cos * nx - self.sin * ny, self.sin * nx + self.cos * ny)
+        closest = self.to_world((cx, cy))
+
+        wall_vel = (-omega * (closest[1] - self.center[1]), omega * (closest[0] - self.center[0]))
+        rel = (vel[0] - wall_vel[0], vel[1] - wall_vel[1])
+        vel_normal = rel[0] * normal[0] + rel[1] * normal[1]
+        if vel_normal >= 0:
+            return pos, vel
+        tangent = (-normal[1], normal[0])
+        vel_tangent = rel[0] * tangent[0] + rel[1] * tangent[1]
+        new_normal = -vel_normal * restitution
+        new_tangent = vel_tangent * friction
+        vel = [new_normal * normal[0] + new_tangent * tangent[0] + wall_vel[0],
+               new_normal * normal[1] + new_tangent * tangent[1] + wall_vel[1]]
+        penetration = radius - dist + 1.0
+        pos = [pos[0] + normal[0] * penetration, pos[1] + normal[1] * penetration]
+        return pos, vel
+
+
+def near_wall_points(container, radius, count, rng):
+    """Points at most ``radius`` inside a random edge, where queries find contacts."""
+    points = []
+    for _ in range(count):
+        ex, ey, edx, edy, _, nx, ny = container.edges[rng.randrange(container.sides)]
+        t, depth = rng.random(), rng.uniform(0, radius)
+        points.append(container.to_world((ex + t * edx + nx * depth, ey + t * edy + ny * depth)))
+    return points
+
+
+def bounce_test(container, seconds, omega=1.5, radius=8.0, substeps=8):
+    """Simulate a ball in the spinning container; returns (impacts, whether it stayed inside)."""
+    pos, vel = [container.center[0], container.center[1] - 0.3 * container.radius], [250.0, -150.0]
+    dt = 1 / 60 / substeps
+    angle = 0.0
+    impacts = 0
+    for _ in range(int(seconds * 60 * substeps)):
+        vel[1] += 980.0 * dt
+        pos = [pos[0] + vel[0] * dt, pos[1] + vel[1] * dt]
+        angle += omega * dt
+        container.set_angle(angle)
+        new_pos, vel = container.collide(pos, vel, radius, omega, 0.78, 0.992)
+        if new_pos is not pos:
+            impacts += 1
+        pos = new_pos
+        if not container.contains(pos):
+            return impacts, False
+    return impacts, True
+
+
+def benchmark(queries, radius, seconds, seed=0):
+    rng = random.Random(seed)
+    shapes = [(f'regular {n}', Container.regular(n, 270, (400, 350))) for n in (6, 64, 1024)]
+    shapes += [(f'star {2 * n}', Container.star(n, 270, 150, (400, 350))) for n in (32, 512)]
+    print(f'{queries} contact queries per container, ball radius {radius:g}, half of them near a wall')
+    print(f'{"Container":<14} {"All edges us":>13} {"BVH us":>8} {"Speedup":>8} {"Nodes":>6} '
+          f'{"Contacts":>9} {"Impacts":>8} {"Inside":>7}')
+    for label, container in shapes:
+        container.set_angle(0.4)
+        points = near_wall_points(container, radius, queries // 2, rng)
+        points += [(400 + rng.uniform(-100, 100), 350 + rng.uniform(-100, 100)) for _ in range(queries - len(points))]
+
+        timings = []
+        for query in (container.contacts_brute, container.contacts):
+            start = time.perf_counter()
+            results = [query(point, radius) for point in points]
+            timings.append((time.perf_counter() - start) / queries * 1e6)
+        brute = [sorted(found) for found, _ in (container.contacts_brute(p, radius) for p in points)]
+        assert brute == [sorted(found) for found, _ in results], 'BVH and all-edge contacts differ'
+        nodes = sum(visited for _, visited in results) / queries
+        contacts = sum(len(found) for found, _ in results) / queries
+
+        impacts, inside = bounce_test(container, seconds, radius=radius)
+        print(f'{label:<14} {timings[0]:>13.1f} {timings[1]:>8.1f} {timings[0] / timings[1]:>7.1f}x '
+              f'{nodes:>6.1f} {contacts:>9.2f} {impacts:>8} {"yes" if inside else "NO":>7}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--queries', type=int, default=20000)
+    parser.add_argument('--radius', type=float, default=8.0, help='ball radius, px')
+    parser.add_argument('--seconds', type=float, default=10.0, help='simulated time of the bounce check')
+    parser.add_argument('--load', help='benchmark a container loaded from a vertex file instead')
+    args = parser.parse_args()
+    if args.load:
+        container = Container.load(args.load, (400, 350))
+        impacts, inside = bounce_test(container, args.seconds, radius=args.radius)
+        print(f'{args.load}: {container.sides} edges, {len(container.boxes)} BVH nodes, '
+              f'{impacts} impacts in {args.seconds:g} s, ball {"stayed inside" if inside else "ESCAPED"}')
+        return
+    benchmark(args.queries, args.radius, args.seconds)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,379 @@
+"""Headless physics harness for the hexagon variants.
+
+Every variant is a standalone pygame script with its physics inline in the
+main loop, so nothing can be imported without opening a window and running
+forever. The harness parses each script with ast instead:
+
+- the code before the main loop runs once as setup, with SDL's dummy video
+  driver in place of a window
+- the loop body, stripped of event handling, drawing and display calls, is
+  compiled into a step that runs as often as the harness asks
+- clock.tick() returns a fixed STEP_MS, so every variant advances 1/60 s per
+  step whatever its own frame rate
+
+VARIANTS says where each script keeps the ball's position and velocity, the
+ball radius, gravity and the hexagon's vertices. Every variant starts from the
+same state relative to its own hexagon: the ball START_HEIGHT of the radius
+above the center, moving at START_VELOCITY. After each step the harness
+measures:
+
+- steps/s, timed on a separate run without the checks
+- energy: kinetic plus potential above the hexagon's lowest point, in px/s
+  units whatever the script's own units. Spinning walls feed energy in,
+  restitution and drag take it out, so drift shows how each script balances
+  the two, not integration error alone
+- penetration: how far the ball overlaps a wall at the end of a step, and
+  whether its center left the hexagon
+
+    python hexagon/harness.py                      # all variants, markdown table
+    python hexagon/harness.py --only opus,glm --seconds 60
+"""
+import argparse
+import ast
+import copy
+import math
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+HEXAGON_DIR = os.path.dirname(os.path.abspath(__file__))
+
+STEP_HZ = 60
+STEP_MS = 1000 / STEP_HZ
+START_HEIGHT = 0.3              # start this fraction of the hexagon radius above its center
+START_VELOCITY = (250.0, -150.0)  # px/s
+PENETRATION_TOLERANCE = 1.0     # px of overlap tolerated before a step counts as penetrating
+
+
+class Variant:
+    """Where a script keeps its state, as expressions in the script's namespace.
+
+    ``pos`` and ``vel`` are one expression for a 2-vector (list, array or
+    Vector2) or a pair of expressions for x and y. ``loop`` names the function
+    or ``Class.method`` holding the main loop, None for a module-level loop.
+    ``per_frame`` scripts count velocity in px/frame and gravity in
+    px/frame^2 instead of per second.
+    """
+
+    def __init__(self, pos, vel, radius, vertices, gravity, per_frame, loop=None):
+        self.pos = pos
+        self.vel = vel
+        self.radius = radius
+        self.vertices = vertices
+        self.gravity = gravity
+        self.per_frame = per_frame
+        self.loop = loop
+
+
+VARIANTS = {
+    'claude-3.5-haiku.py': Variant(
+        'ball_position', 'ball_velocity', 'ball_radius',
+        'calculate_hexagon_vertices(hexagon_center, hexagon_radius, hexagon_angle)', 'gravity', True),
+    'claude-4.5-opus.py': Variant(
+        'ball_pos', 'ball_vel', 'BALL_RADIUS', 'hexagon.vertices', 'GRAVITY', False, loop='main'),
+    'deepseek-v3.2-exp.py': Variant(
+        'ball_pos', 'ball_vel', 'BALL_RADIUS', 'get_hexagon_vertices(rotation_angle)', 'GRAVITY', True),
+    'deepseek-v3.2-thinking-exp.py': Variant(
+        ('ball.x', 'ball.y'), ('ball.vx', 'ball.vy'), 'ball.radius',
+        'get_hexagon_vertices((WIDTH // 2, HEIGHT // 2), HEXAGON_RADIUS, rotation)', 'GRAVITY', True),
+    'deepseek-v3.py': Variant(
+        'ball_position', 'ball_velocity', 'ball_radius',
+        'calculate_hexagon_vertices(hexagon_center, hexagon_radius, hexagon_angle)', 'gravity', True),
+    'gemini-2.0-flash-thinking-exp-01-21.py': Variant(
+        'ball_pos', 'ball_velocity', 'BALL_RADIUS',
+        'calculate_hexagon_vertices(HEX_CENTER, HEX_RADIUS, rotation)', 'GRAVITY', True, loop='run_game'),
+    'gemini-2.0-flash.py': Variant(
+        ('ball_x', 'ball_y'), ('ball_velocity_x', 'ball_velocity_y'), 'ball_radius',
+        'calculate_hexagon_vertices(hexagon_center, hexagon_radius, rotation_angle)', 'gravity', True),
+    'gemini-2.0-pro-exp-02-05-poe.py': Variant(
+        'ball_pos', 'ball_velocity', 'BALL_RADIUS',
+        'calculate_hexagon_vertices(HEX_CENTER, HEX_RADIUS, rotation)', 'GRAVITY', True, loop='run_game'),
+    'gemini-2.0-pro-exp-02-05.py': Variant(
+        ('ball.x', 'ball.y'), ('ball.vx', 'ball.vy'), 'ball.radius', 'hexagon.vertices', 'GRAVITY', False),
+    'gemini-2.0-pro.py': Variant(
+        'ball.position', 'ball.velocity', 'ball.radius', 'hexagon.vertices', 'GRAVITY.y', True),
+    'gemini-3.0-pro.py': Variant(
+        'self.ball_pos', 'self.ball_vel', 'BALL_RADIUS', 'self.get_hexagon_vertices()', 'GRAVITY', True,
+        loop='Simulation.run'),
+    'glm-4.6-thinking.py': Variant(
+        ('ball.x', 'ball.y'), ('ball.vx', 'ball.vy'), 'ball.radius', 'hexagon.vertices', 'GRAVITY', False,
+        loop='main'),
+    'glm-4.6.py': Variant(
+        ('ball.x', 'ball.y'), ('ball.vx', 'ball.vy'), 'ball.radius', 'hexagon.vertices', 'GRAVITY', False,
+        loop='main'),
+    'gpt-4o-2025-01-29.py': Variant(
+        'ball_pos', 'ball_vel', 'BALL_RADIUS', 'get_hexagon_vertices(CENTER, HEX_RADIUS, angle)', 'GRAVITY', True),
+    'gpt-5.1-codex.py': Variant(
+        'ball_pos', 'ball_vel', 'BALL_RADIUS', 'compute_hex_points(angle)', 'GRAVITY', False, loop='main'),
+    'kimi-k2-thinking.py': Variant(
+        ('ball.x', 'ball.y'), ('ball.vx', 'ball.vy'), 'ball.radius',
+        'regular(HEXAGON_CENTER, HEXAGON_RADIUS, hexagon.rotation)', 'GRAVITY', True, loop='main'),
+    'llama-3.3-70b.py': Variant(
+        ('ball.x', 'ball.y'), ('ball.vx', 'ball.vy'), 'ball.radius',
+        'regular((hexagon.x, hexagon.y), hexagon.radius, hexagon.angle)', '0', True),
+    'llama-tülu3-405b.py': Variant(
+        'ball_pos', 'ball_velocity', 'ball_radius', 'regular((400, 300), 150, math.radians(rotation_angle))',
+        'gravity', True),
+    'minimax-m2.py': Variant(
+        'ball.pos', 'ball.vel', 'ball.r', 'hexa.get_world_vertices()', 'GRAVITY', False, loop='main'),
+    'mistral-large-2.py': Variant(
+        'ball_pos', 'ball_vel', 'ball_radius', 'calculate_hex_vertices(hex_radius, hex_angle)', 'gravity', True),
+    'penguin-alpha.py': Variant(
+        ('self.ball.x', 'self.ball.y'), ('self.ball.vx', 'self.ball.vy'), 'self.ball.radius',
+        'self.hexagon.vertices', 'self.gravity', False, loop='PhysicsSimulation.run'),
+}
+
+
+def regular(center, radius, angle):
+    """Hexagon corners the way most variants compute them: corner i at angle + i * 60 degrees."""
+    return [(center[0] + radius * math.cos(angle + i * math.pi / 3),
+             center[1] + radius * math.sin(angle + i * math.pi / 3)) for i in range(6)]
+
+
+def dotted_name(node):
+    """'pygame.draw.circle' for the expression pygame.draw.circle, '' for anything else."""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if isinstance(node, ast.Name):
+        parts.append(node.id)
+        return '.'.join(reversed(parts))
+    return ''
+
+
+def is_render_call(call):
+    """Calls that only draw, present a frame or wait for one."""
+    name = dotted_name(call.func)
+    if not name:
+        return False
+    last = name.rsplit('.', 1)[-1]
+    return (name.startswith('pygame.') or 'screen' in name.split('.')
+            or last.startswith('draw') or last in ('blit', 'tick'))
+
+
+class StripRendering(ast.NodeTransformer):
+    """Remove events, drawing and display calls from a loop body; fix clock.tick()."""
+
+    def visit_Call(self, node):
+        self.generic_visit(node)
+        if isinstance(node.func, ast.Attribute) and node.func.attr == 'tick':
+            return ast.copy_location(ast.Constant(STEP_MS), node)
+        return node
+
+    def visit_Expr(self, node):
+        if isinstance(node.value, ast.Call) and is_render_call(node.value):
+            return None
+        return self.generic_visit(node)
+
+    def visit_Assign(self, node):
+        # Text surfaces rendered for the HUD
+        if isinstance(node.value, ast.Call) and dotted_name(node.value.func).endswith('.render'):
+            return None
+        return self.generic_visit(node)
+
+    def visit_For(self, node):
+        if isinstance(node.iter, ast.Call) and dotted_name(node.iter.func) == 'pygame.event.get':
+            return None
+        self.generic_visit(node)
+        return node if node.body else None
+
+    def visit_If(self, node):
+        self.generic_visit(node)
+        if not node.body and not node.orelse:
+            return None
+        if not node.body:
+            node.body = [ast.Pass()]
+        return node
+
+
+def find_loop(tree, loop):
+    """Split a script into (setup statements, main while loop)."""
+    if loop is None:
+        for i, node in enumerate(tree.body):
+            if isinstance(node, ast.While):
+                return tree.body[:i], node
+        raise ValueError('no module-level main loop')
+
+    owner, _, name = loop.rpartition('.')
+    scope = tree.body
+    if owner:
+        scope = next(node.body for node in tree.body if isinstance(node, ast.ClassDef) and node.name == owner)
+    function = next(node for node in scope if isinstance(node, ast.FunctionDef) and node.name == name)
+    for i, node in enumerate(function.body):
+        if isinstance(node, ast.While):
+            setup = [node for node in tree.body if not isinstance(node, ast.While)]
+            if owner:
+                # Methods run with self bound to a fresh instance
+                setup += ast.parse(f'self = {owner}()').body
+            # The function's locals become globals of the namespace, so its
+            # global statements are dropped rather than run at module level
+            local_setup = [stmt for stmt in function.body[:i] if not isinstance(stmt, ast.Global)]
+            return setup + local_setup, node
+    raise ValueError(f'no main loop in {loop}')
+
+
+def compile_step(loop, path, transformer=StripRendering):
+    """The loop body as code running ``__steps`` iterations in the script's namespace."""
+    # Transform a copy, the setup still holds the original function
+    body = [transformer().visit(node) for node in copy.deepcopy(loop.body)]
+    body = [node for node in body if node is not None] or [ast.Pass()]
+    steps = ast.parse('for __step in range(__steps): pass').body[0]
+    steps.body = body
+    module = ast.fix_missing_locations(ast.Module(body=[steps], type_ignores=[]))
+    return compile(module, path, 'exec')
+
+
+class Simulation:
+    """One variant loaded headless, stepped a fixed 1/60 s at a time."""
+
+    # Rewrites the loop body before it is compiled into a step
+    transformer = StripRendering
+
+    def __init__(self, filename, variant):
+        self.variant = variant
+        path = os.path.join(HEXAGON_DIR, filename)
+        with open(path, encoding='utf-8') as f:
+            tree = ast.parse(f.read(), path)
+        setup, loop = find_loop(tree, variant.loop)
+        self.step_code = compile_step(loop, path, self.transformer)
+        self.ns = {'__name__': 'hexagon_variant', '__file__': path, 'regular': regular}
+        exec(compile(ast.Module(body=setup, type_ignores=[]), path, 'exec'), self.ns)
+
+        self.scale = STEP_HZ if variant.per_frame else 1
+        self.radius = float(self.eval(variant.radius))
+        self.gravity = float(self.eval(variant.gravity)) * self.scale * self.scale
+        vertices = self.vertices()
+        self.center = (sum(x for x, _ in vertices) / len(vertices), sum(y for _, y in vertices) / len(vertices))
+        self.hex_radius = max(math.hypot(x - self.center[0], y - self.center[1]) for x, y in vertices)
+        self.floor = self.center[1] + self.hex_radius
+
+    def eval(self, expression):
+        return eval(expression, self.ns)
+
+    def assign(self, target, value):
+        # Vectors are written in place so objects shared with the script stay shared
+        if isinstance(target, str):
+            exec(f'{target}[0] = {value[0]!r}\n{target}[1] = {value[1]!r}', self.ns)
+        else:
+            exec(f'{target[0]} = {value[0]!r}\n{target[1]} = {value[1]!r}', self.ns)
+
+    def read(self, source):
+        if isinstance(source, str):
+            vector = self.eval(source)
+            return float(vector[0]), float(vector[1])
+        return float(self.eval(source[0])), float(self.eval(source[1]))
+
+    def vertices(self):
+        return [(float(x), float(y)) for x, y in self.eval(self.variant.vertices)]
+
+    def start(self):
+        """Put the ball at the shared starting state."""
+        self.assign(self.variant.pos, (self.center[0], self.center[1] - START_HEIGHT * self.hex_radius))
+        self.assign(self.variant.vel, (START_VELOCITY[0] / self.scale, START_VELOCITY[1] / self.scale))
+
+    def step(self, steps=1):
+        self.ns['__steps'] = steps
+        exec(self.step_code, self.ns)
+
+    def position(self):
+        return self.read(self.variant.pos)
+
+    def velocity(self):
+        """Ball velocity in px/s."""
+        vx, vy = self.read(self.variant.vel)
+        return vx * self.scale, vy * self.scale
+
+    def energy(self):
+        vx, vy = self.velocity()
+        _, y = self.position()
+        return 0.5 * (vx * vx + vy * vy) + self.gravity * (self.floor - y)
+
+    def wall_clearance(self):
+        """Distance from the ball's center to the nearest wall line, negative outside."""
+        vertices = self.vertices()
+        x, y = self.position()
+        cx, cy = self.center
+        nearest = math.inf
+        for (x1, y1), (x2, y2) in zip(vertices, vertices[1:] + vertices[:1]):
+            nx, ny = y1 - y2, x2 - x1
+            length = math.hypot(nx, ny)
+            # Orient the normal toward the center, whatever the winding
+            side = 1.0 if nx * (cx - x1) + ny * (cy - y1) >= 0 else -1.0
+            nearest = min(nearest, side * (nx * (x - x1) + ny * (y - y1)) / length)
+        return nearest
+
+
+def measure(filename, seconds, timing_steps):
+    variant = VARIANTS[filename]
+    result = {'variant': filename, 'error': None}
+    steps = int(seconds * STEP_HZ)
+    try:
+        sim = Simulation(filename, variant)
+        sim.start()
+        start_energy = sim.energy()
+        peak = start_energy
+        penetrating = 0
+        deepest = 0.0
+        escaped = None
+        for step in range(steps):
+            result['step'] = step
+            sim.step()
+            peak = max(peak, sim.energy())
+            depth = sim.radius - sim.wall_clearance()
+            deepest = max(deepest, depth)
+            if depth > PENETRATION_TOLERANCE:
+                penetrating += 1
+            if escaped is None and depth > sim.radius:
+                escaped = (step + 1) / STEP_HZ
+        result.update(drift=sim.energy() / start_energy - 1, peak=peak / start_energy - 1,
+                      penetrating=penetrating, deepest=deepest, escaped=escaped, steps=steps)
+
+        # Throughput without the per-step checks
+        sim = Simulation(filename, variant)
+        sim.start()
+        t0 = time.perf_counter()
+        sim.step(timing_steps)
+        result['rate'] = timing_steps / (time.perf_counter() - t0)
+    except Exception as exc:
+        result['error'] = f'{type(exc).__name__} at step {result.get("step", 0) + 1}'
+    return result
+
+
+def print_table(results, seconds):
+    print(f'{seconds:g} s at {STEP_HZ} Hz from the same start; energy in px/s units, '
+          f'penetration beyond {PENETRATION_TOLERANCE:g} px\n')
+    print('| Variant | Steps/s | Energy drift | Peak energy | Penetrating steps | Max overlap (px) | Escaped |')
+    print('|---------|---------|--------------|-------------|-------------------|------------------|---------|')
+    for r in results:
+        name = os.path.splitext(r['variant'])[0]
+        if r['error'] and 'drift' not in r:
+            print(f'| {name} | - | - | - | - | - | ❌ {r["error"]} |')
+            continue
+        rate = f'{r["rate"]:,.0f}' if 'rate' in r else '-'
+        escaped = f'❌ at {r["escaped"]:.2f} s' if r['escaped'] is not None else '✅ no'
+        print(f'| {name} | {rate} | {r["drift"]:+.1%} | {r["peak"]:+.1%} | '
+              f'{r["penetrating"]} / {r["steps"]} | {r["deepest"]:.1f} | {escaped} |')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--only', help='comma separated parts of variant file names to run')
+    parser.add_argument('--seconds', type=float, default=20.0, help='simulated time per variant')
+    parser.add_argument('--timing-steps', type=int, default=2000, help='steps in the throughput run')
+    args = parser.parse_args()
+
+    names = sorted(VARIANTS)
+    if args.only:
+        wanted = args.only.split(',')
+        names = [name for name in names if any(part in name for part in wanted)]
+    if HEXAGON_DIR not in sys.path:
+        sys.path.insert(0, HEXAGON_DIR)
+    print_table([measure(name, args.seconds, args.timing_steps) for name in names], args.seconds)
+
+
+if __name__ == '__main__':
+    main()
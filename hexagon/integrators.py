@@ -0,0 +1,132 @@
+"""Time integrators for BallEngine and the error bound that sizes their steps.
+
+Every integrator advances arrays of positions and velocities by h under an
+acceleration accel(pos, vel) and returns the new arrays. h may be a scalar
+or a column of per-ball step sizes.
+
+- semi_implicit_euler: velocity first, then position with the new velocity,
+  what the variants and BallEngine.step have always done. First order.
+- velocity_verlet: second order, one extra acceleration evaluation.
+- rk4: classic fourth-order Runge-Kutta, four evaluations.
+
+BallEngine's acceleration is gravity minus linear drag, a = g - k v, so a
+changes as a' = -k a and the local position error of an order p method is
+about |a| k^(p-1) h^(p+1) / (p+1)!. step_limit() inverts that to the largest
+step that keeps the error under a tolerance. Without drag Verlet and RK4 are
+exact under gravity and only collision proximity limits their steps.
+
+    python hexagon/integrators.py    # accuracy and adaptive substepping benchmark
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+
+def semi_implicit_euler(pos, vel, accel, h):
+    vel = vel + accel(pos, vel) * h
+    pos = pos + vel * h
+    return pos, vel
+
+
+def velocity_verlet(pos, vel, accel, h):
+    a0 = accel(pos, vel)
+    pos = pos + vel * h + 0.5 * a0 * h * h
+    # Velocity-dependent forces are evaluated at a predicted end velocity
+    a1 = accel(pos, vel + a0 * h)
+    vel = vel + 0.5 * (a0 + a1) * h
+    return pos, vel
+
+
+def rk4(pos, vel, accel, h):
+    k1x, k1v = vel, accel(pos, vel)
+    k2x = vel + 0.5 * h * k1v
+    k2v = accel(pos + 0.5 * h * k1x, k2x)
+    k3x = vel + 0.5 * h * k2v
+    k3v = accel(pos + 0.5 * h * k2x, k3x)
+    k4x = vel + h * k3v
+    k4v = accel(pos + h * k3x, k4x)
+    pos = pos + h / 6 * (k1x + 2 * k2x + 2 * k3x + k4x)
+    vel = vel + h / 6 * (k1v + 2 * k2v + 2 * k3v + k4v)
+    return pos, vel
+
+
+INTEGRATORS = {
+    'euler': semi_implicit_euler,
+    'verlet': velocity_verlet,
+    'rk4': rk4,
+}
+ORDER = {semi_implicit_euler: 1, velocity_verlet: 2, rk4: 4}
+
+
+def step_limit(integrator, accel_mag, drag, tolerance):
+    """Largest step per ball keeping the local position error under tolerance, inf if none applies."""
+    order = ORDER[integrator]
+    scale = np.asarray(accel_mag, dtype=np.float64) * drag ** (order - 1) / math.factorial(order + 1)
+    with np.errstate(divide='ignore'):
+        return np.where(scale > 0, (tolerance / np.maximum(scale, 1e-300)) ** (1 / (order + 1)), np.inf)
+
+
+def free_flight_error(integrator, h, seconds=1.0, gravity=980.0, drag=0.5):
+    """Position error after ``seconds`` of flight under gravity and drag, against the exact solution."""
+    g = np.array([0.0, gravity])
+    v0 = np.array([[250.0, -400.0]])
+
+    def accel(pos, vel):
+        return g - drag * vel
+
+    pos, vel = np.zeros((1, 2)), v0.copy()
+    steps = round(seconds / h)
+    for _ in range(steps):
+        pos, vel = integrator(pos, vel, accel, h)
+    t = steps * h
+    # x(t) = g t / k + (v0 - g / k)(1 - e^(-k t)) / k
+    exact = g * t / drag + (v0 - g / drag) * (1 - math.exp(-drag * t)) / drag
+    return float(np.hypot(*(pos - exact)[0]))
+
+
+def benchmark(balls, seconds, drag, tolerance, seed=0):
+    from ball_engine import BallEngine
+
+    print(f'Free flight, 1 s under gravity and drag {drag:g}/s, position error in px:')
+    print(f'{"Integrator":<12}' + ''.join(f'{f"h=1/{round(1 / h)}":>12}' for h in (1 / 15, 1 / 60, 1 / 240)))
+    for name, integrator in INTEGRATORS.items():
+        print(f'{name:<12}' + ''.join(f'{free_flight_error(integrator, h, drag=drag):>12.2e}'
+                                      for h in (1 / 15, 1 / 60, 1 / 240)))
+
+    dt = 1 / 60
+    steps = int(seconds / dt)
+    print(f'\n{balls} balls for {seconds:g} s at 60 Hz, drag {drag:g}/s, adaptive tolerance {tolerance:g} px:')
+    print(f'{"Mode":<22} {"ms/step":>8} {"Steps/ball":>11} {"Max steps":>10} {"Overlap px":>11} {"Escaped":>8}')
+    modes = [(f'{name} x{substeps} fixed', name, substeps) for name in INTEGRATORS for substeps in (4, 16)]
+    modes += [(f'{name} adaptive', name, None) for name in INTEGRATORS]
+    for label, name, substeps in modes:
+        engine = BallEngine(integrator=name, drag=drag)
+        engine.spawn(balls, seed=seed)
+        start = time.perf_counter()
+        for _ in range(steps):
+            if substeps:
+                engine.step(dt, substeps)
+            else:
+                engine.step_adaptive(dt, tolerance)
+        elapsed = time.perf_counter() - start
+        per_ball = engine.total_ball_steps / (steps * engine.count)
+        overlap = float(np.maximum(-engine.wall_gaps(), 0).max())
+        print(f'{label:<22} {elapsed / steps * 1000:>8.2f} {per_ball:>11.2f} {int(engine.ball_steps.max()):>10} '
+              f'{overlap:>11.2f} {engine.escaped():>8}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--balls', type=int, default=5000)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--drag', type=float, default=0.5, help='linear air drag per second')
+    parser.add_argument('--tolerance', type=float, default=0.05, help='adaptive position error per step, px')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    benchmark(args.balls, args.seconds, args.drag, args.tolerance, args.seed)
+
+
+if __name__ == '__main__':
+    main()
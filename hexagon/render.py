@@ -0,0 +1,173 @@
+"""Offline rendering of the hexagon variants, faster than real time and without a window.
+
+The variant is loaded the way harness.py loads it: SDL's dummy video driver
+gives the script an off-screen display surface, events are dropped and
+clock.tick() returns a fixed 1/60 s, but the drawing code is kept. While
+rendering, pygame.display.flip() and update() hand the finished frame to a
+writer instead of presenting it, wherever in the script they are called:
+
+- a video file name (.mp4, .mkv, .webm, .mov) streams raw frames to ffmpeg
+  over a pipe. The pipe reads the display surface's pixel buffer in place,
+  in whatever byte order the surface uses, and ffmpeg encodes in its own
+  process while the script draws the next frame
+- anything else is a directory of numbered images. Each frame is copied,
+  since the script draws over the display surface next frame, and saved by
+  a thread pool while the simulation carries on. PNG compression costs about
+  ten times what drawing a frame does, so --format bmp or tga renders much
+  faster at the price of disk space
+
+    python hexagon/render.py opus --seconds 10 -o opus.mp4
+    python hexagon/render.py glm-4.6.py -o frames/glm --format bmp --workers 8
+"""
+import argparse
+import collections
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+from harness import HEXAGON_DIR, STEP_HZ, VARIANTS, Simulation, StripRendering
+
+VIDEO_EXTENSIONS = ('.mp4', '.mkv', '.webm', '.mov')
+FRAME_FORMATS = ('png', 'bmp', 'tga', 'jpg')
+PENDING_PER_WORKER = 4  # frames queued per image worker before the simulation waits
+
+
+class KeepRendering(StripRendering):
+    """Drop events and fix clock.tick() like StripRendering, but keep every drawing call."""
+
+    def visit_Expr(self, node):
+        return self.generic_visit(node)
+
+    def visit_Assign(self, node):
+        return self.generic_visit(node)
+
+
+class RenderSimulation(Simulation):
+    """A variant whose steps draw to the off-screen display surface."""
+
+    transformer = KeepRendering
+
+
+def pixel_format(surface):
+    """ffmpeg's name for a 32-bit surface's byte order, e.g. 'bgr0' for SDL's usual XRGB8888."""
+    if surface.get_bytesize() != 4 or sys.byteorder != 'little':
+        raise ValueError('raw frames need a 32-bit surface on a little-endian machine')
+    channels = {}
+    for letter, mask in zip('rgb', surface.get_masks()[:3]):
+        channels[(mask.bit_length() - 1) // 8] = letter
+    return ''.join(channels.get(i, '0') for i in range(4))
+
+
+class FFmpegWriter:
+    """Pipes raw frames into ffmpeg, which encodes them to ``path``."""
+
+    def __init__(self, path, surface, fps):
+        ffmpeg = shutil.which('ffmpeg')
+        if ffmpeg is None:
+            raise RuntimeError('ffmpeg not found on PATH, give a directory to write image frames instead')
+        width, height = surface.get_size()
+        if surface.get_pitch() != width * 4:
+            raise ValueError('display surface rows are padded, its pixels cannot be piped as one buffer')
+        self.process = subprocess.Popen(
+            [ffmpeg, '-loglevel', 'error', '-y',
+             '-f', 'rawvideo', '-pix_fmt', pixel_format(surface), '-s', f'{width}x{height}', '-r', str(fps),
+             '-i', '-',
+             # yuv420p wants even dimensions, which not every variant's window has
+             '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p', path],
+            stdin=subprocess.PIPE)
+        self.frames = 0
+
+    def write(self, surface):
+        # Written straight from the surface's buffer; the view locks the
+        # surface until it is released, so it must not outlive the call
+        view = surface.get_view('0')
+        self.process.stdin.write(view)
+        del view
+        self.frames += 1
+
+    def close(self):
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise RuntimeError(f'ffmpeg exited with status {self.process.returncode}')
+
+
+class FrameWriter:
+    """Saves frames as numbered images in ``directory`` from a pool of threads."""
+
+    def __init__(self, directory, workers, image_format='png'):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.extension = image_format
+        self.pool = ThreadPoolExecutor(workers)
+        self.pending = collections.deque()
+        self.limit = workers * PENDING_PER_WORKER
+        self.frames = 0
+
+    def write(self, surface):
+        path = os.path.join(self.directory, f'frame_{self.frames:05d}.{self.extension}')
+        self.pending.append(self.pool.submit(pygame.image.save, surface.copy(), path))
+        self.frames += 1
+        # Bound the copies held in memory when saving falls behind
+        while len(self.pending) > self.limit:
+            self.pending.popleft().result()
+
+    def close(self):
+        while self.pending:
+            self.pending.popleft().result()
+        self.pool.shutdown()
+
+
+def render(filename, out, seconds, workers, image_format='png'):
+    """Render ``seconds`` of a variant from the harness's starting state; returns (frames, elapsed)."""
+    sim = RenderSimulation(filename, VARIANTS[filename])
+    sim.start()
+    surface = pygame.display.get_surface()
+    if os.path.splitext(out)[1].lower() in VIDEO_EXTENSIONS:
+        writer = FFmpegWriter(out, surface, STEP_HZ)
+    else:
+        writer = FrameWriter(out, workers, image_format)
+
+    def capture(*rects):
+        writer.write(pygame.display.get_surface())
+
+    present = pygame.display.flip, pygame.display.update
+    pygame.display.flip = pygame.display.update = capture
+    start = time.perf_counter()
+    try:
+        sim.step(int(seconds * STEP_HZ))
+    finally:
+        pygame.display.flip, pygame.display.update = present
+        writer.close()
+    return writer.frames, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('variant', help='variant file name, or a unique part of it')
+    parser.add_argument('-o', '--out', help='video file or image directory, default frames/<variant>')
+    parser.add_argument('--seconds', type=float, default=10.0, help='simulated time to render')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 4, help='threads saving images')
+    parser.add_argument('--format', choices=FRAME_FORMATS, default='png', help='image format in a frame directory')
+    args = parser.parse_args()
+
+    names = [name for name in sorted(VARIANTS) if args.variant in name]
+    if len(names) != 1:
+        parser.error(f'{args.variant!r} matches {len(names)} variants: {", ".join(names) or "none"}')
+    out = args.out or os.path.join('frames', os.path.splitext(names[0])[0])
+    if os.path.splitext(out)[1].lower() in VIDEO_EXTENSIONS and shutil.which('ffmpeg') is None:
+        parser.error('ffmpeg not found on PATH, give a directory to write image frames instead')
+    if HEXAGON_DIR not in sys.path:
+        sys.path.insert(0, HEXAGON_DIR)
+
+    frames, elapsed = render(names[0], out, args.seconds, args.workers, args.format)
+    print(f'{names[0]}: {frames} frames to {out} in {elapsed:.2f}s, '
+          f'{frames / elapsed:.0f} frames/s, {args.seconds / elapsed:.1f}x real time')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""Convex polygon spinning about a center, with its geometry cached.
+
+Everything that does not change with the angle is computed once: the
+vertices relative to the center, the inward unit normal and length of every
+edge, and each edge line's distance from the center. set_angle() then takes
+one cos/sin pair; the world-space vertices, edges and normals are rotated
+with that matrix the first time something asks for them and kept until the
+angle changes, so collision, rendering and every glow pass share one copy.
+Edge distances rotate the query point into the polygon's frame instead, so
+a search that tries many angles never builds the world geometry at all.
+"""
+import math
+
+
+class RotatingPolygon:
+    """A convex polygon given by its vertices around ``center`` at angle 0."""
+
+    def __init__(self, local_vertices, center):
+        if len(local_vertices) < 3:
+            raise ValueError('a polygon needs at least 3 vertices')
+        self.center = (float(center[0]), float(center[1]))
+        points = [(float(x), float(y)) for x, y in local_vertices]
+
+        # Twice the signed area tells the winding, which decides which side is in
+        area = sum(x1 * y2 - x2 * y1 for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1]))
+        if area == 0:
+            raise ValueError('polygon has no area')
+        turn = 1.0 if area > 0 else -1.0
+
+        self.local_vertices = points
+        self.local_normals = []
+        self.lengths = []
+        self.offsets = []
+        for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1]):
+            dx, dy = x2 - x1, y2 - y1
+            length = math.hypot(dx, dy)
+            if length == 0:
+                raise ValueError('polygon has a zero-length edge')
+            nx, ny = -dy / length * turn, dx / length * turn
+            self.local_normals.append((nx, ny))
+            self.lengths.append(length)
+            # Signed distance from the center to the edge line, positive inside
+            self.offsets.append(-(nx * x1 + ny * y1))
+        if min(self.offsets) <= 0:
+            raise ValueError('center must lie inside the polygon')
+        self.check_convex(points, turn)
+
+        self.sides = len(points)
+        self.radius = max(math.hypot(x, y) for x, y in points)
+        self.angle = None
+        self.set_angle(0.0)
+
+    @classmethod
+    def regular(cls, sides, radius, center, angle=0.0):
+        """Regular polygon with ``sides`` corners on a circle of ``radius``, first at ``angle``."""
+        step = 2 * math.pi / sides
+        vertices = [(radius * math.cos(angle + i * step), radius * math.sin(angle + i * step)) for i in range(sides)]
+        return cls(vertices, center)
+
+    @staticmethod
+    def check_convex(points, turn):
+        n = len(points)
+        for i in range(n):
+            (x0, y0), (x1, y1), (x2, y2) = points[i - 1], points[i], points[(i + 1) % n]
+            cross = (x1 - x0) * (y2 - y1) - (y1 - y0) * (x2 - x1)
+            if cross * turn < 0:
+                raise ValueError('polygon is not convex')
+
+    def set_angle(self, angle):
+        """Rotate to ``angle``. World-space geometry is rebuilt lazily, once per angle."""
+        if angle == self.angle:
+            return
+        self.angle = angle
+        self.cos = math.cos(angle)
+        self.sin = math.sin(angle)
+        self._vertices = None
+        self._normals = None
+        self._edges = None
+        self._int_vertices = None
+
+    @property
+    def vertices(self):
+        if self._vertices is None:
+            c, s = self.cos, self.sin
+            cx, cy = self.center
+            self._vertices = [(cx + c * x - s * y, cy + s * x + c * y) for x, y in self.local_vertices]
+        return self._vertices
+
+    @property
+    def normals(self):
+        """Inward unit normal of every edge."""
+        if self._normals is None:
+            c, s = self.cos, self.sin
+            self._normals = [(c * x - s * y, s * x + c * y) for x, y in self.local_normals]
+        return self._normals
+
+    @property
+    def edges(self):
+        """(start, end) vertex pairs, edge i runs from vertex i to vertex i + 1."""
+        if self._edges is None:
+            vertices = self.vertices
+            self._edges = list(zip(vertices, vertices[1:] + vertices[:1]))
+        return self._edges
+
+    @property
+    def int_vertices(self):
+        """Vertices rounded for pygame drawing."""
+        if self._int_vertices is None:
+            self._int_vertices = [(int(x), int(y)) for x, y in self.vertices]
+        return self._int_vertices
+
+    def edge_distances(self, point):
+        """Signed distance from point to every edge line, positive inside."""
+        # Rotate the point into the polygon's frame instead of the normals into the world
+        rx = point[0] - self.center[0]
+        ry = point[1] - self.center[1]
+        lx = self.cos * rx + self.sin * ry
+        ly = self.cos * ry - self.sin * rx
+        return [nx * lx + ny * ly + offset for (nx, ny), offset in zip(self.local_normals, self.offsets)]
+
+    def wall_velocity(self, point, omega):
+        """Velocity of the polygon's material at point when spinning at omega: w x r."""
+        return [-omega * (point[1] - self.center[1]), omega * (point[0] - self.center[0])]
@@ -0,0 +1,188 @@
+"""Parameter sweeps over the claude-4.5-opus.py hexagon physics, headless and in parallel.
+
+Each configuration loads the script the way harness.py does, sets
+RESTITUTION, FRICTION, GRAVITY and hex_angular_velocity in its namespace,
+starts the ball from the harness's shared state and steps 1/60 s at a time.
+Configurations run in a process pool and every finished one is appended to
+a CSV file, one column per parameter and metric:
+
+- bounces: contacts where a wall changed the ball's velocity by more than
+  BOUNCE_DV beyond what gravity did, after the ball had flown more than
+  BOUNCE_CLEARANCE clear of every wall. A ball lying on a wall keeps hopping
+  off it, since handle_collision pushes it a pixel clear, and those hops
+  are not bounces
+- max_speed: peak ball speed, px/s
+- time_to_rest: when the ball settled against a wall for good, within
+  CONTACT_GAP of it and sliding along it slower than REST_SPEED until the
+  end of the run, at least REST_HOLD seconds; empty if it never did
+- energy_<t>: kinetic plus potential energy every ENERGY_EVERY seconds,
+  relative to the start, so the curves of every run line up as columns
+
+Rerunning the same command with the same --out skips configurations already
+in the file, so an interrupted sweep resumes where it stopped.
+
+    python hexagon/sweep.py --restitution 0.5:0.9:5 --friction 0.98,0.992,1 --omega 0,1.5,3,6
+"""
+import argparse
+import csv
+import itertools
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from harness import HEXAGON_DIR, STEP_HZ, VARIANTS, Simulation
+
+VARIANT = 'claude-4.5-opus.py'
+# Sweep option, script global, default value
+PARAMETERS = [
+    ('restitution', 'RESTITUTION', '0.78'),
+    ('friction', 'FRICTION', '0.992'),
+    ('gravity', 'GRAVITY', '980'),
+    ('omega', 'hex_angular_velocity', '1.5'),
+]
+BOUNCE_DV = 20.0      # px/s of velocity change not explained by gravity that counts as a contact
+BOUNCE_CLEARANCE = 10.0  # px the ball must fly clear of the walls for its next contact to be a bounce
+REST_SPEED = 5.0      # px/s of sliding along the wall below which a touching ball is at rest
+CONTACT_GAP = 2.0     # px between ball and wall still counted as touching
+REST_HOLD = 1.0       # seconds the ball must stay at rest before the end of a run
+ENERGY_EVERY = 0.5    # seconds between energy samples
+
+
+def parse_values(text):
+    """'0.5,0.7' is a list of values, '0.5:0.9:5' five evenly spaced values from 0.5 to 0.9."""
+    if ':' in text:
+        start, stop, count = text.split(':')
+        start, stop, count = float(start), float(stop), int(count)
+        if count == 1:
+            return [start]
+        return [round(start + (stop - start) * i / (count - 1), 12) for i in range(count)]
+    return [float(value) for value in text.split(',')]
+
+
+def run(config, seconds):
+    """Simulate one configuration; returns the config merged with its metrics."""
+    sim = Simulation(VARIANT, VARIANTS[VARIANT])
+    for name, script_name, _ in PARAMETERS:
+        sim.ns[script_name] = config[name]
+    sim.gravity = config['gravity']
+    sim.start()
+
+    hexagon = sim.ns['hexagon']
+    start_energy = sim.energy()
+    sample_every = round(ENERGY_EVERY * STEP_HZ)
+    steps = int(seconds * STEP_HZ)
+    dt = 1 / STEP_HZ
+    energy = [1.0]
+    bounces = 0
+    airborne = True
+    max_speed = math.hypot(*sim.velocity())
+    rest_since = None
+    vx, vy = sim.velocity()
+    for step in range(1, steps + 1):
+        sim.step()
+        new_vx, new_vy = sim.velocity()
+        if sim.wall_clearance() - sim.radius > BOUNCE_CLEARANCE:
+            airborne = True
+        elif airborne and math.hypot(new_vx - vx, new_vy - vy - config['gravity'] * dt) > BOUNCE_DV:
+            bounces += 1
+            airborne = False
+        vx, vy = new_vx, new_vy
+        max_speed = max(max_speed, math.hypot(vx, vy))
+
+        resting = sliding_speed(sim, hexagon, vx, vy) < REST_SPEED
+        if not resting:
+            rest_since = None
+        elif rest_since is None:
+            rest_since = step * dt
+        if step % sample_every == 0:
+            energy.append(sim.energy() / start_energy)
+
+    if rest_since is not None and steps * dt - rest_since < REST_HOLD:
+        rest_since = None
+    result = dict(config, bounces=bounces, max_speed=round(max_speed, 3),
+                  time_to_rest='' if rest_since is None else round(rest_since, 4))
+    for i, value in enumerate(energy):
+        result[energy_column(i)] = round(value, 6)
+    return result
+
+
+def sliding_speed(sim, hexagon, vx, vy):
+    """Ball speed along the wall it touches, relative to the wall; inf when touching none."""
+    pos = sim.position()
+    distances = hexagon.edge_distances(pos)
+    nearest = min(range(len(distances)), key=distances.__getitem__)
+    if distances[nearest] - sim.radius > CONTACT_GAP:
+        return math.inf
+    nx, ny = hexagon.normals[nearest]
+    wall_vx, wall_vy = hexagon.wall_velocity(pos, sim.ns['hex_angular_velocity'])
+    return abs(-ny * (vx - wall_vx) + nx * (vy - wall_vy))
+
+
+def energy_column(i):
+    return f'energy_{i * ENERGY_EVERY:g}'
+
+
+def config_key(config):
+    return tuple(float(config[name]) for name, _, _ in PARAMETERS)
+
+
+def completed_keys(path):
+    """Configurations already recorded in a results file."""
+    if not os.path.exists(path):
+        return set()
+    with open(path, newline='') as f:
+        return {config_key(row) for row in csv.DictReader(f)}
+
+
+def sweep(grid, seconds, out, workers):
+    names = [name for name, _, _ in PARAMETERS]
+    configs = [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+    done = completed_keys(out)
+    todo = [config for config in configs if config_key(config) not in done]
+    print(f'{len(configs)} configurations, {len(configs) - len(todo)} already in {out}, '
+          f'running {len(todo)} on {workers} processes')
+    if not todo:
+        return
+
+    samples = int(seconds / ENERGY_EVERY) + 1
+    columns = names + ['bounces', 'max_speed', 'time_to_rest'] + [energy_column(i) for i in range(samples)]
+    new_file = not os.path.exists(out)
+    if not new_file:
+        with open(out, newline='') as f:
+            header = next(csv.reader(f), [])
+        if header != columns:
+            raise SystemExit(f'{out} was written with other columns, resume it with the same --seconds')
+    start = time.perf_counter()
+    with open(out, 'a', newline='') as f, ProcessPoolExecutor(workers) as pool:
+        writer = csv.DictWriter(f, columns)
+        if new_file:
+            writer.writeheader()
+        futures = [pool.submit(run, config, seconds) for config in todo]
+        for finished, future in enumerate(as_completed(futures), 1):
+            writer.writerow(future.result())
+            # Flushed per row so an interrupted sweep keeps what it finished
+            f.flush()
+            print(f'\r{finished}/{len(todo)} done', end='', flush=True)
+    elapsed = time.perf_counter() - start
+    print(f'\n{len(todo)} runs of {seconds:g} s in {elapsed:.1f}s, {len(todo) * seconds / elapsed:.0f}x real time')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    for name, script_name, default in PARAMETERS:
+        parser.add_argument(f'--{name}', default=default, help=f'values of {script_name}, list a,b or range start:stop:count')
+    parser.add_argument('--seconds', type=float, default=20.0, help='simulated time per configuration')
+    parser.add_argument('--out', default='sweep.csv', help='results file, appended to and resumed from')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    if HEXAGON_DIR not in sys.path:
+        sys.path.insert(0, HEXAGON_DIR)
+
+    grid = {name: parse_values(getattr(args, name)) for name, _, _ in PARAMETERS}
+    sweep(grid, args.seconds, args.out, args.workers)
+
+
+if __name__ == '__main__':
+    main()
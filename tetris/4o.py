@@ -2,6 +2,8 @@
 
 import pygame
 import random
+import piece_source
+import game_loop
 
 # Initialize Pygame
 pygame.init()
@@ -40,6 +42,10 @@ SHAPES = [
     [[1, 1, 1], [0, 0, 1]]   # J
 ]
 
+# Piece names in SHAPES order, for the shared seeded piece stream
+SHAPE_NAMES = 'ITOSZLJ'
+pieces = piece_source.from_env()
+
 # Initialize screen
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("Tetris")
@@ -107,7 +113,7 @@ def check_lost(positions):
 
 def get_shape():
     """Get a random shape."""
-    return Piece(5, 0, random.choice(SHAPES))
+    return Piece(5, 0, SHAPES[SHAPE_NAMES.index(pieces.next())])
 
 
 class Piece:
@@ -175,45 +181,70 @@ def main():
     level_time = 0
     score = 0
 
-    while run:
-        grid = create_grid(locked_positions)
-        fall_speed = 0.27
+    fall_speed = 0.27
+    loop = game_loop.FixedStep(clock)
+    keys = game_loop.KeyRepeat((pygame.K_LEFT, pygame.K_RIGHT, pygame.K_DOWN))
 
-        fall_time += clock.get_rawtime()
-        level_time += clock.get_rawtime()
-        clock.tick()
+    while run:
+        steps = loop.advance()
 
-        if fall_time / 1000 >= fall_speed:
-            fall_time = 0
-            current_piece.y += 1
-            if not (valid_space(current_piece, grid)) and current_piece.y > 0:
-                current_piece.y -= 1
-                change_piece = True
+        for _ in range(steps):
+            grid = create_grid(locked_positions)
+            fall_time += game_loop.STEP_MS
+            level_time += game_loop.STEP_MS
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                run = False
-                pygame.display.quit()
-                quit()
-
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_LEFT:
+            for key in keys.step():
+                if key == pygame.K_LEFT:
                     current_piece.x -= 1
                     if not valid_space(current_piece, grid):
                         current_piece.x += 1
-                if event.key == pygame.K_RIGHT:
+                if key == pygame.K_RIGHT:
                     current_piece.x += 1
                     if not valid_space(current_piece, grid):
                         current_piece.x -= 1
-                if event.key == pygame.K_DOWN:
+                if key == pygame.K_DOWN:
                     current_piece.y += 1
                     if not valid_space(current_piece, grid):
                         current_piece.y -= 1
-                if event.key == pygame.K_UP:
+                if key == pygame.K_UP:
                     current_piece.rotation = (current_piece.rotation + 1) % len(current_piece.shape)
                     if not valid_space(current_piece, grid):
                         current_piece.rotation = (current_piece.rotation - 1) % len(current_piece.shape)
 
+            if fall_time / 1000 >= fall_speed:
+                fall_time = 0
+                current_piece.y += 1
+                if not (valid_space(current_piece, grid)) and current_piece.y > 0:
+                    current_piece.y -= 1
+                    change_piece = True
+
+            if change_piece:
+                for pos in convert_shape_format(current_piece):
+                    locked_positions[(pos[0], pos[1])] = current_piece.color
+                    if pos[1] > -1:
+                        grid[pos[1]][pos[0]] = current_piece.color
+                current_piece = next_piece
+                next_piece = get_shape()
+                change_piece = False
+                score += clear_rows(grid, locked_positions) * 10
+
+                if check_lost(locked_positions):
+                    run = False
+                    break
+
+        # Keys seen this frame act from the next logic step on
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                run = False
+                pygame.display.quit()
+                quit()
+
+            if event.type == pygame.KEYDOWN:
+                keys.press(event.key)
+            elif event.type == pygame.KEYUP:
+                keys.release(event.key)
+
+        grid = create_grid(locked_positions)
         shape_pos = convert_shape_format(current_piece)
 
         for i in range(len(shape_pos)):
@@ -221,22 +252,10 @@ def main():
             if y > -1:
                 grid[y][x] = current_piece.color
 
-        if change_piece:
-            for pos in shape_pos:
-                p = (pos[0], pos[1])
-                locked_positions[p] = current_piece.color
-            current_piece = next_piece
-            next_piece = get_shape()
-            change_piece = False
-            score += clear_rows(grid, locked_positions) * 10
-
         draw_window(grid, score)
         draw_next_shape(next_piece)
         pygame.display.update()
 
-        if check_lost(locked_positions):
-            run = False
-
     pygame.display.quit()
 
 
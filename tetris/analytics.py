@@ -0,0 +1,246 @@
+"""Placement logs and streaming analytics over large Tetris game corpora.
+
+tournament.py --placements FILE writes every locked piece of every game to a
+binary log of fixed-size records (17 bytes each, see PLACEMENT). This module
+reads such logs in chunks of CHUNK_RECORDS with np.fromfile, so memory stays
+flat however many games there are, and folds each chunk into NumPy
+accumulators with bincount:
+
+- a heatmap of the cells pieces lock into
+- line clears by type (single, double, triple, tetris)
+- placements per piece and column, and per piece and rotation
+
+The totals are drawn with matplotlib as PNG files.
+
+    python tetris/tournament.py --games 1000 --placements games.ttpl
+    python tetris/analytics.py games.ttpl --out report
+"""
+import argparse
+import os
+import struct
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+
+from piece_source import PIECES
+
+MAGIC = b'TTPL'
+VERSION = 1
+HEADER = struct.Struct('<4sBBB')  # magic, version, board width, board height
+
+# One locked piece. cells are the four (x, y) board cells it locked into,
+# y counts down from the top and is negative above the board.
+PLACEMENT = np.dtype([
+    ('game', '<u4'),
+    ('piece', 'u1'),
+    ('rotation', 'u1'),
+    ('x', 'i1'),
+    ('y', 'i1'),
+    ('lines', 'u1'),
+    ('cells', 'i1', (4, 2)),
+])
+
+CHUNK_RECORDS = 1 << 16
+CLEAR_NAMES = ('single', 'double', 'triple', 'tetris')
+MAX_ROTATIONS = 4
+
+
+def placement_records(game_id, placements):
+    """Pack (piece, rotation, x, y, lines, cells) tuples of one game into records."""
+    return np.array([(game_id, PIECES.index(piece), rotation, x, y, lines, cells)
+                     for piece, rotation, x, y, lines, cells in placements], dtype=PLACEMENT)
+
+
+class PlacementLog:
+    """Appends placement records to a log file."""
+
+    def __init__(self, path, width, height):
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, width, height))
+        self.records = 0
+
+    def write(self, records):
+        # Accepts a record array or the bytes of one (as sent back by workers)
+        if isinstance(records, bytes):
+            records = np.frombuffer(records, dtype=PLACEMENT)
+        records.tofile(self.file)
+        self.records += len(records)
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_header(f):
+    data = f.read(HEADER.size)
+    if len(data) < HEADER.size:
+        raise ValueError('not a placement log: file too short')
+    magic, version, width, height = HEADER.unpack(data)
+    if magic != MAGIC:
+        raise ValueError('not a placement log: bad magic')
+    if version != VERSION:
+        raise ValueError(f'unsupported placement log version {version}')
+    return width, height
+
+
+def read_placements(path, chunk_records=CHUNK_RECORDS):
+    """Yield (width, height, records) for each chunk of a placement log.
+
+    A log cut short mid-record (a crashed writer) ends at the last full record.
+    """
+    with open(path, 'rb') as f:
+        width, height = read_header(f)
+        while True:
+            records = np.fromfile(f, dtype=PLACEMENT, count=chunk_records)
+            if not len(records):
+                break
+            yield width, height, records
+
+
+class Accumulator:
+    """Running totals over any number of placement chunks."""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.heatmap = np.zeros((height, width), dtype=np.int64)
+        self.clears = np.zeros(len(CLEAR_NAMES) + 1, dtype=np.int64)
+        self.columns = np.zeros((len(PIECES), width), dtype=np.int64)
+        self.rotations = np.zeros((len(PIECES), MAX_ROTATIONS), dtype=np.int64)
+        self.placements = 0
+        self.games = set()
+
+    def add(self, records):
+        self.placements += len(records)
+        self.games.update(np.unique(records['game']).tolist())
+
+        # Cells above the board are part of the top-out, not the stack
+        cells = records['cells'].reshape(-1, 2).astype(np.int64)
+        x, y = cells[:, 0], cells[:, 1]
+        inside = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+        self.heatmap += np.bincount(y[inside] * self.width + x[inside],
+                                    minlength=self.width * self.height).reshape(self.height, self.width)
+
+        self.clears += np.bincount(records['lines'], minlength=len(self.clears))[:len(self.clears)]
+
+        # Placements are keyed by the leftmost column the piece covers
+        piece = records['piece'].astype(np.int64)
+        left = np.clip(records['cells'][:, :, 0].min(axis=1).astype(np.int64), 0, self.width - 1)
+        self.columns += np.bincount(piece * self.width + left,
+                                    minlength=self.columns.size).reshape(self.columns.shape)
+        rotation = np.clip(records['rotation'].astype(np.int64), 0, MAX_ROTATIONS - 1)
+        self.rotations += np.bincount(piece * MAX_ROTATIONS + rotation,
+                                      minlength=self.rotations.size).reshape(self.rotations.shape)
+
+    def merge(self, other):
+        if (other.width, other.height) != (self.width, self.height):
+            raise ValueError('cannot merge accumulators of different board sizes')
+        self.heatmap += other.heatmap
+        self.clears += other.clears
+        self.columns += other.columns
+        self.rotations += other.rotations
+        self.placements += other.placements
+        self.games |= other.games
+
+    def lines(self):
+        return int(np.dot(np.arange(len(self.clears)), self.clears))
+
+
+def analyze(paths, chunk_records=CHUNK_RECORDS):
+    """Stream every log in ``paths`` through one Accumulator and return it."""
+    acc = None
+    for path in paths:
+        for width, height, records in read_placements(path, chunk_records):
+            if acc is None:
+                acc = Accumulator(width, height)
+            elif (width, height) != (acc.width, acc.height):
+                raise ValueError(f'{path}: board is {width}x{height}, expected {acc.width}x{acc.height}')
+            acc.add(records)
+    return acc
+
+
+def print_summary(acc):
+    print(f'{acc.placements} placements in {len(acc.games)} games, {acc.lines()} lines')
+    clears = acc.clears[1:]
+    total = clears.sum()
+    for name, count in zip(CLEAR_NAMES, clears):
+        share = 100 * count / total if total else 0.0
+        print(f'  {name:<7} {count:>10} {share:>6.1f}%')
+    print(f'{"Piece":<6}' + ''.join(f'{"rot " + str(r):>10}' for r in range(MAX_ROTATIONS)))
+    for piece, row in zip(PIECES, acc.rotations):
+        print(f'{piece:<6}' + ''.join(f'{count:>10}' for count in row))
+
+
+def write_report(acc, out_dir):
+    """Draw the accumulated totals to PNG files in out_dir and return their paths."""
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+
+    fig, ax = plt.subplots(figsize=(5, 9))
+    image = ax.imshow(acc.heatmap / max(acc.placements, 1), cmap='inferno')
+    ax.set_title('Locked cells per placement')
+    ax.set_xlabel('column')
+    ax.set_ylabel('row')
+    fig.colorbar(image, ax=ax)
+    paths.append(os.path.join(out_dir, 'heatmap.png'))
+    fig.savefig(paths[-1], dpi=100)
+    plt.close(fig)
+
+    fig, ax = plt.subplots(figsize=(6, 4))
+    ax.bar(CLEAR_NAMES, acc.clears[1:])
+    ax.set_title('Line clears by type')
+    ax.set_ylabel('clears')
+    paths.append(os.path.join(out_dir, 'line_clears.png'))
+    fig.savefig(paths[-1], dpi=100)
+    plt.close(fig)
+
+    fig, (left, right) = plt.subplots(1, 2, figsize=(11, 4), gridspec_kw={'width_ratios': [acc.width, MAX_ROTATIONS + 2]})
+    image = left.imshow(acc.columns, cmap='viridis', aspect='auto')
+    left.set_title('Placements by leftmost column')
+    left.set_xlabel('column')
+    left.set_yticks(range(len(PIECES)), list(PIECES))
+    fig.colorbar(image, ax=left)
+    image = right.imshow(acc.rotations, cmap='viridis', aspect='auto')
+    right.set_title('By rotation')
+    right.set_xticks(range(MAX_ROTATIONS))
+    right.set_yticks(range(len(PIECES)), list(PIECES))
+    fig.colorbar(image, ax=right)
+    fig.tight_layout()
+    paths.append(os.path.join(out_dir, 'placements.png'))
+    fig.savefig(paths[-1], dpi=100)
+    plt.close(fig)
+
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('logs', nargs='+', help='placement logs written by tournament.py --placements')
+    parser.add_argument('--out', default='tetris_report', help='directory for the PNG reports')
+    parser.add_argument('--chunk', type=int, default=CHUNK_RECORDS, help='records read per chunk')
+    parser.add_argument('--no-plots', action='store_true', help='only print the summary')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    acc = analyze(args.logs, args.chunk)
+    elapsed = time.perf_counter() - start
+    if acc is None:
+        parser.error('no placements in the given logs')
+    print_summary(acc)
+    print(f'\nanalyzed in {elapsed:.2f}s ({acc.placements / elapsed:,.0f} placements/s)')
+
+    if not args.no_plots:
+        for path in write_report(acc, args.out):
+            print(f'wrote {path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Frame-time comparison for the HUD text in claude-3.7-sonnet-reasoning.py.
+
+Times draw_score_and_level + draw_next_shape with the font registry and text
+cache against the old path that created a SysFont and re-rendered every
+label on every frame.
+
+    python tetris/bench_hud.py [frames]
+"""
+import sys
+import time
+
+from variants import load_variant
+
+game = load_variant('claude-3.7-sonnet-reasoning.py')
+pygame = game.pygame
+
+
+def draw_hud_uncached(surface, score, high_score, level):
+    # The HUD as it was drawn before the registry and cache
+    font = pygame.font.SysFont('comicsans', 30)
+    surface.blit(font.render(f'Score: {score}', 1, game.WHITE), (30, 30))
+    surface.blit(font.render(f'High Score: {high_score}', 1, game.WHITE), (30, 70))
+    surface.blit(font.render(f'Level: {level}', 1, game.WHITE), (30, 110))
+    font = pygame.font.SysFont('comicsans', 30)
+    surface.blit(font.render('Next Shape:', 1, game.WHITE), (game.SCREEN_WIDTH - 190, game.SCREEN_HEIGHT // 2 - 40))
+
+
+def draw_hud_cached(surface, score, high_score, level, next_piece):
+    game.draw_score_and_level(surface, score, high_score, level)
+    game.draw_next_shape(surface, next_piece)
+
+
+def time_frames(draw, frames):
+    # Score changes every 60 frames, like a line clear now and then
+    start = time.perf_counter()
+    for frame in range(frames):
+        score = (frame // 60) * 40
+        draw(score, max(score, 1200), game.calculate_level(score))
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    surface = pygame.Surface((game.SCREEN_WIDTH, game.SCREEN_HEIGHT))
+    next_piece = game.get_shape()
+
+    uncached = time_frames(lambda s, h, l: draw_hud_uncached(surface, s, h, l), frames)
+    cached = time_frames(lambda s, h, l: draw_hud_cached(surface, s, h, l, next_piece), frames)
+
+    print(f'{"HUD path":<10} {"ms/frame":>10}')
+    print(f'{"uncached":<10} {uncached:>10.4f}')
+    print(f'{"cached":<10} {cached:>10.4f}')
+    print(f'speedup: {uncached / cached:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,6 @@
 import pygame
-import random
+import piece_source
+import rotation
 from typing import List, Tuple
 import time
 
@@ -25,66 +26,29 @@ SIDEBAR_WIDTH = 200
 SCREEN_WIDTH = CELL_SIZE * GRID_WIDTH + SIDEBAR_WIDTH
 SCREEN_HEIGHT = CELL_SIZE * GRID_HEIGHT
 
-# Tetromino shapes - second block in each shape list is the rotation center
+# Tetromino colors, the cells of every rotation come from the SRS tables in rotation.py
 SHAPES = {
-    'I': [[(0, 1), (1, 1), (2, 1), (3, 1)], CYAN],
-    'O': [[(0, 0), (0, 1), (1, 0), (1, 1)], YELLOW],
-    'T': [[(0, 1), (1, 1), (1, 0), (2, 1)], PURPLE],
-    'J': [[(0, 1), (1, 1), (2, 1), (2, 0)], BLUE],
-    'L': [[(0, 1), (1, 1), (2, 1), (0, 0)], ORANGE],
-    'S': [[(0, 1), (1, 1), (1, 0), (2, 0)], GREEN],
-    'Z': [[(0, 0), (1, 0), (1, 1), (2, 1)], RED]
+    'I': CYAN,
+    'O': YELLOW,
+    'T': PURPLE,
+    'J': BLUE,
+    'L': ORANGE,
+    'S': GREEN,
+    'Z': RED
 }
 
-# Wall kick data (based on SRS - Super Rotation System)
-# These values represent counter-clockwise wall kicks.
-WALL_KICKS = {
-    'JLSTZ': [  # For J, L, S, T, Z pieces
-        [(0, 0), (-1, 0), (-1, -1), (0, 2), (-1, 2)],  # from state 0 -> 1
-        [(0, 0), (1, 0), (1, 1), (0, -2), (1, -2)],     # from state 1 -> 2
-        [(0, 0), (1, 0), (1, -1), (0, 2), (1, 2)],       # from state 2 -> 3
-        [(0, 0), (-1, 0), (-1, 1), (0, -2), (-1, -2)],   # from state 3 -> 0
-    ],
-    'I': [  # I piece has different wall kick data
-        [(0, 0), (-2, 0), (1, 0), (-2, 1), (1, -2)],
-        [(0, 0), (-1, 0), (2, 0), (-1, -2), (2, 1)],
-        [(0, 0), (2, 0), (-1, 0), (2, -1), (-1, 2)],
-        [(0, 0), (1, 0), (-2, 0), (1, 2), (-2, -1)],
-    ]
-}
+# Shared seeded piece stream, names match the SHAPES keys
+pieces = piece_source.from_env()
 
 class Tetromino:
     def __init__(self, shape_name: str):
         self.shape_name = shape_name
-        self.shape = SHAPES[shape_name][0]  # List of block positions
-        self.color = SHAPES[shape_name][1]
+        self.shape = rotation.CELLS[shape_name][0]  # List of block positions
+        self.color = SHAPES[shape_name]
         self.x = GRID_WIDTH // 2 - 2
         self.y = 0
         self.rotation_state = 0  # 0-3 representing the current rotation state
 
-    def rotate(self, clockwise: bool = True) -> List[Tuple[int, int]]:
-        # O piece does not rotate
-        if self.color == YELLOW:
-            return self.shape
-
-        # Use the second block as the rotation center
-        cx, cy = self.shape[1]
-        rotated = []
-        for x, y in self.shape:
-            # Translate block relative to the center of rotation
-            dx = x - cx
-            dy = y - cy
-            # Rotate 90 degrees clockwise or counter-clockwise
-            if clockwise:
-                new_dx = dy
-                new_dy = -dx
-            else:
-                new_dx = -dy
-                new_dy = dx
-            # Translate back
-            rotated.append((new_dx + cx, new_dy + cy))
-        return rotated
-
     def get_positions(self) -> List[Tuple[int, int]]:
         return [(x + self.x, y + self.y) for x, y in self.shape]
 
@@ -102,7 +66,7 @@ class TetrisGame:
         self.game_over = False
 
     def new_piece(self) -> Tetromino:
-        return Tetromino(random.choice(list(SHAPES.keys())))
+        return Tetromino(pieces.next())
 
     def valid_move(self, piece: Tetromino, x: int, y: int) -> bool:
         positions = [(px + x, py + y) for px, py in piece.shape]
@@ -113,39 +77,25 @@ class TetrisGame:
             for px, py in positions
         )
 
+    def cells_fit(self, cells: Tuple[Tuple[int, int], ...], x: int, y: int) -> bool:
+        for px, py in cells:
+            px += x
+            py += y
+            if not (0 <= px < GRID_WIDTH and 0 <= py < GRID_HEIGHT) or self.grid[py][px] != BLACK:
+                return False
+        return True
+
     def try_rotate(self, clockwise: bool = True) -> bool:
-        if self.current_piece.color == YELLOW:  # O piece doesn't rotate
+        # Kick tests come precomputed from the SRS tables, no temporary pieces needed
+        piece = self.current_piece
+        direction = rotation.CLOCKWISE if clockwise else rotation.COUNTER_CLOCKWISE
+        result = rotation.rotate(piece.shape_name, piece.rotation_state, piece.x, piece.y, direction, self.cells_fit)
+        if result is None:
             return False
 
-        # Select appropriate wall kick data
-        kick_data = WALL_KICKS['I'] if self.current_piece.shape_name == 'I' else WALL_KICKS['JLSTZ']
-        # Get the rotated shape
-        rotated_shape = self.current_piece.rotate(clockwise=clockwise)
-
-        # Determine the next rotation state based on rotation direction
-        if clockwise:
-            next_rotation = (self.current_piece.rotation_state + 1) % 4
-        else:
-            next_rotation = (self.current_piece.rotation_state - 1) % 4
-
-        # Use current rotation state's wall kick offsets
-        kicks = kick_data[self.current_piece.rotation_state]
-
-        for kick_x, kick_y in kicks:
-            # Create a temporary piece with the new shape and adjusted position
-            temp_piece = Tetromino(self.current_piece.shape_name)
-            temp_piece.shape = rotated_shape
-            temp_piece.x = self.current_piece.x + kick_x
-            temp_piece.y = self.current_piece.y - kick_y  # Subtracting y for Tetris coordinate system
-            if self.valid_move(temp_piece, temp_piece.x, temp_piece.y):
-                # Apply the successful rotation and wall kick
-                self.current_piece.shape = rotated_shape
-                self.current_piece.x = temp_piece.x
-                self.current_piece.y = temp_piece.y
-                self.current_piece.rotation_state = next_rotation
-                return True
-
-        return False
+        piece.rotation_state, piece.x, piece.y = result
+        piece.shape = rotation.CELLS[piece.shape_name][piece.rotation_state]
+        return True
 
     def lock_piece(self) -> None:
         for x, y in self.current_piece.get_positions():
@@ -1,5 +1,5 @@
 import pygame
-import random
+import piece_source
 
 # Initialize Pygame
 pygame.init()
@@ -37,6 +37,10 @@ TETROMINOES = [
     [[0, 0, 1], [1, 1, 1]]   # J
 ]
 
+# Piece names in TETROMINOES order, for the shared seeded piece stream
+SHAPE_NAMES = 'IOTSZLJ'
+pieces = piece_source.from_env()
+
 # Setup game window
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("Tetris")
@@ -53,7 +57,7 @@ class Tetris:
         self.spawn_piece()
         
     def spawn_piece(self):
-        shape = random.randint(0, len(TETROMINOES) - 1)
+        shape = SHAPE_NAMES.index(pieces.next())
         self.current_piece = {
             'shape': TETROMINOES[shape],
             'color': COLORS[shape],
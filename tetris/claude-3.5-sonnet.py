@@ -1,5 +1,6 @@
 import pygame
 import random
+import piece_source
 
 # Initialize Pygame
 pygame.init()
@@ -41,6 +42,10 @@ SHAPES = [
      [1, 1, 0]]
 ]
 
+# Piece names in SHAPES order, for the shared seeded piece stream
+SHAPE_NAMES = 'ILJOSTZ'
+pieces = piece_source.from_env()
+
 class Tetris:
     def __init__(self):
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
@@ -60,7 +65,7 @@ class Tetris:
 
     def new_piece(self):
         # Choose random shape and color
-        self.current_piece = SHAPES[random.randint(0, len(SHAPES) - 1)]
+        self.current_piece = SHAPES[SHAPE_NAMES.index(pieces.next())]
         self.current_color = random.randint(0, len(COLORS) - 1)
         self.current_x = GRID_WIDTH // 2 - len(self.current_piece[0]) // 2
         self.current_y = 0
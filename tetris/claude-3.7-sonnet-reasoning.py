@@ -1,5 +1,8 @@
 import pygame
-import random
+import game_loop
+import piece_source
+import rotation
+import stats_store
 import time
 import os
 
@@ -16,6 +19,13 @@ GRID_HEIGHT = 20
 GRID_OFFSET_X = (SCREEN_WIDTH - GRID_WIDTH * BLOCK_SIZE) // 2
 GRID_OFFSET_Y = SCREEN_HEIGHT - (GRID_HEIGHT * BLOCK_SIZE) - 50
 
+# Line clear flash timing (milliseconds per flash, number of flashes)
+CLEAR_FLASH_INTERVAL = 100
+CLEAR_FLASH_COUNT = 3
+
+# Points per number of rows cleared at once, multiplied by the level
+LINE_SCORES = [0, 40, 100, 300, 1200]
+
 # Colors
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
@@ -194,6 +204,24 @@ SHAPES = [
     ]
 ]
 
+# Piece names in SHAPES order, for the shared seeded piece stream
+SHAPE_NAMES = 'IJLOSTZ'
+# SRS state of each rotation in SHAPES, for the wall kick tables. I, S and Z
+# flip between two states, and J and L turn counter-clockwise
+SRS_STATES = {
+    'I': (0, 1, 0, 1),
+    'J': (2, 1, 0, 3),
+    'L': (2, 1, 0, 3),
+    'O': (0, 0, 0, 0),
+    'S': (2, 1, 2, 1),
+    'T': (2, 3, 0, 1),
+    'Z': (2, 1, 2, 1),
+}
+pieces = piece_source.from_env()
+
+# Name the games are stored under in the stats database
+VARIANT = 'claude-3.7-sonnet-reasoning'
+
 # Setup the screen
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption('Tetris')
@@ -201,6 +229,33 @@ pygame.display.set_caption('Tetris')
 # Initialize clock
 clock = pygame.time.Clock()
 
+# Load fonts once, SysFont does a system font lookup on every call
+FONTS = {size: pygame.font.SysFont('comicsans', size) for size in (30, 40, 60, 80)}
+
+class TextCache:
+    """Rendered text surfaces per HUD slot, re-rendered only when the text changes."""
+    def __init__(self):
+        self.surfaces = {}
+    
+    def render(self, slot, text, size, color):
+        key = (text, size, color)
+        cached = self.surfaces.get(slot)
+        if cached is None or cached[0] != key:
+            cached = (key, FONTS[size].render(text, 1, color))
+            self.surfaces[slot] = cached
+        return cached[1]
+
+text_cache = TextCache()
+
+# Per-game statistics and the high score, opened on first use
+stats = None
+
+def get_stats():
+    global stats
+    if stats is None:
+        stats = stats_store.StatsStore()
+    return stats
+
 # Load sound effects
 try:
     rotate_sound = pygame.mixer.Sound('rotate.wav')
@@ -232,9 +287,22 @@ class Piece:
         self.x = x
         self.y = y
         self.shape = shape
-        self.color = COLORS[SHAPES.index(shape)]
+        self.index = SHAPES.index(shape)
+        self.color = COLORS[self.index]
         self.rotation = 0
 
+def get_piece_bottoms(shape_format):
+    # (column, lowest filled row) for every column the rotation occupies
+    bottoms = {}
+    for i, line in enumerate(shape_format):
+        for j, column in enumerate(line):
+            if column == 'X':
+                bottoms[j] = i
+    return sorted(bottoms.items())
+
+# Per-column bottom offsets for every shape and rotation, indexed like SHAPES
+PIECE_BOTTOMS = [[get_piece_bottoms(shape_format) for shape_format in shape] for shape in SHAPES]
+
 def create_grid(locked_positions={}):
     grid = [[BLACK for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
     
@@ -245,6 +313,43 @@ def create_grid(locked_positions={}):
     
     return grid
 
+def get_column_heights(locked):
+    # Row of the top filled cell in each column, GRID_HEIGHT for an empty column
+    heights = [GRID_HEIGHT] * GRID_WIDTH
+    for x, y in locked:
+        if 0 <= x < GRID_WIDTH and y < heights[x]:
+            heights[x] = y
+    return heights
+
+def lock_column_heights(heights, positions):
+    for x, y in positions:
+        if 0 <= x < GRID_WIDTH and y < heights[x]:
+            heights[x] = y
+
+def get_drop_distance(piece, heights, grid):
+    """How many rows the piece can fall before it lands.
+    
+    Computed from the column heights and the piece's bottom offsets, so it
+    doesn't need a collision check per row. A piece that is already below
+    the surface of a column (slid under an overhang) falls back to stepping
+    down with valid_space.
+    """
+    distance = GRID_HEIGHT
+    for j, bottom in PIECE_BOTTOMS[piece.index][piece.rotation]:
+        gap = heights[piece.x + j] - 1 - (piece.y + bottom)
+        if gap < 0:
+            return scan_drop_distance(piece, grid)
+        distance = min(distance, gap)
+    return distance
+
+def scan_drop_distance(piece, grid):
+    start_y = piece.y
+    while valid_space(piece, grid):
+        piece.y += 1
+    distance = piece.y - 1 - start_y
+    piece.y = start_y
+    return distance
+
 def convert_shape_format(piece):
     positions = []
     shape_format = piece.shape[piece.rotation]
@@ -270,6 +375,20 @@ def valid_space(piece, grid):
     
     return True
 
+def rotate_piece(piece, grid):
+    # Turn to the next rotation, trying the SRS wall kicks in order until one fits
+    old_rotation, old_x, old_y = piece.rotation, piece.x, piece.y
+    piece.rotation = (old_rotation + 1) % len(piece.shape)
+    states = SRS_STATES[SHAPE_NAMES[piece.index]]
+    old_state, new_state = states[old_rotation], states[piece.rotation]
+    direction = rotation.turn_direction(old_state, new_state)
+    for dx, dy in rotation.kick_offsets(SHAPE_NAMES[piece.index], old_state, direction):
+        piece.x, piece.y = old_x + dx, old_y + dy
+        if valid_space(piece, grid):
+            return True
+    piece.rotation, piece.x, piece.y = old_rotation, old_x, old_y
+    return False
+
 def check_lost(positions):
     for pos in positions:
         x, y = pos
@@ -278,7 +397,7 @@ def check_lost(positions):
     return False
 
 def get_shape():
-    return Piece(GRID_WIDTH // 2 - 2, 0, random.choice(SHAPES))
+    return Piece(GRID_WIDTH // 2 - 2, 0, SHAPES[SHAPE_NAMES.index(pieces.next())])
 
 def draw_grid(surface, grid):
     for y in range(GRID_HEIGHT):
@@ -315,26 +434,21 @@ def draw_grid(surface, grid):
         1
     )
 
-def draw_ghost_piece(surface, piece, grid):
-    ghost_piece = Piece(piece.x, piece.y, piece.shape)
+def get_ghost_positions(piece, heights, grid):
+    ghost_piece = Piece(piece.x, piece.y + get_drop_distance(piece, heights, grid), piece.shape)
     ghost_piece.rotation = piece.rotation
-    
-    # Move the ghost piece down until it collides
-    while valid_space(ghost_piece, grid):
-        ghost_piece.y += 1
-    
-    ghost_piece.y -= 1
-    
-    # Draw the ghost piece
-    formatted = convert_shape_format(ghost_piece)
-    
-    for pos in formatted:
-        x, y = pos
+    return convert_shape_format(ghost_piece)
+
+def cell_rect(x, y):
+    return pygame.Rect(GRID_OFFSET_X + x * BLOCK_SIZE, GRID_OFFSET_Y + y * BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE)
+
+def draw_ghost_cells(surface, positions):
+    for x, y in positions:
         if y >= 0:
             pygame.draw.rect(
                 surface, 
                 (50, 50, 50),  # Light gray color for ghost piece
-                (GRID_OFFSET_X + x * BLOCK_SIZE, GRID_OFFSET_Y + y * BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE),
+                cell_rect(x, y),
                 1
             )
 
@@ -355,8 +469,7 @@ def draw_piece(surface, piece, offset=(0, 0)):
 
 def draw_next_shape(surface, piece):
     # Display text
-    font = pygame.font.SysFont('comicsans', 30)
-    label = font.render('Next Shape:', 1, WHITE)
+    label = text_cache.render('next', 'Next Shape:', 30, WHITE)
     
     # Position for the next piece preview
     start_x = SCREEN_WIDTH - 200
@@ -378,36 +491,38 @@ def draw_next_shape(surface, piece):
                     0
                 )
 
-def animate_clear_rows(surface, grid, rows_to_clear):
-    # Flash the rows white before clearing
-    for flash in range(3):
-        for row in rows_to_clear:
-            for x in range(GRID_WIDTH):
-                color = WHITE if flash % 2 == 0 else grid[row][x]
-                pygame.draw.rect(
-                    surface,
-                    color,
-                    (GRID_OFFSET_X + x * BLOCK_SIZE, GRID_OFFSET_Y + row * BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE),
-                    0
-                )
-        
-        pygame.display.update()
-        pygame.time.delay(100)
+class ClearAnimation:
+    """Flash state for rows that were just cleared, advanced by the render loop."""
+    def __init__(self, rows, grid, start_time):
+        self.rows = rows
+        # Snapshot the row colors, the grid itself is shifted right after the clear
+        self.colors = {row: list(grid[row]) for row in rows}
+        self.start_time = start_time
+
+    def is_done(self, now):
+        return now - self.start_time >= CLEAR_FLASH_INTERVAL * CLEAR_FLASH_COUNT
+
+def draw_clear_animation(surface, animation, now):
+    # Flash the cleared rows white, alternating with their original colors
+    flash = (now - animation.start_time) // CLEAR_FLASH_INTERVAL
+    for row in animation.rows:
+        for x in range(GRID_WIDTH):
+            color = WHITE if flash % 2 == 0 else animation.colors[row][x]
+            pygame.draw.rect(
+                surface,
+                color,
+                (GRID_OFFSET_X + x * BLOCK_SIZE, GRID_OFFSET_Y + row * BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE),
+                0
+            )
 
-def clear_rows(grid, locked, surface):
+def find_full_rows(grid):
+    return [i for i in range(len(grid) - 1, -1, -1) if BLACK not in grid[i]]
+
+def clear_rows(grid, locked):
     inc = 0
-    rows_to_clear = []
-    
-    for i in range(len(grid) - 1, -1, -1):
-        row = grid[i]
-        if BLACK not in row:
-            rows_to_clear.append(i)
+    rows_to_clear = find_full_rows(grid)
     
     if rows_to_clear:
-        # Animate clearing
-        animate_clear_rows(surface, grid, rows_to_clear)
-        clear_sound.play()
-        
         # Remove the rows
         for row in rows_to_clear:
             inc += 1
@@ -427,18 +542,16 @@ def clear_rows(grid, locked, surface):
     return inc
 
 def draw_score_and_level(surface, score, high_score, level):
-    font = pygame.font.SysFont('comicsans', 30)
-    
     # Current score
-    score_label = font.render(f'Score: {score}', 1, WHITE)
+    score_label = text_cache.render('score', f'Score: {score}', 30, WHITE)
     surface.blit(score_label, (30, 30))
     
     # High score
-    high_score_label = font.render(f'High Score: {high_score}', 1, WHITE)
+    high_score_label = text_cache.render('high_score', f'High Score: {high_score}', 30, WHITE)
     surface.blit(high_score_label, (30, 70))
     
     # Level
-    level_label = font.render(f'Level: {level}', 1, WHITE)
+    level_label = text_cache.render('level', f'Level: {level}', 30, WHITE)
     surface.blit(level_label, (30, 110))
 
 def draw_pause_screen(surface):
@@ -447,12 +560,12 @@ def draw_pause_screen(surface):
     s.fill((0, 0, 0, 128))
     surface.blit(s, (0, 0))
     
-    font = pygame.font.SysFont('comicsans', 60)
+    font = FONTS[60]
     label = font.render('PAUSED', 1, WHITE)
     
     surface.blit(label, (SCREEN_WIDTH//2 - label.get_width()//2, SCREEN_HEIGHT//2 - label.get_height()//2))
     
-    font = pygame.font.SysFont('comicsans', 30)
+    font = FONTS[30]
     label = font.render('Press P to continue', 1, WHITE)
     
     surface.blit(label, (SCREEN_WIDTH//2 - label.get_width()//2, SCREEN_HEIGHT//2 + 50))
@@ -467,17 +580,17 @@ def draw_game_over(surface, score):
     s.fill((0, 0, 0, 180))
     surface.blit(s, (0, 0))
     
-    font = pygame.font.SysFont('comicsans', 60)
+    font = FONTS[60]
     label = font.render('GAME OVER', 1, RED)
     
     surface.blit(label, (SCREEN_WIDTH//2 - label.get_width()//2, SCREEN_HEIGHT//2 - 100))
     
-    font = pygame.font.SysFont('comicsans', 40)
+    font = FONTS[40]
     score_label = font.render(f'Score: {score}', 1, WHITE)
     
     surface.blit(score_label, (SCREEN_WIDTH//2 - score_label.get_width()//2, SCREEN_HEIGHT//2))
     
-    font = pygame.font.SysFont('comicsans', 30)
+    font = FONTS[30]
     label = font.render('Press any key to restart', 1, WHITE)
     
     surface.blit(label, (SCREEN_WIDTH//2 - label.get_width()//2, SCREEN_HEIGHT//2 + 100))
@@ -485,7 +598,9 @@ def draw_game_over(surface, score):
     pygame.display.update()
     
     waiting = True
+    clock = pygame.time.Clock()
     while waiting:
+        clock.tick(game_loop.IDLE_FPS)
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
@@ -493,39 +608,92 @@ def draw_game_over(surface, score):
             if event.type == pygame.KEYDOWN:
                 waiting = False
 
-def draw_window(surface, grid, score, high_score, level, next_piece=None, current_piece=None, ghost_mode=True):
-    surface.fill(BLACK)
-    
-    # Draw score and level
-    draw_score_and_level(surface, score, high_score, level)
-    
-    # Draw grid and pieces
-    draw_grid(surface, grid)
-    
-    # Draw ghost piece
-    if ghost_mode and current_piece:
-        draw_ghost_piece(surface, current_piece, grid)
-    
-    # Draw current piece
-    if current_piece:
-        draw_piece(surface, current_piece)
-    
-    # Draw next piece
-    if next_piece:
-        draw_next_shape(surface, next_piece)
-    
-    pygame.display.update()
+class BoardRenderer:
+    """Draws the game with dirty rectangles.
+    
+    The grid lines, border and locked cells live on a pre-rendered background
+    layer. A normal frame only restores and redraws the cells covered by the
+    falling piece and its ghost (old and new positions) and passes just those
+    rects to pygame.display.update. The whole window is repainted only when the
+    board or the HUD changes.
+    """
+    def __init__(self, surface):
+        self.surface = surface
+        self.background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.grid = create_grid()
+        self.heights = get_column_heights({})
+        self.full_redraw = True
+        self.hud_state = None
+        self.drawn_cells = set()
+        self.drawn_rows = []
+    
+    def rebuild(self, grid, heights):
+        """Re-render the static board from a grid of locked cells only."""
+        self.grid = grid
+        self.heights = heights
+        self.background.fill(BLACK)
+        draw_grid(self.background, grid)
+        self.full_redraw = True
+    
+    def invalidate(self):
+        self.full_redraw = True
+    
+    def draw(self, score, high_score, level, next_piece, current_piece, ghost_mode=True, clear_animation=None):
+        hud_state = (score, high_score, level, next_piece)
+        if hud_state != self.hud_state:
+            self.hud_state = hud_state
+            self.full_redraw = True
+        
+        # Cells covered by the piece and its ghost this frame
+        piece_cells = [pos for pos in convert_shape_format(current_piece) if pos[1] >= 0]
+        ghost_cells = []
+        if ghost_mode:
+            ghost_cells = [pos for pos in get_ghost_positions(current_piece, self.heights, self.grid) if pos[1] >= 0]
+        cells = set(piece_cells) | set(ghost_cells)
+        rows = clear_animation.rows if clear_animation else []
+        
+        if self.full_redraw:
+            self.surface.blit(self.background, (0, 0))
+            draw_score_and_level(self.surface, score, high_score, level)
+            draw_next_shape(self.surface, next_piece)
+            dirty_rects = None
+        elif cells == self.drawn_cells and not rows and not self.drawn_rows:
+            # Nothing moved since the last frame
+            return
+        else:
+            # Restore the background under everything drawn last frame or this one
+            dirty_rects = []
+            for x, y in self.drawn_cells | cells:
+                rect = cell_rect(x, y)
+                self.surface.blit(self.background, rect, rect)
+                dirty_rects.append(rect)
+            for row in set(self.drawn_rows) | set(rows):
+                rect = pygame.Rect(GRID_OFFSET_X, GRID_OFFSET_Y + row * BLOCK_SIZE, GRID_WIDTH * BLOCK_SIZE, BLOCK_SIZE)
+                self.surface.blit(self.background, rect, rect)
+                dirty_rects.append(rect)
+        
+        # Draw ghost piece, current piece and the line clear flash on top
+        draw_ghost_cells(self.surface, ghost_cells)
+        draw_piece(self.surface, current_piece)
+        if clear_animation:
+            draw_clear_animation(self.surface, clear_animation, pygame.time.get_ticks())
+        
+        if dirty_rects is None:
+            pygame.display.update()
+        else:
+            pygame.display.update(dirty_rects)
+        
+        self.full_redraw = False
+        self.drawn_cells = cells
+        self.drawn_rows = rows
 
 def get_high_score():
-    try:
-        with open('tetris_high_score.txt', 'r') as f:
-            return int(f.read())
-    except:
-        return 0
+    return get_stats().high_score(VARIANT)
 
-def save_high_score(score):
-    with open('tetris_high_score.txt', 'w') as f:
-        f.write(str(score))
+def record_game(score, lines, pieces_placed, level, start_ticks):
+    # Queued for the stats writer thread, the game loop never waits on disk
+    duration = (pygame.time.get_ticks() - start_ticks) / 1000
+    get_stats().record_game(VARIANT, score, lines, pieces_placed, duration, level, seed=pieces.seed)
 
 def calculate_level(score):
     return max(1, score // 1000 + 1)
@@ -533,6 +701,9 @@ def calculate_level(score):
 def get_fall_speed(level):
     return max(0.1, 0.27 - (level - 1) * 0.02)
 
+def score_for_lines(rows_cleared, level):
+    return LINE_SCORES[rows_cleared] * level
+
 def main():
     global grid
     
@@ -540,6 +711,10 @@ def main():
     locked_positions = {}
     grid = create_grid(locked_positions)
     
+    heights = get_column_heights(locked_positions)
+    renderer = BoardRenderer(screen)
+    renderer.rebuild(create_grid(locked_positions), heights)
+    
     change_piece = False
     run = True
     current_piece = get_shape()
@@ -548,129 +723,148 @@ def main():
     fall_time = 0
     score = 0
     level = 1
+    lines = 0
+    pieces_placed = 0
+    start_ticks = pygame.time.get_ticks()
     fall_speed = get_fall_speed(level)
     ghost_mode = True  # Enable ghost piece by default
     paused = False
+    clear_animation = None
+    
+    loop = game_loop.FixedStep(clock)
+    keys = game_loop.KeyRepeat((pygame.K_LEFT, pygame.K_RIGHT, pygame.K_DOWN))
     
     while run:
-        grid = create_grid(locked_positions)
-        
-        if not paused:
-            fall_time += clock.get_rawtime()
-        clock.tick()
-        
-        # Update level based on score
-        current_level = calculate_level(score)
-        if current_level != level:
-            level = current_level
-            fall_speed = get_fall_speed(level)
+        steps = loop.advance(paused)
         
-        # Piece falling logic
-        if not paused and fall_time/1000 >= fall_speed:
-            fall_time = 0
-            current_piece.y += 1
-            if not valid_space(current_piece, grid) and current_piece.y > 0:
-                current_piece.y -= 1
-                change_piece = True
-                fall_sound.play()
+        # Game logic runs in fixed steps, input and gravity count steps not frames
+        for _ in range(steps):
+            grid = create_grid(locked_positions)
+            
+            for key in keys.step():
+                if key == pygame.K_LEFT:
+                    current_piece.x -= 1
+                    if not valid_space(current_piece, grid):
+                        current_piece.x += 1
+                
+                elif key == pygame.K_RIGHT:
+                    current_piece.x += 1
+                    if not valid_space(current_piece, grid):
+                        current_piece.x -= 1
+                
+                elif key == pygame.K_DOWN:
+                    current_piece.y += 1
+                    if not valid_space(current_piece, grid):
+                        current_piece.y -= 1
+                
+                elif key == pygame.K_UP:
+                    # Rotate piece
+                    if rotate_piece(current_piece, grid):
+                        rotate_sound.play()
+                
+                elif key == pygame.K_SPACE:
+                    # Hard drop
+                    current_piece.y += get_drop_distance(current_piece, heights, grid)
+                    change_piece = True
+                    fall_sound.play()
+                    break
+            
+            # Piece falling logic
+            fall_time += game_loop.STEP_MS
+            if not change_piece and fall_time/1000 >= fall_speed:
+                fall_time = 0
+                current_piece.y += 1
+                if not valid_space(current_piece, grid) and current_piece.y > 0:
+                    current_piece.y -= 1
+                    change_piece = True
+                    fall_sound.play()
+            
+            # If piece hit the ground
+            if change_piece:
+                piece_pos = convert_shape_format(current_piece)
+                for pos in piece_pos:
+                    locked_positions[pos] = current_piece.color
+                    if pos[1] > -1:
+                        grid[pos[1]][pos[0]] = current_piece.color
+                lock_column_heights(heights, piece_pos)
+                pieces_placed += 1
+                
+                current_piece = next_piece
+                next_piece = get_shape()
+                change_piece = False
+                fall_time = 0
+                
+                # Start the flash before the rows are removed, it plays out over the next frames
+                full_rows = find_full_rows(grid)
+                if full_rows:
+                    clear_animation = ClearAnimation(full_rows, grid, pygame.time.get_ticks())
+                    clear_sound.play()
+                
+                # Clear rows and update score
+                rows_cleared = clear_rows(grid, locked_positions)
+                if rows_cleared:
+                    heights = get_column_heights(locked_positions)
+                    lines += rows_cleared
+                score += score_for_lines(rows_cleared, level)
+                
+                # Update high score, it is saved with the game's stats when the game ends
+                if score > high_score:
+                    high_score = score
+                
+                # Update level based on score
+                level = calculate_level(score)
+                fall_speed = get_fall_speed(level)
+                
+                # The locked cells changed, re-render the static board layer
+                renderer.rebuild(create_grid(locked_positions), heights)
+                
+                # Check if game over
+                if check_lost(locked_positions):
+                    run = False
+                    break
         
+        # Keys seen this frame act from the next logic step on, whatever the frame rate
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 run = False
+                record_game(score, lines, pieces_placed, level, start_ticks)
                 pygame.quit()
                 quit()
             
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_p:
                     paused = not paused
+                    keys.clear()
                     if paused:
                         draw_pause_screen(screen)
+                    else:
+                        renderer.invalidate()
                 
-                if not paused:
-                    if event.key == pygame.K_LEFT:
-                        current_piece.x -= 1
-                        if not valid_space(current_piece, grid):
-                            current_piece.x += 1
-                    
-                    elif event.key == pygame.K_RIGHT:
-                        current_piece.x += 1
-                        if not valid_space(current_piece, grid):
-                            current_piece.x -= 1
-                    
-                    elif event.key == pygame.K_DOWN:
-                        current_piece.y += 1
-                        if not valid_space(current_piece, grid):
-                            current_piece.y -= 1
-                    
-                    elif event.key == pygame.K_UP:
-                        # Rotate piece
-                        old_rotation = current_piece.rotation
-                        current_piece.rotation = (current_piece.rotation + 1) % len(current_piece.shape)
-                        if not valid_space(current_piece, grid):
-                            current_piece.rotation = old_rotation
-                        else:
-                            rotate_sound.play()
-                    
-                    elif event.key == pygame.K_SPACE:
-                        # Hard drop
-                        while valid_space(current_piece, grid):
-                            current_piece.y += 1
-                        current_piece.y -= 1
-                        change_piece = True
-                        fall_sound.play()
-                    
-                    elif event.key == pygame.K_g:
+                elif not paused:
+                    if event.key == pygame.K_g:
                         # Toggle ghost piece
                         ghost_mode = not ghost_mode
-        
-        # Add piece to the grid if it's locked
-        piece_pos = convert_shape_format(current_piece)
-        
-        # Color the grid where the piece is
-        for i in range(len(piece_pos)):
-            x, y = piece_pos[i]
-            if y > -1:
-                grid[y][x] = current_piece.color
-        
-        # If piece hit the ground
-        if change_piece:
-            for pos in piece_pos:
-                p = (pos[0], pos[1])
-                locked_positions[p] = current_piece.color
-            
-            current_piece = next_piece
-            next_piece = get_shape()
-            change_piece = False
-            
-            # Clear rows and update score
-            rows_cleared = clear_rows(grid, locked_positions, screen)
-            if rows_cleared == 1:
-                score += 40 * level
-            elif rows_cleared == 2:
-                score += 100 * level
-            elif rows_cleared == 3:
-                score += 300 * level
-            elif rows_cleared == 4:
-                score += 1200 * level
+                    else:
+                        keys.press(event.key)
             
-            # Update high score
-            if score > high_score:
-                high_score = score
-                save_high_score(high_score)
+            elif event.type == pygame.KEYUP:
+                keys.release(event.key)
         
         # Update the window
+        if clear_animation and clear_animation.is_done(pygame.time.get_ticks()):
+            clear_animation = None
+        
         if not paused:
-            draw_window(screen, grid, score, high_score, level, next_piece, current_piece, ghost_mode)
+            renderer.draw(score, high_score, level, next_piece, current_piece, ghost_mode, clear_animation)
         
-        # Check if game over
-        if check_lost(locked_positions):
-            run = False
+        if not run:
+            record_game(score, lines, pieces_placed, level, start_ticks)
             draw_game_over(screen, score)
     
     return score, high_score
 
 def draw_controls(surface):
-    font = pygame.font.SysFont('comicsans', 30)
+    font = FONTS[30]
     controls = [
         "Controls:",
         "Left/Right Arrow: Move horizontally",
@@ -689,14 +883,16 @@ def draw_controls(surface):
 
 def main_menu():
     run = True
+    clock = pygame.time.Clock()
     while run:
+        clock.tick(game_loop.IDLE_FPS)
         screen.fill(BLACK)
-        font = pygame.font.SysFont('comicsans', 80)
+        font = FONTS[80]
         title = font.render('TETRIS', 1, CYAN)
         
         screen.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, 150))
         
-        font = pygame.font.SysFont('comicsans', 40)
+        font = FONTS[40]
         label = font.render('Press any key to begin', 1, WHITE)
         
         screen.blit(label, (SCREEN_WIDTH//2 - label.get_width()//2, 300))
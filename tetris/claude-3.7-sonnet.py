@@ -1,5 +1,5 @@
 import pygame
-import random
+import piece_source
 from pygame.locals import *
 
 # Initialize Pygame
@@ -37,6 +37,10 @@ SHAPES = [
     [[1, 1, 0], [0, 1, 1]]   # Z
 ]
 
+# Piece names in SHAPES order, for the shared seeded piece stream
+SHAPE_NAMES = 'IOTJLSZ'
+pieces = piece_source.from_env()
+
 # Colors for each shape
 SHAPE_COLORS = [CYAN, YELLOW, MAGENTA, BLUE, ORANGE, GREEN, RED]
 
@@ -61,7 +65,7 @@ class Tetris:
         
     def new_piece(self):
         # Choose a random shape
-        shape_idx = random.randint(0, len(SHAPES) - 1)
+        shape_idx = SHAPE_NAMES.index(pieces.next())
         self.current_piece = {
             'shape': SHAPES[shape_idx],
             'color': SHAPE_COLORS[shape_idx],
@@ -1,5 +1,5 @@
 import pygame
-import random
+import piece_source
 
 pygame.init()
 
@@ -12,6 +12,9 @@ BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
 GRAY = (128, 128, 128)
 
+# Piece names index self.shapes directly, for the shared seeded piece stream
+pieces = piece_source.from_env()
+
 class Tetris:
     def __init__(self, width=800, height=600):
         self.width = width
@@ -45,21 +48,22 @@ class Tetris:
         self.spawn_piece()
 
     def create_matrix(self, shape):
-        matrix = [[0 for _ in range(len(shape[1]))] for _ in range(len(shape[0]))]
+        matrix = [[0 for _ in range(len(shape[1][0]))] for _ in range(len(shape[1]))]
         for y, row in enumerate(shape[1]):
             for x, value in enumerate(row):
                 if value:
-                    matrix[y][x] = shape[0][1]
+                    matrix[y][x] = shape[0][0]
         return matrix
 
     def spawn_piece(self):
-        shape = random.choice(list(self.shapes.values()))
+        shape = self.shapes[pieces.next()]
+        matrix = self.create_matrix(shape)
         self.current_piece = {
-            'matrix': self.create_matrix(shape),
-            'x': (self.board_width - len(self.current_piece['matrix'][0])) // 2,
+            'matrix': matrix,
+            'x': (self.board_width - len(matrix[0])) // 2,
             'y': 0
         }
-        self.next_piece = random.choice(list(self.shapes.values()))
+        self.next_piece = self.shapes[pieces.next()]
 
     def rotate(self, matrix):
         return [[matrix[len(matrix) - 1 - i][j] for i in range(len(matrix))] for j in range(len(matrix[0]))]
@@ -99,14 +103,14 @@ class Tetris:
         for y in range(self.board_height):
             for x in range(self.board_width):
                 if self.board[y][x] != 0:
-                    pygame.draw.rect(self.screen, (self.board[y][x] * 255 // 8, self.board[y][x] * 255 // 8, 255 - self.board[y][x] * 50),
+                    pygame.draw.rect(self.screen, (self.board[y][x] * 255 // 8, self.board[y][x] * 255 // 8, 255 - self.board[y][x] * 30),
                                      (x * self.size + 100, y * self.size + 100, self.size, self.size), 0)
 
     def draw_piece(self, piece, x, y):
         for i in range(len(piece['matrix'])):
             for j in range(len(piece['matrix'][i])):
                 if piece['matrix'][i][j] != 0:
-                    pygame.draw.rect(self.screen, (piece['matrix'][i][j] * 255 // 8, piece['matrix'][i][j] * 255 // 8, 255 - piece['matrix'][i][j] * 50),
+                    pygame.draw.rect(self.screen, (piece['matrix'][i][j] * 255 // 8, piece['matrix'][i][j] * 255 // 8, 255 - piece['matrix'][i][j] * 30),
                                      ((x + j) * self.size + 100, (y + i) * self.size + 100, self.size, self.size), 0)
 
     def draw(self):
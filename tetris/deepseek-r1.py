@@ -1,5 +1,5 @@
 import pygame
-import random
+import piece_source
 
 # Game Constants
 BLOCK_SIZE = 30
@@ -35,6 +35,10 @@ SHAPES = [
     [[0, 1, 0], [1, 1, 1]]        # T
 ]
 
+# Piece names in SHAPES order, for the shared seeded piece stream
+SHAPE_NAMES = 'IJLOSZT'
+pieces = piece_source.from_env()
+
 class Piece:
     def __init__(self, shape, color):
         self.shape = shape
@@ -74,7 +78,7 @@ class Piece:
         return False
 
 def new_piece():
-    index = random.randint(0, 6)
+    index = SHAPE_NAMES.index(pieces.next())
     return Piece(SHAPES[index], COLORS[index])
 
 def merge_piece(piece, grid):
@@ -0,0 +1,89 @@
+"""Fixed-timestep game loop with DAS/ARR key repeat.
+
+The game logic (gravity, movement, locking) advances in fixed steps of
+1/LOGIC_HZ seconds, however fast the window is drawn. Each frame asks
+FixedStep.advance() how many steps are due; it ticks the pygame clock with a
+frame cap, so the game sleeps between frames instead of spinning, and hands
+the elapsed time to an accumulator. Gravity and key repeat count steps, so a
+game plays the same at 30 or 144 frames per second.
+
+Only the clock's tick() return value is used, which is also what replay.py
+records, so recorded sessions replay step for step.
+"""
+LOGIC_HZ = 60
+STEP_MS = 1000 / LOGIC_HZ
+RENDER_FPS = 60
+# Frame cap while paused or waiting, nothing moves so redraw rarely
+IDLE_FPS = 15
+# Steps run per frame at most, so a long stall (window drag, breakpoint)
+# does not replay seconds of gravity at once
+MAX_STEPS = 5
+
+# Delayed auto shift and auto repeat rate, in logic steps
+DAS_STEPS = 10
+ARR_STEPS = 2
+
+
+class FixedStep:
+    """Turns frame times into a whole number of logic steps."""
+
+    def __init__(self, clock, hz=LOGIC_HZ, max_fps=RENDER_FPS, max_steps=MAX_STEPS):
+        self.clock = clock
+        self.hz = hz
+        self.max_fps = max_fps
+        self.max_steps = max_steps
+        # Elapsed time in ms * hz, kept in integers so step boundaries
+        # fall on the same frame whatever the frame times are
+        self.accumulator = 0
+
+    def advance(self, paused=False):
+        """Wait for the next frame and return the number of logic steps due."""
+        if paused:
+            self.clock.tick(IDLE_FPS)
+            self.accumulator = 0
+            return 0
+        self.accumulator += self.clock.tick(self.max_fps) * self.hz
+        steps, self.accumulator = divmod(self.accumulator, 1000)
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = 0
+        return steps
+
+
+class KeyRepeat:
+    """Held-key repeat counted in logic steps.
+
+    Feed it KEYDOWN/KEYUP keys with press() and release(); step() returns the
+    keys to act on this step: every new press once, and held repeat keys again
+    after ``das`` steps and then every ``arr`` steps.
+    """
+
+    def __init__(self, repeat_keys, das=DAS_STEPS, arr=ARR_STEPS):
+        self.repeat_keys = set(repeat_keys)
+        self.das = das
+        self.arr = arr
+        self.pressed = []
+        self.held = {}
+
+    def press(self, key):
+        self.pressed.append(key)
+        if key in self.repeat_keys:
+            self.held[key] = 0
+
+    def release(self, key):
+        self.held.pop(key, None)
+
+    def clear(self):
+        self.pressed = []
+        self.held.clear()
+
+    def step(self):
+        keys = self.pressed
+        self.pressed = []
+        for key, steps in self.held.items():
+            steps += 1
+            self.held[key] = steps
+            if steps >= self.das and (steps - self.das) % self.arr == 0:
+                keys.append(key)
+        return keys
+
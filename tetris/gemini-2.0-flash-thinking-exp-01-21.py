@@ -1,5 +1,5 @@
 import pygame
-import random
+import piece_source
 
 
 ############
@@ -52,13 +52,17 @@ PIECES = [
 
 PIECE_COLORS = [0, 7, 4, 2, 6, 5, 3] # Colors corresponding to PIECES indices
 
+# Piece names in PIECES order, for the shared seeded piece stream
+SHAPE_NAMES = 'IOSZTLJ'
+piece_stream = piece_source.from_env()
+
 
 # --- Functions ---
 def create_grid():
     return [[0] * GRID_WIDTH for _ in range(GRID_HEIGHT)]
 
 def get_random_piece():
-    piece_index = random.randint(0, len(PIECES) - 1)
+    piece_index = SHAPE_NAMES.index(piece_stream.next())
     return PIECES[piece_index], PIECE_COLORS[piece_index]  # Removed the +1
 
 def rotate_piece(piece):
@@ -1,5 +1,5 @@
 import pygame
-import random
+import piece_source
 
 # Initialize Pygame
 pygame.init()
@@ -35,6 +35,10 @@ SHAPES = [
     [[0, 1, 1], [1, 1, 0]]   # Z
 ]
 
+# Piece names in SHAPES order, for the shared seeded piece stream
+SHAPE_NAMES = 'IOTLJSZ'
+pieces = piece_source.from_env()
+
 COLORS = [CYAN, YELLOW, MAGENTA, ORANGE, BLUE, GREEN, RED]
 
 class Tetris:
@@ -48,7 +52,7 @@ class Tetris:
         self.score = 0
 
     def new_piece(self):
-        shape_idx = random.randint(0, len(SHAPES) - 1)
+        shape_idx = SHAPE_NAMES.index(pieces.next())
         return {
             'shape': SHAPES[shape_idx],
             'color': COLORS[shape_idx],
@@ -1,25 +1,33 @@
 import pygame
 import random
+import piece_source
 
 # Define some colors
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
 GRAY = (128, 128, 128)
 
+# Tetromino shapes
+SHAPES = [
+    [[1, 1, 1, 1]],  # I-Shape
+    [[1, 1], [1, 1]],  # O-Shape
+    [[1, 1, 1], [0, 1, 0]],  # T-Shape
+    [[1, 1, 0], [0, 1, 1]],  # S-Shape
+    [[0, 1, 1], [1, 1, 0]],  # Z-Shape
+    [[1, 0, 0], [1, 1, 1]],  # J-Shape
+    [[0, 0, 1], [1, 1, 1]],  # L-Shape
+]
+
+# Piece names in SHAPES order, for the shared seeded piece stream
+SHAPE_NAMES = 'IOTSZJL'
+pieces = piece_source.from_env()
+
 class Shape:
     def __init__(self):
         self.x = 5
         self.y = 0
         self.color = (random.randint(0, 255), random.randint(0, 255), random.randint(0, 255))
-        self.blocks = random.choice([
-            [[1, 1, 1, 1]],  # I-Shape
-            [[1, 1], [1, 1]],  # O-Shape
-            [[1, 1, 1], [0, 1, 0]],  # T-Shape
-            [[1, 1, 0], [0, 1, 1]],  # S-Shape
-            [[0, 1, 1], [1, 1, 0]],  # Z-Shape
-            [[1, 0, 0], [1, 1, 1]],  # J-Shape
-            [[0, 0, 1], [1, 1, 1]],  # L-Shape
-        ])
+        self.blocks = SHAPES[SHAPE_NAMES.index(pieces.next())]
 
     def rotate(self):
         self.blocks = [list(reversed(x)) for x in zip(*self.blocks)]
@@ -1,5 +1,6 @@
 import pygame
 import random
+import piece_source
 
 pygame.init()
 
@@ -9,6 +10,21 @@ WHITE    = ( 255, 255, 255)
 GRAY     = ( 128, 128, 128)
 RED      = ( 255,   0,   0)
 
+# Tetromino shapes
+SHAPES = [
+    [[1, 1, 1, 1]],  # I
+    [[1, 1], [1, 1]],  # O
+    [[0, 1, 0], [1, 1, 1]],  # T
+    [[1, 0, 0], [1, 1, 1]],  # J
+    [[0, 0, 1], [1, 1, 1]],  # L
+    [[1, 1, 0], [0, 1, 1]],  # S
+    [[0, 1, 1], [1, 1, 0]]   # Z
+]
+
+# Piece names in SHAPES order, for the shared seeded piece stream
+SHAPE_NAMES = 'IOTJLSZ'
+pieces = piece_source.from_env()
+
 size = (400, 500)
 screen = pygame.display.set_mode(size)
 pygame.display.set_caption("Tetris")
@@ -22,15 +38,7 @@ class Shape:
         self.x = 5
         self.y = 0
         self.color = random.choice([(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0), (255, 0, 255), (0, 255, 255)])
-        self.blocks = random.choice([
-            [[1, 1, 1, 1]],  # I
-            [[1, 1], [1, 1]],  # O
-            [[0, 1, 0], [1, 1, 1]],  # T
-            [[1, 0, 0], [1, 1, 1]],  # J
-            [[0, 0, 1], [1, 1, 1]],  # L
-            [[1, 1, 0], [0, 1, 1]],  # S
-            [[0, 1, 1], [1, 1, 0]]   # Z
-        ])
+        self.blocks = SHAPES[SHAPE_NAMES.index(pieces.next())]
 
     def rotate(self):
         self.blocks = [list(reversed(x)) for x in zip(*self.blocks)]
@@ -1,5 +1,6 @@
 import pygame
 import random
+import piece_source
 
 # Initialize Pygame
 pygame.init()
@@ -41,6 +42,10 @@ SHAPES = [
      [1, 1, 1]]                              # T
 ]
 
+# Piece names in SHAPES order, for the shared seeded piece stream
+SHAPE_NAMES = 'IOJLSZT'
+pieces = piece_source.from_env()
+
 COLORS = [RED, GREEN, BLUE, ORANGE, YELLOW, PURPLE, CYAN]
 
 # Define a function to rotate the shape clockwise
@@ -82,7 +87,7 @@ def clear_lines(board):
     return new_board, lines_cleared
 
 def generate_shape():
-    shape = random.choice(SHAPES)
+    shape = SHAPES[SHAPE_NAMES.index(pieces.next())]
     color = random.choice(COLORS)
     return shape, color
 
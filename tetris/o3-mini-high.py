@@ -1,5 +1,7 @@
 import pygame
-import random
+import game_loop
+import piece_source
+import rotation
 
 # Initialize pygame fonts
 pygame.font.init()
@@ -171,6 +173,20 @@ T = [
 
 # List of shapes and their corresponding colors
 shapes = [S, Z, I, O, J, L, T]
+
+# Piece names in shapes order, for the shared seeded piece stream
+SHAPE_NAMES = 'SZIOJLT'
+# SRS state of each rotation of a shape, for the wall kick tables
+SRS_STATES = {
+    'S': (2, 1),
+    'Z': (2, 3),
+    'I': (1, 0),
+    'O': (0,),
+    'J': (0, 1, 2, 3),
+    'L': (0, 1, 2, 3),
+    'T': (0, 1, 2, 3),
+}
+pieces = piece_source.from_env()
 shape_colors = [
     (0, 255, 0),      # S - Green
     (255, 0, 0),      # Z - Red
@@ -239,6 +255,24 @@ def valid_space(piece, grid):
     return True
 
 
+def rotate_piece(piece, grid):
+    """
+    Rotate the piece clockwise, trying the SRS wall kicks in order until one fits.
+    Returns True if the piece turned.
+    """
+    old_rotation, old_x, old_y = piece.rotation, piece.x, piece.y
+    piece.rotation = (old_rotation + 1) % len(piece.shape)
+    name = SHAPE_NAMES[shapes.index(piece.shape)]
+    old_state, new_state = SRS_STATES[name][old_rotation], SRS_STATES[name][piece.rotation]
+    direction = rotation.turn_direction(old_state, new_state)
+    for dx, dy in rotation.kick_offsets(name, old_state, direction):
+        piece.x, piece.y = old_x + dx, old_y + dy
+        if valid_space(piece, grid):
+            return True
+    piece.rotation, piece.x, piece.y = old_rotation, old_x, old_y
+    return False
+
+
 def check_lost(locked_positions):
     """
     Check if any locked position is above the top of the play area.
@@ -254,7 +288,7 @@ def get_shape():
     """
     Return a random new piece.
     """
-    return Piece(5, 0, random.choice(shapes))
+    return Piece(5, 0, shapes[SHAPE_NAMES.index(pieces.next())])
 
 
 def draw_text_middle(text, size, color, surface):
@@ -397,51 +431,75 @@ def main(win):
 
     score = 0
 
+    loop = game_loop.FixedStep(clock)
+    keys = game_loop.KeyRepeat((pygame.K_LEFT, pygame.K_RIGHT, pygame.K_DOWN))
+
     while run:
-        grid = create_grid(locked_positions)
-        fall_time += clock.get_rawtime()
-        level_time += clock.get_rawtime()
-        clock.tick()
-
-        # Increase difficulty over time
-        if level_time / 1000 > 5:
-            level_time = 0
-            if fall_speed > 0.12:
-                fall_speed -= 0.005
-
-        # Piece falling logic
-        if fall_time / 1000 > fall_speed:
-            fall_time = 0
-            current_piece.y += 1
-            if not valid_space(current_piece, grid) and current_piece.y > 0:
-                current_piece.y -= 1
-                change_piece = True
-
-        # Event handling
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                run = False
-                pygame.display.quit()
-                quit()
+        steps = loop.advance()
 
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_LEFT:
+        for _ in range(steps):
+            grid = create_grid(locked_positions)
+            fall_time += game_loop.STEP_MS
+            level_time += game_loop.STEP_MS
+
+            # Increase difficulty over time
+            if level_time / 1000 > 5:
+                level_time = 0
+                if fall_speed > 0.12:
+                    fall_speed -= 0.005
+
+            for key in keys.step():
+                if key == pygame.K_LEFT:
                     current_piece.x -= 1
                     if not valid_space(current_piece, grid):
                         current_piece.x += 1
-                if event.key == pygame.K_RIGHT:
+                if key == pygame.K_RIGHT:
                     current_piece.x += 1
                     if not valid_space(current_piece, grid):
                         current_piece.x -= 1
-                if event.key == pygame.K_DOWN:
+                if key == pygame.K_DOWN:
                     current_piece.y += 1
                     if not valid_space(current_piece, grid):
                         current_piece.y -= 1
-                if event.key == pygame.K_UP:
-                    current_piece.rotation = (current_piece.rotation + 1) % len(current_piece.shape)
-                    if not valid_space(current_piece, grid):
-                        current_piece.rotation = (current_piece.rotation - 1) % len(current_piece.shape)
+                if key == pygame.K_UP:
+                    rotate_piece(current_piece, grid)
+
+            # Piece falling logic
+            if fall_time / 1000 > fall_speed:
+                fall_time = 0
+                current_piece.y += 1
+                if not valid_space(current_piece, grid) and current_piece.y > 0:
+                    current_piece.y -= 1
+                    change_piece = True
+
+            # If piece hit the ground or another piece, lock it in place
+            if change_piece:
+                for pos in convert_shape_format(current_piece):
+                    locked_positions[(pos[0], pos[1])] = current_piece.color
+                    if pos[1] > -1:
+                        grid[pos[1]][pos[0]] = current_piece.color
+                current_piece = next_piece
+                next_piece = get_shape()
+                change_piece = False
+                score += clear_rows(grid, locked_positions) * 10
+
+                if check_lost(locked_positions):
+                    run = False
+                    break
+
+        # Keys seen this frame act from the next logic step on, whatever the frame rate
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                run = False
+                pygame.display.quit()
+                quit()
+
+            if event.type == pygame.KEYDOWN:
+                keys.press(event.key)
+            elif event.type == pygame.KEYUP:
+                keys.release(event.key)
 
+        grid = create_grid(locked_positions)
         shape_positions = convert_shape_format(current_piece)
 
         # Draw the piece on the grid
@@ -450,24 +508,14 @@ def main(win):
             if y > -1:
                 grid[y][x] = current_piece.color
 
-        # If piece hit the ground or another piece, lock it in place
-        if change_piece:
-            for pos in shape_positions:
-                locked_positions[(pos[0], pos[1])] = current_piece.color
-            current_piece = next_piece
-            next_piece = get_shape()
-            change_piece = False
-            score += clear_rows(grid, locked_positions) * 10
-
         draw_window(win, grid, score)
         draw_next_shape(next_piece, win)
         pygame.display.update()
 
-        if check_lost(locked_positions):
+        if not run:
             draw_text_middle("YOU LOST", 80, (255, 255, 255), win)
             pygame.display.update()
             pygame.time.delay(1500)
-            run = False
 
 
 def main_menu(win):
@@ -475,7 +523,9 @@ def main_menu(win):
     Main menu loop which waits for a key press to start the game.
     """
     run = True
+    clock = pygame.time.Clock()
     while run:
+        clock.tick(game_loop.IDLE_FPS)
         win.fill((0, 0, 0))
         draw_text_middle("Press Any Key To Play", 60, (255, 255, 255), win)
         pygame.display.update()
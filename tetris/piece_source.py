@@ -0,0 +1,126 @@
+"""Seeded piece streams shared by the Tetris variants.
+
+The variants used to pick every piece with random.choice on the global RNG,
+so no two runs saw the same sequence. A piece source hands out piece names
+from PIECES and each variant maps the name onto its own SHAPES list, so the
+same seed gives the same pieces in every variant.
+
+The source is picked from the environment so the games still start with a
+plain ``python tetris/<variant>.py``:
+
+    TETRIS_PIECES=bag | random | replay:<file>   (default: bag)
+    TETRIS_SEED=<int>                            (default: a fresh random seed)
+"""
+import os
+import random
+from collections import deque
+
+PIECES = 'IJLOSTZ'
+
+# Pieces generated per refill of a source's buffer
+BUFFER_SIZE = 700
+
+
+class PieceSource:
+    """Buffered stream of piece names, refilled in chunks by generate()."""
+
+    def __init__(self, buffer_size=BUFFER_SIZE):
+        self.buffer_size = buffer_size
+        self.buffer = deque()
+
+    def generate(self, count):
+        """Return at least ``count`` more piece names."""
+        raise NotImplementedError
+
+    def _fill(self, count):
+        while len(self.buffer) < count:
+            self.buffer.extend(self.generate(self.buffer_size))
+
+    def next(self):
+        self._fill(1)
+        return self.buffer.popleft()
+
+    def peek(self, count=1):
+        """Upcoming pieces without consuming them, for next-piece previews."""
+        self._fill(count)
+        return [self.buffer[i] for i in range(count)]
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.next()
+
+
+class SevenBag(PieceSource):
+    """Deals all seven pieces in a shuffled order before starting a new bag."""
+
+    def __init__(self, seed=None, buffer_size=BUFFER_SIZE):
+        super().__init__(buffer_size)
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        self.rng = random.Random(self.seed)
+
+    def generate(self, count):
+        pieces = []
+        bag = list(PIECES)
+        while len(pieces) < count:
+            self.rng.shuffle(bag)
+            pieces.extend(bag)
+        return pieces
+
+
+class RandomSource(PieceSource):
+    """Independent uniform picks, like the original random.choice(SHAPES)."""
+
+    def __init__(self, seed=None, buffer_size=BUFFER_SIZE):
+        super().__init__(buffer_size)
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        self.rng = random.Random(self.seed)
+
+    def generate(self, count):
+        return self.rng.choices(PIECES, k=count)
+
+
+class ReplaySource(PieceSource):
+    """Plays back a piece sequence saved with save_stream()."""
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.seed = None
+        with open(path) as f:
+            self.sequence = ''.join(f.read().split())
+        unknown = set(self.sequence) - set(PIECES)
+        if unknown:
+            raise ValueError(f'{path}: unknown pieces {"".join(sorted(unknown))}')
+        self.position = 0
+
+    def generate(self, count):
+        if self.position >= len(self.sequence):
+            raise EOFError(f'{self.path}: piece sequence ran out after {len(self.sequence)} pieces')
+        pieces = self.sequence[self.position:self.position + count]
+        self.position += len(pieces)
+        return list(pieces)
+
+
+def save_stream(source, path, count):
+    """Write the next ``count`` pieces of a source to a file for ReplaySource."""
+    pieces = ''.join(source.next() for _ in range(count))
+    with open(path, 'w') as f:
+        for start in range(0, len(pieces), 70):
+            f.write(pieces[start:start + 70] + '\n')
+
+
+def make_source(kind='bag', seed=None):
+    if kind == 'bag':
+        return SevenBag(seed)
+    if kind == 'random':
+        return RandomSource(seed)
+    if kind.startswith('replay:'):
+        return ReplaySource(kind[len('replay:'):])
+    raise ValueError(f'unknown piece source {kind!r}, expected bag, random or replay:<file>')
+
+
+def from_env():
+    seed = os.environ.get('TETRIS_SEED')
+    return make_source(os.environ.get('TETRIS_PIECES', 'bag'), int(seed) if seed else None)
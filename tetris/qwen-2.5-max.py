@@ -1,5 +1,5 @@
 import pygame
-import random
+import piece_source
 
 # Initialize pygame
 pygame.init()
@@ -34,6 +34,10 @@ SHAPES = [
     [[1, 1, 1], [0, 0, 1]]   # J
 ]
 
+# Piece names in SHAPES order, for the shared seeded piece stream
+SHAPE_NAMES = 'IOTSZLJ'
+pieces = piece_source.from_env()
+
 # Initialize screen
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("Tetris")
@@ -161,7 +165,7 @@ class Piece(object):
 
 # Get a random shape
 def get_shape():
-    return Piece(5, 0, random.choice(SHAPES))
+    return Piece(5, 0, SHAPES[SHAPE_NAMES.index(pieces.next())])
 
 # Main game loop
 def main():
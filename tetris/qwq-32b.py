@@ -1,5 +1,5 @@
 import pygame
-import random
+import piece_source
 
 # Built by Sonnet 3.5 with the COT of qwq-32b and a little help from deepseek-v3
 
@@ -35,11 +35,15 @@ SHAPES = [
     [[0, 0, 1], [1, 1, 1]],  # L
     [[0, 1, 0], [1, 1, 1]]  # T
 ]
+
+# Piece names in SHAPES order, for the shared seeded piece stream
+SHAPE_NAMES = 'IOZSJLT'
+pieces = piece_source.from_env()
 SHAPE_COLORS = [CYAN, YELLOW, RED, GREEN, BLUE, ORANGE, MAGENTA]
 
 class Tetromino:
     def __init__(self):
-        self.shape_index = random.randint(0, len(SHAPES) - 1)
+        self.shape_index = SHAPE_NAMES.index(pieces.next())
         self.shape = [row[:] for row in SHAPES[self.shape_index]]
         self.color = SHAPE_COLORS[self.shape_index]
         self.x = GRID_WIDTH // 2 - len(self.shape[0]) // 2
@@ -0,0 +1,418 @@
+"""Record Tetris sessions to a compact binary log and replay them.
+
+Recording runs any variant script unchanged and hooks pygame around it: the
+clock, pygame.time.get_ticks, time.time, the event queue and the key state.
+The game sees time only through the recorded clock, so a replay that feeds
+back the same frame times, key events and piece seed plays exactly the same
+game. Replays run headless at unlimited speed for profiling, or in a window
+at the recorded pace.
+
+    python tetris/replay.py record claude-3.7-sonnet-reasoning.py session.ttr
+    python tetris/replay.py play session.ttr                # headless, prints frame times
+    python tetris/replay.py play session.ttr --profile      # plus a cProfile of the run
+    python tetris/replay.py play session.ttr --realtime     # watch it
+
+Log format: the header is ``MAGIC``, a format version byte, the variant file
+name, the piece source and the seed. The body is a stream of varints whose
+low 3 bits are an opcode:
+
+    FRAME   a clock tick: the value is the frame time in ms, followed by a
+            varint raw time (the frame time minus the time tick() slept)
+    REPEAT  the value is a count of frames with the same times as the last one
+    KEYDOWN / KEYUP   the value is the pygame key code
+    QUIT    window closed
+
+Events belong to the frame that follows them. Frame times are deltas, so a
+frame costs 2-3 bytes, a run of identical frames collapses into a single
+REPEAT, and a key press costs about 6 bytes.
+
+Loops that poll events without ticking the clock (menus, game over screens)
+get all of that frame's events on their first poll during a replay, so they
+may spin fewer times than in the recording; the game itself is unchanged.
+
+A replay still runs the variant's game over path, so StatsStore.record_game
+is a no-op while replaying: replays and profiling runs never add games to
+tetris_stats.db. High scores are still read as in the recording.
+"""
+import argparse
+import cProfile
+import os
+import pstats
+import random
+import runpy
+import statistics
+import sys
+import time
+
+MAGIC = b'TTRP'
+VERSION = 1
+
+FRAME, REPEAT, KEYDOWN, KEYUP, QUIT = range(5)
+
+TETRIS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def write_varint(out, value):
+    while True:
+        byte = value & 0x7f
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+
+def read_varint(data, pos):
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7f) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+
+def write_string(out, text):
+    encoded = text.encode()
+    write_varint(out, len(encoded))
+    out.extend(encoded)
+
+
+def read_string(data, pos):
+    length, pos = read_varint(data, pos)
+    return data[pos:pos + length].decode(), pos + length
+
+
+class SessionWriter:
+    """Builds the binary log in memory while the game runs."""
+
+    def __init__(self, variant, pieces, seed):
+        self.header = bytearray(MAGIC)
+        self.header.append(VERSION)
+        write_string(self.header, variant)
+        write_string(self.header, pieces)
+        write_varint(self.header, seed)
+        self.body = bytearray()
+        self.last_frame = None
+        self.repeats = 0
+
+    def _flush_repeats(self):
+        if self.repeats:
+            write_varint(self.body, self.repeats << 3 | REPEAT)
+            self.repeats = 0
+
+    def frame(self, frame_time, raw_time):
+        if (frame_time, raw_time) == self.last_frame:
+            self.repeats += 1
+            return
+        self._flush_repeats()
+        write_varint(self.body, frame_time << 3 | FRAME)
+        write_varint(self.body, raw_time)
+        self.last_frame = (frame_time, raw_time)
+
+    def event(self, opcode, key=0):
+        self._flush_repeats()
+        write_varint(self.body, key << 3 | opcode)
+
+    def save(self, path):
+        self._flush_repeats()
+        with open(path, 'wb') as f:
+            f.write(self.header)
+            f.write(self.body)
+
+
+class Session:
+    """A parsed log: the header fields and the decoded record list."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError(f'{path} is not a Tetris session log')
+        pos = len(MAGIC)
+        if data[pos] != VERSION:
+            raise ValueError(f'{path}: unsupported log version {data[pos]}')
+        self.variant, pos = read_string(data, pos + 1)
+        self.pieces, pos = read_string(data, pos)
+        self.seed, pos = read_varint(data, pos)
+
+        # Expand into (opcode, value, raw) records, REPEAT is unrolled lazily by the player
+        self.records = []
+        while pos < len(data):
+            value, pos = read_varint(data, pos)
+            opcode, value = value & 7, value >> 3
+            raw = 0
+            if opcode == FRAME:
+                raw, pos = read_varint(data, pos)
+            self.records.append((opcode, value, raw))
+
+    def frame_count(self):
+        return sum(1 if op == FRAME else value for op, value, _ in self.records if op in (FRAME, REPEAT))
+
+
+class GameClock:
+    """Stands in for pygame.time.Clock, handing out the session's frame times."""
+
+    def __init__(self, timeline):
+        self.timeline = timeline
+
+    def tick(self, framerate=0):
+        return self.timeline.tick(framerate)
+
+    tick_busy_loop = tick
+
+    def get_time(self):
+        return self.timeline.frame_time
+
+    def get_rawtime(self):
+        return self.timeline.raw_time
+
+    def get_fps(self):
+        return 1000 / self.timeline.frame_time if self.timeline.frame_time else 0.0
+
+
+class PressedKeys:
+    """Minimal stand-in for the sequence returned by pygame.key.get_pressed()."""
+
+    def __init__(self, keys):
+        self.keys = keys
+
+    def __getitem__(self, key):
+        return key in self.keys
+
+
+class Recorder:
+    """Timeline fed by a real pygame clock, logging every frame and event."""
+
+    def __init__(self, pygame, writer):
+        self.pygame = pygame
+        self.writer = writer
+        self.clock = pygame.time.Clock()
+        self.real_get = pygame.event.get
+        self.real_get_pressed = pygame.key.get_pressed
+        self.real_delay = pygame.time.delay
+        self.ticks = 0
+        self.frame_time = 0
+        self.raw_time = 0
+
+    def tick(self, framerate=0):
+        self.frame_time = self.clock.tick(framerate)
+        self.raw_time = self.clock.get_rawtime()
+        self.ticks += self.frame_time
+        self.writer.frame(self.frame_time, self.raw_time)
+        return self.frame_time
+
+    def get_events(self, *args, **kwargs):
+        events = self.real_get(*args, **kwargs)
+        for event in events:
+            if event.type == self.pygame.KEYDOWN:
+                self.writer.event(KEYDOWN, event.key)
+            elif event.type == self.pygame.KEYUP:
+                self.writer.event(KEYUP, event.key)
+            elif event.type == self.pygame.QUIT:
+                self.writer.event(QUIT)
+        return events
+
+    def get_pressed(self):
+        return self.real_get_pressed()
+
+    def delay(self, ms):
+        self.real_delay(ms)
+
+
+class Player:
+    """Timeline that replays a session's frame times and events."""
+
+    def __init__(self, pygame, session, realtime=False):
+        self.pygame = pygame
+        self.records = session.records
+        self.pos = 0
+        self.repeats = 0
+        self.realtime = realtime
+        self.pressed = set()
+        self.ticks = 0
+        self.frame_time = 0
+        self.raw_time = 0
+        self.frame_times = []
+        self.last_wall = time.perf_counter()
+        self.finished = False
+
+    def tick(self, framerate=0):
+        # Wall time spent on the frame that just ended, the number being profiled
+        now = time.perf_counter()
+        self.frame_times.append((now - self.last_wall) * 1000)
+
+        # Skip events nobody polled for, they were consumed in the recording too
+        if not self.repeats:
+            while self.pos < len(self.records) and self.records[self.pos][0] not in (FRAME, REPEAT):
+                self._apply_key(self.records[self.pos])
+                self.pos += 1
+            if self.pos < len(self.records):
+                opcode, value, raw = self.records[self.pos]
+                self.pos += 1
+                if opcode == FRAME:
+                    self.frame_time, self.raw_time = value, raw
+                else:
+                    self.repeats = value - 1
+            else:
+                self.finished = True
+        else:
+            self.repeats -= 1
+
+        self.ticks += self.frame_time
+        if self.realtime:
+            time.sleep(max(0.0, self.frame_time / 1000 - (time.perf_counter() - now)))
+        self.last_wall = time.perf_counter()
+        return self.frame_time
+
+    def _apply_key(self, record):
+        opcode, key, _ = record
+        if opcode == KEYDOWN:
+            self.pressed.add(key)
+        elif opcode == KEYUP:
+            self.pressed.discard(key)
+
+    def get_events(self, *args, **kwargs):
+        self.pygame.event.pump()
+        events = []
+        if self.repeats:
+            return events
+        while self.pos < len(self.records) and self.records[self.pos][0] not in (FRAME, REPEAT):
+            record = self.records[self.pos]
+            self.pos += 1
+            self._apply_key(record)
+            opcode, key, _ = record
+            if opcode == KEYDOWN:
+                events.append(self.pygame.event.Event(self.pygame.KEYDOWN, key=key, mod=0, unicode='', scancode=0))
+            elif opcode == KEYUP:
+                events.append(self.pygame.event.Event(self.pygame.KEYUP, key=key, mod=0, unicode='', scancode=0))
+            elif opcode == QUIT:
+                events.append(self.pygame.event.Event(self.pygame.QUIT))
+        if self.pos >= len(self.records) or self.finished:
+            # Out of input, close the game the way the player would
+            self.finished = True
+            events.append(self.pygame.event.Event(self.pygame.QUIT))
+        return events
+
+    def get_pressed(self):
+        return PressedKeys(self.pressed)
+
+    def delay(self, ms):
+        if self.realtime:
+            time.sleep(ms / 1000)
+
+
+def hook_pygame(pygame, timeline):
+    """Route the game's clock, ticks, events and key state through a timeline."""
+    start = time.time()
+    pygame.time.Clock = lambda: GameClock(timeline)
+    pygame.time.get_ticks = lambda: timeline.ticks
+    pygame.time.delay = timeline.delay
+    pygame.time.wait = timeline.delay
+    pygame.event.get = timeline.get_events
+    pygame.key.get_pressed = timeline.get_pressed
+    time.time = lambda: start + timeline.ticks / 1000
+
+
+def skip_stats():
+    # The game was already recorded when it was played
+    if TETRIS_DIR not in sys.path:
+        sys.path.insert(0, TETRIS_DIR)
+    import stats_store
+    stats_store.StatsStore.record_game = lambda self, *args, **kwargs: None
+
+
+def run_variant(variant):
+    if TETRIS_DIR not in sys.path:
+        sys.path.insert(0, TETRIS_DIR)
+    try:
+        runpy.run_path(os.path.join(TETRIS_DIR, variant), run_name='__main__')
+    except SystemExit:
+        pass
+
+
+def seed_game(pieces, seed):
+    # The piece stream and any other random use in the variant start from the seed
+    os.environ['TETRIS_PIECES'] = pieces
+    os.environ['TETRIS_SEED'] = str(seed)
+    random.seed(seed)
+
+
+def record(variant, path, seed=None):
+    import pygame
+
+    pieces = 'bag'
+    seed = random.randrange(2 ** 32) if seed is None else seed
+    seed_game(pieces, seed)
+    writer = SessionWriter(variant, pieces, seed)
+    # Hook before the variant is loaded, module level clocks are created at import
+    pygame.init()
+    hook_pygame(pygame, Recorder(pygame, writer))
+    try:
+        run_variant(variant)
+    finally:
+        writer.save(path)
+        size = len(writer.header) + len(writer.body)
+        print(f'recorded {variant} (seed {seed}) to {path}, {size} bytes')
+
+
+def play(path, realtime=False, profile=False):
+    session = Session(path)
+    if not realtime:
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    import pygame
+
+    seed_game(session.pieces, session.seed)
+    pygame.init()
+    player = Player(pygame, session, realtime)
+    hook_pygame(pygame, player)
+    skip_stats()
+
+    profiler = cProfile.Profile() if profile else None
+    start = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    run_variant(session.variant)
+    if profiler:
+        profiler.disable()
+    elapsed = time.perf_counter() - start
+
+    frame_times = player.frame_times[1:] or [0.0]
+    frame_times_sorted = sorted(frame_times)
+    print(f'{session.variant}: {len(frame_times)} frames (log has {session.frame_count()}) '
+          f'in {elapsed:.2f}s, {player.ticks / 1000:.1f}s of game time')
+    print(f'frame ms  mean {statistics.fmean(frame_times):.3f}  '
+          f'p50 {frame_times_sorted[len(frame_times) // 2]:.3f}  '
+          f'p99 {frame_times_sorted[int(len(frame_times) * 0.99)]:.3f}  '
+          f'max {frame_times_sorted[-1]:.3f}')
+    if profiler:
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(20)
+    return player
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = commands.add_parser('record', help='play a variant and record the session')
+    record_parser.add_argument('variant', help='variant file name in tetris/, e.g. o1.py')
+    record_parser.add_argument('log')
+    record_parser.add_argument('--seed', type=int)
+
+    play_parser = commands.add_parser('play', help='replay a recorded session')
+    play_parser.add_argument('log')
+    play_parser.add_argument('--realtime', action='store_true', help='open a window and play at the recorded pace')
+    play_parser.add_argument('--profile', action='store_true', help='run the replay under cProfile')
+
+    args = parser.parse_args()
+    if args.command == 'record':
+        record(os.path.basename(args.variant), args.log, args.seed)
+    else:
+        play(args.log, args.realtime, args.profile)
+
+
+if __name__ == '__main__':
+    main()
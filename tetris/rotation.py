@@ -0,0 +1,130 @@
+"""SRS (Super Rotation System) rotation with precomputed kick tables.
+
+Everything is built once at import: the cells of every piece in each of its
+four rotation states, and for every piece, state and direction the ordered
+list of kick tests with the kicked cells already laid out. A rotation attempt
+is then a table lookup plus a collision check per test, with no new piece
+objects, which matters when an AI tries every rotation of every placement.
+
+Coordinates are (x, y) with y pointing down, like the game grids. The SRS
+kick tables are usually written with y up, so their dy is flipped here.
+"""
+from piece_source import PIECES
+
+CLOCKWISE = 1
+COUNTER_CLOCKWISE = -1
+
+# Spawn state cells and bounding box size of each piece
+SPAWN_CELLS = {
+    'I': (((0, 1), (1, 1), (2, 1), (3, 1)), 4),
+    'J': (((0, 0), (0, 1), (1, 1), (2, 1)), 3),
+    'L': (((2, 0), (0, 1), (1, 1), (2, 1)), 3),
+    'O': (((1, 0), (2, 0), (1, 1), (2, 1)), 4),
+    'S': (((1, 0), (2, 0), (0, 1), (1, 1)), 3),
+    'T': (((1, 0), (0, 1), (1, 1), (2, 1)), 3),
+    'Z': (((0, 0), (1, 0), (1, 1), (2, 1)), 3),
+}
+
+# SRS kick tests as written in the guideline (y up), keyed by (from, to) state
+JLSTZ_KICKS = {
+    (0, 1): ((0, 0), (-1, 0), (-1, 1), (0, -2), (-1, -2)),
+    (1, 0): ((0, 0), (1, 0), (1, -1), (0, 2), (1, 2)),
+    (1, 2): ((0, 0), (1, 0), (1, -1), (0, 2), (1, 2)),
+    (2, 1): ((0, 0), (-1, 0), (-1, 1), (0, -2), (-1, -2)),
+    (2, 3): ((0, 0), (1, 0), (1, 1), (0, -2), (1, -2)),
+    (3, 2): ((0, 0), (-1, 0), (-1, -1), (0, 2), (-1, 2)),
+    (3, 0): ((0, 0), (-1, 0), (-1, -1), (0, 2), (-1, 2)),
+    (0, 3): ((0, 0), (1, 0), (1, 1), (0, -2), (1, -2)),
+}
+
+I_KICKS = {
+    (0, 1): ((0, 0), (-2, 0), (1, 0), (-2, -1), (1, 2)),
+    (1, 0): ((0, 0), (2, 0), (-1, 0), (2, 1), (-1, -2)),
+    (1, 2): ((0, 0), (-1, 0), (2, 0), (-1, 2), (2, -1)),
+    (2, 1): ((0, 0), (1, 0), (-2, 0), (1, -2), (-2, 1)),
+    (2, 3): ((0, 0), (2, 0), (-1, 0), (2, 1), (-1, -2)),
+    (3, 2): ((0, 0), (-2, 0), (1, 0), (-2, -1), (1, 2)),
+    (3, 0): ((0, 0), (1, 0), (-2, 0), (1, -2), (-2, 1)),
+    (0, 3): ((0, 0), (-1, 0), (2, 0), (-1, 2), (2, -1)),
+}
+
+
+def rotate_cells(cells, size):
+    # Quarter turn clockwise inside a size x size box
+    return tuple(sorted((size - 1 - y, x) for x, y in cells))
+
+
+def build_cells():
+    cells = {}
+    for piece in PIECES:
+        spawn, size = SPAWN_CELLS[piece]
+        states = [tuple(sorted(spawn))]
+        for _ in range(3):
+            # O keeps its cells in every state
+            states.append(states[-1] if piece == 'O' else rotate_cells(states[-1], size))
+        cells[piece] = tuple(states)
+    return cells
+
+
+def build_kicks():
+    kicks = {}
+    for piece in PIECES:
+        table = I_KICKS if piece == 'I' else JLSTZ_KICKS
+        kicks[piece] = tuple(
+            {direction: tuple((dx, -dy) for dx, dy in table[(state, (state + direction) % 4)])
+             if piece != 'O' else ((0, 0),)
+             for direction in (CLOCKWISE, COUNTER_CLOCKWISE)}
+            for state in range(4)
+        )
+    return kicks
+
+
+def build_tests(cells, kicks):
+    tests = {}
+    for piece in PIECES:
+        tests[piece] = tuple(
+            {direction: tuple(
+                ((state + direction) % 4, dx, dy,
+                 tuple((x + dx, y + dy) for x, y in cells[piece][(state + direction) % 4]))
+                for dx, dy in kicks[piece][state][direction])
+             for direction in (CLOCKWISE, COUNTER_CLOCKWISE)}
+            for state in range(4)
+        )
+    return tests
+
+
+# CELLS[piece][state] -> cells of the piece in that state
+CELLS = build_cells()
+# KICKS[piece][state][direction] -> (dx, dy) offsets to try, in order
+KICKS = build_kicks()
+# TESTS[piece][state][direction] -> (new state, dx, dy, kicked cells) per kick
+TESTS = build_tests(CELLS, KICKS)
+
+
+def rotate(piece, state, x, y, direction, fits):
+    """Try to turn a piece, returning its (state, x, y) after the first kick that fits.
+
+    ``fits(cells, x, y)`` checks the cells placed at (x, y) against the board;
+    the cells it gets already include the kick offset. Returns None when
+    every kick collides.
+    """
+    for new_state, dx, dy, cells in TESTS[piece][state][direction]:
+        if fits(cells, x, y):
+            return new_state, x + dx, y + dy
+    return None
+
+
+def turn_direction(state, new_state):
+    """CLOCKWISE or COUNTER_CLOCKWISE for the quarter turn from one SRS state to another."""
+    return COUNTER_CLOCKWISE if (new_state - state) % 4 == 3 else CLOCKWISE
+
+
+def kick_offsets(piece, state, direction=CLOCKWISE):
+    """The SRS kick offsets for variants that keep their own rotation shapes.
+
+    Those variants number their rotations their own way, so they map each
+    rotation to its SRS state and pass the direction with turn_direction.
+    ``state`` is taken modulo 4, so variants with fewer stored rotations
+    still get a usable sequence of tests.
+    """
+    return KICKS[piece][state % 4][direction]
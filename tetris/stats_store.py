@@ -0,0 +1,151 @@
+"""Game statistics and high scores in SQLite, written off the game thread.
+
+Replaces the tetris_high_score.txt files, which were rewritten on every new
+high score and got corrupted when several headless games wrote at once.
+record_game() only puts the game on a queue. A background thread commits the
+queued games in batches, one transaction per batch, so a crash never leaves a
+half-written row. The database runs in WAL mode so many processes can record
+into the same file while others read the top scores.
+"""
+import atexit
+import logging
+import queue
+import sqlite3
+import threading
+import time
+
+DEFAULT_PATH = 'tetris_stats.db'
+
+log = logging.getLogger(__name__)
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    variant TEXT NOT NULL,
+    policy TEXT,
+    seed INTEGER,
+    score INTEGER NOT NULL,
+    lines INTEGER NOT NULL,
+    pieces INTEGER NOT NULL,
+    level INTEGER,
+    duration REAL NOT NULL,
+    pieces_per_second REAL NOT NULL,
+    finished_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_by_score ON games (variant, score DESC);
+'''
+
+COLUMNS = ('variant', 'policy', 'seed', 'score', 'lines', 'pieces', 'level',
+           'duration', 'pieces_per_second', 'finished_at')
+
+
+def connect(path):
+    # Wait on other writers instead of failing with "database is locked"
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.executescript(SCHEMA)
+    return conn
+
+
+class StatsStore:
+    """Per-game statistics with buffered, batched writes.
+
+    Games are committed when ``batch_size`` are queued or ``flush_interval``
+    seconds after the oldest queued one, whichever comes first. Call flush()
+    to wait for everything queued so far; close() also runs at exit. A batch
+    that fails to commit (a database locked past its timeout, a full disk) is
+    logged and dropped, and the writer carries on with the next one.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, batch_size=50, flush_interval=1.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pending = queue.Queue()
+        self.reader = connect(path)
+        self.closed = False
+        self.writer = threading.Thread(target=self._write_loop, name='stats-writer', daemon=True)
+        self.writer.start()
+        atexit.register(self.close)
+
+    def record_game(self, variant, score, lines, pieces, duration, level=None, policy=None, seed=None):
+        """Queue a finished game, returns immediately."""
+        pieces_per_second = pieces / duration if duration > 0 else 0.0
+        self.pending.put((variant, policy, seed, score, lines, pieces, level,
+                          duration, pieces_per_second, time.time()))
+
+    def flush(self):
+        """Block until every game queued so far is committed or dropped."""
+        done = threading.Event()
+        self.pending.put(done)
+        # A writer that died (or was closed) will never set the event
+        while not done.wait(0.1):
+            if not self.writer.is_alive():
+                return
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.pending.put(None)
+        self.writer.join()
+        self.reader.close()
+
+    def _write_loop(self):
+        conn = connect(self.path)
+        batch = []
+        waiters = []
+        deadline = None
+        stop = False
+        while not stop:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self.pending.get(timeout=timeout)
+            except queue.Empty:
+                item = False
+
+            if item is None:
+                stop = True
+            elif isinstance(item, threading.Event):
+                waiters.append(item)
+            elif item:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            due = deadline is not None and time.monotonic() >= deadline
+            if batch and (stop or waiters or due or len(batch) >= self.batch_size):
+                try:
+                    with conn:
+                        conn.executemany(f'INSERT INTO games ({", ".join(COLUMNS)}) VALUES ({", ".join("?" * len(COLUMNS))})',
+                                         batch)
+                except sqlite3.Error:
+                    log.exception('dropped %d games that could not be written to %s', len(batch), self.path)
+                batch = []
+                deadline = None
+            for waiter in waiters:
+                waiter.set()
+            waiters = []
+        conn.close()
+
+    def top_scores(self, n=10, variant=None, policy=None):
+        """The n best games as dicts, best first, including any still queued."""
+        self.flush()
+        where, params = [], []
+        if variant is not None:
+            where.append('variant = ?')
+            params.append(variant)
+        if policy is not None:
+            where.append('policy = ?')
+            params.append(policy)
+        sql = f'SELECT {", ".join(COLUMNS)} FROM games'
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += ' ORDER BY score DESC LIMIT ?'
+        rows = self.reader.execute(sql, params + [n]).fetchall()
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def high_score(self, variant=None):
+        best = self.top_scores(1, variant)
+        return best[0]['score'] if best else 0
@@ -0,0 +1,43 @@
+"""The SRS states the variants give their own rotation shapes match rotation.CELLS."""
+import pytest
+
+import rotation
+from variants import load_variant
+
+# Variant, its list of shapes, piece names in that order
+VARIANTS = [
+    ('claude-3.7-sonnet-reasoning.py', 'SHAPES', 'SHAPE_NAMES'),
+    ('o3-mini-high.py', 'shapes', 'SHAPE_NAMES'),
+]
+
+
+def normalised(cells):
+    # Cells moved to touch x = 0 and y = 0, since the variants draw in their own boxes
+    left = min(x for x, _ in cells)
+    top = min(y for _, y in cells)
+    return sorted((x - left, y - top) for x, y in cells)
+
+
+def shape_cells(rows):
+    return [(x, y) for y, row in enumerate(rows) for x, cell in enumerate(row) if cell != '.']
+
+
+@pytest.mark.parametrize('filename, shapes, names', VARIANTS)
+def test_srs_states_match_cells(filename, shapes, names):
+    variant = load_variant(filename)
+    for shape, name in zip(getattr(variant, shapes), getattr(variant, names)):
+        states = variant.SRS_STATES[name]
+        assert len(states) == len(shape), name
+        for index, rows in enumerate(shape):
+            assert normalised(shape_cells(rows)) == normalised(rotation.CELLS[name][states[index]]), (name, index)
+
+
+@pytest.mark.parametrize('filename, shapes, names', VARIANTS)
+def test_turns_are_quarter_turns(filename, shapes, names):
+    variant = load_variant(filename)
+    for name in getattr(variant, names):
+        states = variant.SRS_STATES[name]
+        for index, state in enumerate(states):
+            new_state = states[(index + 1) % len(states)]
+            # The kick tables only cover quarter turns; O never leaves state 0
+            assert (new_state - state) % 4 in ((1, 3) if name != 'O' else (0,)), (name, index)
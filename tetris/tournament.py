@@ -0,0 +1,347 @@
+"""Run many headless Tetris games across worker processes.
+
+Games follow the rules of claude-3.7-sonnet-reasoning.py: its valid_space,
+clear_rows, calculate_level, get_fall_speed and score_for_lines are imported
+from the script, so scores match the playable game. Instead of key presses a
+policy picks where each piece lands (a rotation and column, then a hard drop).
+
+Each worker plays one game at a time and streams the result back over a
+queue, and the leaderboard is updated as results arrive. A worker that dies
+mid-game is replaced and its game is reported as failed.
+
+    python tetris/tournament.py --games 400 --policies greedy,random --workers 8
+"""
+import argparse
+import heapq
+import multiprocessing as mp
+import queue
+import random
+import time
+
+import analytics
+import piece_source
+import stats_store
+from variants import load_variant
+
+GAME_FILE = 'claude-3.7-sonnet-reasoning.py'
+
+# Weights for the greedy policy's board evaluation (aggregate height, lines,
+# holes, bumpiness), the usual values for one-piece lookahead bots
+GREEDY_WEIGHTS = (-0.510066, 0.760666, -0.35663, -0.184483)
+
+_game = None
+
+
+def get_game():
+    # Load the game module once per process
+    global _game
+    if _game is None:
+        _game = load_variant(GAME_FILE)
+    return _game
+
+
+def get_placements(game, piece, grid, heights):
+    """All (rotation, x, y) landing spots reachable by a hard drop from the top."""
+    placements = []
+    for rotation in range(len({tuple(r) for r in piece.shape})):
+        for x in range(-2, game.GRID_WIDTH):
+            candidate = game.Piece(x, piece.y, piece.shape)
+            candidate.rotation = rotation
+            if not valid_columns(game, candidate) or not game.valid_space(candidate, grid):
+                continue
+            y = candidate.y + game.get_drop_distance(candidate, heights, grid)
+            placements.append((rotation, x, y))
+    return placements
+
+
+def valid_columns(game, piece):
+    return all(0 <= x < game.GRID_WIDTH for x, _ in game.convert_shape_format(piece))
+
+
+def evaluate_board(game, occupied):
+    """Score a board given as a set of filled (x, y) cells for the greedy policy."""
+    rows = {}
+    for x, y in occupied:
+        rows[y] = rows.get(y, 0) + 1
+    full = sorted(y for y, count in rows.items() if count == game.GRID_WIDTH)
+    if full:
+        # Drop the rows above each cleared row, like clear_rows does
+        occupied = {(x, y + sum(1 for row in full if row > y)) for x, y in occupied if y not in full}
+
+    heights = [0] * game.GRID_WIDTH
+    tops = game.get_column_heights(occupied)
+    holes = 0
+    for x in range(game.GRID_WIDTH):
+        heights[x] = game.GRID_HEIGHT - tops[x]
+        holes += sum(1 for y in range(tops[x] + 1, game.GRID_HEIGHT) if (x, y) not in occupied)
+    bumpiness = sum(abs(heights[x] - heights[x + 1]) for x in range(game.GRID_WIDTH - 1))
+
+    w_height, w_lines, w_holes, w_bumpiness = GREEDY_WEIGHTS
+    return w_height * sum(heights) + w_lines * len(full) + w_holes * holes + w_bumpiness * bumpiness
+
+
+def greedy_policy(game, piece, placements, locked, rng):
+    best = None
+    for rotation, x, y in placements:
+        placed = game.Piece(x, y, piece.shape)
+        placed.rotation = rotation
+        occupied = set(locked) | set(game.convert_shape_format(placed))
+        value = evaluate_board(game, occupied)
+        if best is None or value > best[0]:
+            best = (value, (rotation, x, y))
+    return best[1]
+
+
+def random_policy(game, piece, placements, locked, rng):
+    return rng.choice(placements)
+
+
+POLICIES = {
+    'greedy': greedy_policy,
+    'random': random_policy,
+}
+
+
+def play_game(seed, policy, max_pieces=1000, log_placements=False):
+    """Play one game to top-out (or max_pieces) and return its statistics.
+
+    With ``log_placements`` the result also holds every locked piece as
+    (piece, rotation, x, y, lines cleared, cells) under 'placements'.
+    """
+    game = get_game()
+    choose = POLICIES[policy]
+    pieces = piece_source.SevenBag(seed)
+    rng = random.Random(seed)
+
+    locked = {}
+    heights = game.get_column_heights(locked)
+    score = lines = placed = 0
+    level = 1
+    game_time = 0.0
+    placements_log = []
+    start = time.perf_counter()
+
+    while placed < max_pieces:
+        name = pieces.next()
+        piece = game.Piece(game.GRID_WIDTH // 2 - 2, 0, game.SHAPES[game.SHAPE_NAMES.index(name)])
+        grid = game.create_grid(locked)
+        placements = get_placements(game, piece, grid, heights)
+        if not game.valid_space(piece, grid) or not placements:
+            break
+
+        rotation, x, y = choose(game, piece, placements, locked, rng)
+        # Time the piece would take to fall there under gravity at this level
+        game_time += max(0, y - piece.y) * game.get_fall_speed(level)
+
+        piece.rotation, piece.x, piece.y = rotation, x, y
+        piece_pos = game.convert_shape_format(piece)
+        for pos in piece_pos:
+            locked[pos] = piece.color
+            if pos[1] >= 0:
+                grid[pos[1]][pos[0]] = piece.color
+        game.lock_column_heights(heights, piece_pos)
+        placed += 1
+
+        rows_cleared = game.clear_rows(grid, locked)
+        if rows_cleared:
+            heights = game.get_column_heights(locked)
+            lines += rows_cleared
+        score += game.score_for_lines(rows_cleared, level)
+        level = game.calculate_level(score)
+        if log_placements:
+            placements_log.append((name, rotation, x, y, rows_cleared, piece_pos))
+
+        if game.check_lost(locked):
+            break
+
+    duration = time.perf_counter() - start
+    result = {
+        'seed': seed,
+        'policy': policy,
+        'score': score,
+        'lines': lines,
+        'pieces': placed,
+        'level': level,
+        'game_time': game_time,
+        'duration': duration,
+        'pieces_per_second': placed / duration if duration else 0.0,
+    }
+    if log_placements:
+        result['placements'] = placements_log
+    return result
+
+
+def worker(worker_id, tasks, results):
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        game_id, seed, policy, max_pieces, log_placements = task
+        try:
+            result = play_game(seed, policy, max_pieces, log_placements)
+            if log_placements:
+                # Packed here so the parent only appends bytes to the log
+                result['placements'] = analytics.placement_records(game_id, result['placements']).tobytes()
+        except Exception as e:
+            result = {'seed': seed, 'policy': policy, 'error': f'{type(e).__name__}: {e}'}
+        result['game_id'] = game_id
+        results.put((worker_id, result))
+
+
+class Leaderboard:
+    """Running per-policy totals and the best games seen so far."""
+
+    def __init__(self, top=10):
+        self.top = top
+        self.best = []
+        self.policies = {}
+        self.failed = []
+
+    def add(self, result):
+        if 'error' in result:
+            self.failed.append(result)
+            return
+        stats = self.policies.setdefault(result['policy'], {'games': 0, 'score': 0, 'lines': 0, 'pieces': 0, 'best': 0})
+        stats['games'] += 1
+        stats['score'] += result['score']
+        stats['lines'] += result['lines']
+        stats['pieces'] += result['pieces']
+        stats['best'] = max(stats['best'], result['score'])
+
+        entry = (result['score'], result['lines'], -result['game_id'], result)
+        if len(self.best) < self.top:
+            heapq.heappush(self.best, entry)
+        else:
+            heapq.heappushpop(self.best, entry)
+
+    def games(self):
+        return sum(stats['games'] for stats in self.policies.values())
+
+    def print_table(self):
+        print(f'{"Policy":<10} {"Games":>6} {"Avg score":>10} {"Best":>8} {"Avg lines":>10} {"Avg pieces":>11}')
+        for policy, stats in sorted(self.policies.items()):
+            games = stats['games']
+            print(f'{policy:<10} {games:>6} {stats["score"] / games:>10.1f} {stats["best"]:>8} '
+                  f'{stats["lines"] / games:>10.1f} {stats["pieces"] / games:>11.1f}')
+
+        print()
+        print(f'{"Rank":<5} {"Game":>5} {"Policy":<8} {"Seed":>11} {"Score":>7} {"Lines":>6} {"Pieces":>7} {"Time":>8}')
+        for rank, (_, _, _, result) in enumerate(sorted(self.best, reverse=True), 1):
+            print(f'{rank:<5} {result["game_id"]:>5} {result["policy"]:<8} {result["seed"]:>11} {result["score"]:>7} '
+                  f'{result["lines"]:>6} {result["pieces"]:>7} {result["game_time"]:>7.1f}s')
+
+        for result in self.failed:
+            print(f'game {result["game_id"]} ({result["policy"]}, seed {result["seed"]}) failed: {result["error"]}')
+
+
+def run_tournament(games, workers, policies=('greedy',), base_seed=0, max_pieces=1000, top=10,
+                   on_result=None, progress_every=50, log_placements=False):
+    """Shard ``games`` games over ``workers`` processes and return the leaderboard.
+
+    Game i plays seed base_seed + i with policies[i % len(policies)].
+    ``on_result`` is called with every result dict as it arrives; with
+    ``log_placements`` successful results carry their packed placement
+    records under 'placements'.
+    """
+    pending = [(game_id, base_seed + game_id, policies[game_id % len(policies)], max_pieces, log_placements)
+               for game_id in range(games)]
+    pending.reverse()
+    leaderboard = Leaderboard(top)
+    results = mp.Queue()
+    procs = {}
+    tasks = {}
+    running = {}
+
+    def start_worker(worker_id):
+        tasks[worker_id] = mp.Queue()
+        procs[worker_id] = mp.Process(target=worker, args=(worker_id, tasks[worker_id], results), daemon=True)
+        procs[worker_id].start()
+
+    def dispatch(worker_id):
+        # Each worker holds at most one game, so a dead worker loses exactly one
+        if pending:
+            task = pending.pop()
+            running[worker_id] = task
+            tasks[worker_id].put(task)
+        else:
+            running.pop(worker_id, None)
+            tasks[worker_id].put(None)
+
+    def report(result):
+        leaderboard.add(result)
+        if on_result:
+            on_result(result)
+        done = leaderboard.games() + len(leaderboard.failed)
+        if progress_every and done % progress_every == 0:
+            print(f'{done}/{games} games done')
+
+    for worker_id in range(min(workers, games)):
+        start_worker(worker_id)
+        dispatch(worker_id)
+
+    while running:
+        try:
+            worker_id, result = results.get(timeout=0.5)
+        except queue.Empty:
+            # Replace workers that died without reporting their game
+            for worker_id, task in list(running.items()):
+                if not procs[worker_id].is_alive():
+                    game_id, seed, policy = task[:3]
+                    report({'game_id': game_id, 'seed': seed, 'policy': policy,
+                            'error': f'worker exited with code {procs[worker_id].exitcode}'})
+                    start_worker(worker_id)
+                    dispatch(worker_id)
+            continue
+        report(result)
+        dispatch(worker_id)
+
+    for proc in procs.values():
+        proc.join(timeout=1)
+    return leaderboard
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=mp.cpu_count())
+    parser.add_argument('--policies', default='greedy,random', help=f'comma separated, from {", ".join(POLICIES)}')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the first game, game i uses seed + i')
+    parser.add_argument('--max-pieces', type=int, default=1000)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--stats', metavar='DB', help='also record every game in this stats database')
+    parser.add_argument('--placements', metavar='FILE', help='write every locked piece to this log for analytics.py')
+    args = parser.parse_args()
+
+    policies = args.policies.split(',')
+    for policy in policies:
+        if policy not in POLICIES:
+            parser.error(f'unknown policy {policy!r}')
+
+    store = stats_store.StatsStore(args.stats) if args.stats else None
+    variant = GAME_FILE[:-len('.py')]
+    log = None
+    if args.placements:
+        game = get_game()
+        log = analytics.PlacementLog(args.placements, game.GRID_WIDTH, game.GRID_HEIGHT)
+
+    def on_result(result):
+        if 'error' in result:
+            return
+        if log:
+            log.write(result.pop('placements'))
+        if store:
+            store.record_game(variant, result['score'], result['lines'], result['pieces'], result['duration'],
+                              result['level'], result['policy'], result['seed'])
+
+    start = time.perf_counter()
+    leaderboard = run_tournament(args.games, args.workers, policies, args.seed, args.max_pieces, args.top, on_result,
+                                 log_placements=log is not None)
+    print(f'\n{args.games} games in {time.perf_counter() - start:.1f}s\n')
+    leaderboard.print_table()
+    if log:
+        log.close()
+        print(f'\n{log.records} placements written to {args.placements}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,27 @@
+"""Load the Tetris variant scripts as modules.
+
+The scripts have file names like ``claude-3.7-sonnet-reasoning.py`` that can't
+be imported directly, and they open a window and the mixer at import time, so
+headless runs switch SDL to its dummy drivers first.
+"""
+import importlib.util
+import os
+import sys
+
+TETRIS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_variant(filename, headless=True):
+    """Import a variant script from this folder and return the module."""
+    if headless:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    if TETRIS_DIR not in sys.path:
+        sys.path.insert(0, TETRIS_DIR)
+
+    path = os.path.join(TETRIS_DIR, filename)
+    name = os.path.splitext(filename)[0].replace('-', '_').replace('.', '_').replace('+', '_')
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module